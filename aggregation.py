@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Single-pass streaming aggregation shared by the fetcher summary and the dashboard
+
+Rows are consumed one at a time. Each rollup keeps running sums/counts and a
+bounded heap per field for the top-k and bottom-k leaderboards, so the whole
+summary costs O(n log k) with one pass, overall and per category.
+"""
+
+import heapq
+
+from project_registry import ProjectRegistry, RegistryError
+
+LEADERBOARD_K = 5
+
+# Per-project result fields and analytics metrics that get sums + leaderboards
+RESULT_SUMMARY_FIELDS = [
+    'market_cap', 'volume_24h', 'percent_change_24h', 'percent_change_7d',
+    'percent_change_30d', 'all_time_roi', 'days_since_tge'
+]
+METRIC_SUMMARY_FIELDS = ['roi_since_tge', 'max_drawdown', 'volatility_7d', 'volatility_30d', 'sharpe_30d']
+
+UNCATEGORIZED = 'Uncategorized'
+
+
+class Rollup:
+    """Running sums, counts and top/bottom-k heaps for one group of rows"""
+
+    def __init__(self, k=LEADERBOARD_K):
+        self.k = k
+        self.count = 0
+        self.sums = {}
+        self.counts = {}
+        self._top = {}       # field -> min-heap of (value, -seq, label), the k largest
+        self._bottom = {}    # field -> min-heap of (-value, -seq, label), the k smallest
+
+    def add(self, seq, label, values):
+        """Fold one row in; `seq` breaks ties in favour of earlier rows"""
+        self.count += 1
+        for field, value in values.items():
+            if value is None:
+                continue
+            self.sums[field] = self.sums.get(field, 0) + value
+            self.counts[field] = self.counts.get(field, 0) + 1
+            self._push(self._top.setdefault(field, []), (value, -seq, label))
+            self._push(self._bottom.setdefault(field, []), (-value, -seq, label))
+
+    def _push(self, heap, item):
+        if len(heap) < self.k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def total(self, field):
+        return self.sums.get(field, 0)
+
+    def mean(self, field):
+        """Average over rows that have the field (None if none do)"""
+        n = self.counts.get(field)
+        return self.sums[field] / n if n else None
+
+    def top(self, field, n=None):
+        """[(value, label)] largest first"""
+        ranked = sorted(self._top.get(field, []), reverse=True)
+        return [(value, label) for value, _, label in ranked[:n]]
+
+    def bottom(self, field, n=None):
+        """[(value, label)] smallest first"""
+        ranked = sorted(self._bottom.get(field, []), reverse=True)
+        return [(-value, label) for value, _, label in ranked[:n]]
+
+    def best(self, field):
+        top = self.top(field, 1)
+        return top[0] if top else None
+
+    def worst(self, field):
+        bottom = self.bottom(field, 1)
+        return bottom[0] if bottom else None
+
+
+class StreamingAggregator:
+    """Overall and per-category rollups over a stream of tracker results"""
+
+    def __init__(self, categories=None, k=LEADERBOARD_K):
+        self.categories = categories or {}     # token_symbol -> category
+        self.k = k
+        self.overall = Rollup(k)
+        self.by_category = {}
+        self.seq = 0
+
+    def add(self, row, metrics=None, seq=None):
+        """Consume one result row (dict or RowView) plus its analytics metrics
+
+        `seq` (default: arrival order) breaks leaderboard ties - rows that
+        arrive out of order pass their registry position.
+        """
+        values = {field: row.get(field) for field in RESULT_SUMMARY_FIELDS}
+        if metrics:
+            values.update({field: metrics.get(field) for field in METRIC_SUMMARY_FIELDS})
+        label = row['project_name']
+        category = self.categories.get(row['token_symbol']) or UNCATEGORIZED
+        rollup = self.by_category.get(category)
+        if rollup is None:
+            rollup = self.by_category[category] = Rollup(self.k)
+        seq = self.seq if seq is None else seq
+        self.overall.add(seq, label, values)
+        rollup.add(seq, label, values)
+        self.seq += 1
+
+    def consume(self, rows, metrics=None):
+        """Add every row (metrics: analytics output keyed by symbol); returns self"""
+        metrics = metrics or {}
+        for row in rows:
+            self.add(row, metrics.get(row['token_symbol']))
+        return self
+
+
+def project_categories(projects):
+    """token_symbol -> category for registry/project entries"""
+    return {p['token_symbol']: p.get('category') for p in projects}
+
+
+def load_categories():
+    """token_symbol -> category from the project registry ({} if it can't be loaded)"""
+    try:
+        return project_categories(ProjectRegistry().projects)
+    except (OSError, RegistryError):
+        return {}
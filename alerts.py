@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Alert rules evaluated on each new snapshot
+
+Rules are declared in alert_rules.json, one object per rule:
+
+    {"name": "roi-1000", "field": "all_time_roi", "op": ">", "value": 1000}
+    {"name": "dump-24h", "field": "percent_change_24h", "op": "<", "value": -20, "hysteresis": 5}
+    {"name": "virtual-1b", "field": "market_cap", "op": ">=", "value": 1e9, "symbols": ["VIRTUAL"],
+     "cooldown": 86400, "message": "{project_name} market cap above $1B"}
+
+A rule fires when its condition becomes true for a token. It then stays
+active (and quiet) until the value moves back past the threshold by more
+than `hysteresis`, and fires at most once per `cooldown` seconds per token.
+Active rules, last firing times and the last values seen are kept in
+alert_state.json, so a condition that holds across runs alerts once.
+
+Each run only looks at tokens whose rule fields changed since the last
+evaluation, and for those only at rules whose threshold lies between the
+old and the new value: rules are indexed per (field, symbol scope) and
+sorted by threshold, so finding them is a bisect rather than a scan over
+every rule. Alerts go to the sinks in ALERT_SINKS ('file', 'webhook',
+'memory').
+
+Usage:
+    python3 alerts.py                    # list rules and active alerts
+    python3 alerts.py check              # evaluate the latest stored snapshot
+    python3 alerts.py backtest --from 2025-06-01   # what the rules would have fired (nothing saved)
+    python3 alerts.py test               # send a test alert to every sink
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from history_store import open_history_store
+from instrumentation import instrumentation
+from sparklines import to_epoch
+
+ALERT_RULES_FILE = 'alert_rules.json'
+ALERT_STATE_FILE = 'alert_state.json'
+ALERT_LOG_FILE = 'alerts.log'
+DEFAULT_COOLDOWN = 3600     # Seconds before a rule may fire again for the same token
+WEBHOOK_TIMEOUT = 10
+
+# ========================================
+# OPTIONAL SETTINGS - Load from config file
+# ========================================
+try:
+    from config import ALERT_SINKS
+except ImportError:
+    ALERT_SINKS = ['file']      # 'file', 'file:<path>', 'webhook', 'webhook:<url>', 'memory'
+
+try:
+    from config import ALERT_WEBHOOK_URL
+except ImportError:
+    ALERT_WEBHOOK_URL = None    # Receives {'text', 'alerts'} as JSON (Slack/Discord-style)
+
+# Result fields rules can watch
+ALERT_FIELDS = [
+    'current_price', 'market_cap', 'volume_24h', 'percent_change_24h', 'percent_change_7d',
+    'percent_change_30d', 'all_time_roi', 'days_since_tge'
+]
+OPS = {
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b
+}
+RULE_KEYS = {'name', 'field', 'op', 'value', 'symbols', 'hysteresis', 'cooldown', 'message'}
+
+
+class AlertRuleError(ValueError):
+    """Raised when alert rules fail validation"""
+
+    def __init__(self, problems):
+        super().__init__('\n'.join(problems))
+        self.problems = problems
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def validate_rule(rule):
+    """List of problems with one rule entry (empty if valid)"""
+    if not isinstance(rule, dict):
+        return [f"not an object: {rule!r}"]
+    label = rule.get('name') or '?'
+    problems = [f"{label}: unknown key {key!r}" for key in sorted(set(rule) - RULE_KEYS)]
+    if not isinstance(rule.get('name'), str) or not rule['name'].strip():
+        problems.append(f"{label}: missing name")
+    if rule.get('field') not in ALERT_FIELDS:
+        problems.append(f"{label}: field should be one of {', '.join(ALERT_FIELDS)}, got {rule.get('field')!r}")
+    if rule.get('op') not in OPS:
+        problems.append(f"{label}: op should be one of {' '.join(OPS)}, got {rule.get('op')!r}")
+    if not is_number(rule.get('value')):
+        problems.append(f"{label}: value should be a number, got {rule.get('value')!r}")
+    for key in ('hysteresis', 'cooldown'):
+        if key in rule and not (is_number(rule[key]) and rule[key] >= 0):
+            problems.append(f"{label}: {key} should be a non-negative number, got {rule[key]!r}")
+    symbols = rule.get('symbols')
+    if symbols is not None and not (isinstance(symbols, list) and symbols
+                                    and all(isinstance(s, str) and s for s in symbols)):
+        problems.append(f"{label}: symbols should be a non-empty list of token symbols, got {symbols!r}")
+    if 'message' in rule and not isinstance(rule['message'], str):
+        problems.append(f"{label}: message should be a string")
+    return problems
+
+
+class AlertRule:
+    """One threshold rule: `field` `op` `value` for the tokens in `symbols` (None = every token)"""
+
+    def __init__(self, name, field, op, value, symbols=None, hysteresis=0, cooldown=DEFAULT_COOLDOWN,
+                 message=None):
+        self.name = name
+        self.field = field
+        self.op = op
+        self.value = value
+        self.symbols = symbols
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.message = message
+        self.above = op in ('>', '>=')
+        # Level the value has to move back past before the rule re-arms
+        self.release = value - hysteresis if self.above else value + hysteresis
+        self.compare = OPS[op]
+        self.fingerprint = hashlib.sha1(json.dumps(
+            [field, op, value, sorted(symbols) if symbols else None, hysteresis], sort_keys=True
+        ).encode()).hexdigest()[:12]
+
+    @classmethod
+    def from_dict(cls, rule):
+        return cls(rule['name'], rule['field'], rule['op'], rule['value'], rule.get('symbols'),
+                   rule.get('hysteresis', 0), rule.get('cooldown', DEFAULT_COOLDOWN), rule.get('message'))
+
+    def armed(self, value):
+        return self.compare(value, self.value)
+
+    def released(self, value):
+        return not self.compare(value, self.release)
+
+    def describe(self):
+        return f"{self.field} {self.op} {self.value:,.10g}"
+
+
+def load_rules(path=ALERT_RULES_FILE):
+    """Validated rules from `path`; raises AlertRuleError listing every problem"""
+    with open(path, 'r') as f:
+        try:
+            entries = json.load(f)
+        except json.JSONDecodeError as e:
+            raise AlertRuleError([f"{path}: {e}"])
+    if not isinstance(entries, list):
+        raise AlertRuleError([f"{path}: should hold a list of rules"])
+    problems = []
+    names = set()
+    for rule in entries:
+        problems += validate_rule(rule)
+        name = rule.get('name') if isinstance(rule, dict) else None
+        if name in names:
+            problems.append(f"{name}: duplicate rule name")
+        names.add(name)
+    if problems:
+        raise AlertRuleError(problems)
+    return [AlertRule.from_dict(rule) for rule in entries]
+
+
+# ========================================
+# RULE INDEX
+# ========================================
+class ThresholdGroup:
+    """Rules on one field for one symbol scope and direction, sorted by threshold and by release level"""
+
+    def __init__(self, rules, above):
+        self.above = above
+        self.arm = sorted(rules, key=lambda r: r.value)
+        self.arm_keys = [r.value for r in self.arm]
+        self.release = sorted(rules, key=lambda r: r.release)
+        self.release_keys = [r.release for r in self.release]
+
+    @staticmethod
+    def _between(keys, rules, lo, hi):
+        start = 0 if lo is None else bisect_left(keys, lo)
+        end = len(keys) if hi is None else bisect_right(keys, hi)
+        return rules[start:end]
+
+    def candidates(self, old, new):
+        """(rules that may arm, rules that may release) when a value moves from `old` to `new`
+
+        Between runs an inactive rule's condition was false at `old` and an
+        active rule wasn't released at `old`, so only levels between the two
+        values can flip. With no `old` (first sighting), every level on the
+        relevant side of `new` is a candidate.
+        """
+        if old is None:
+            if self.above:
+                return self._between(self.arm_keys, self.arm, None, new), \
+                    self._between(self.release_keys, self.release, new, None)
+            return self._between(self.arm_keys, self.arm, new, None), \
+                self._between(self.release_keys, self.release, None, new)
+        lo, hi = min(old, new), max(old, new)
+        return self._between(self.arm_keys, self.arm, lo, hi), self._between(self.release_keys, self.release, lo, hi)
+
+
+class RuleIndex:
+    """Rules grouped by (field, symbol scope, direction); scope '*' covers every token"""
+
+    def __init__(self, rules):
+        grouped = {}
+        for rule in rules:
+            for scope in rule.symbols or ['*']:
+                grouped.setdefault((rule.field, scope, rule.above), []).append(rule)
+        self.groups = {key: ThresholdGroup(group, key[2]) for key, group in grouped.items()}
+        self.wildcard_fields = sorted({field for field, scope, _ in self.groups if scope == '*'})
+        self.symbol_fields = {}
+        for field, scope, _ in self.groups:
+            if scope != '*' and field not in self.symbol_fields.setdefault(scope, []):
+                self.symbol_fields[scope].append(field)
+
+    def fields_for(self, symbol):
+        """Fields some rule watches for `symbol`"""
+        extra = self.symbol_fields.get(symbol)
+        if not extra:
+            return self.wildcard_fields
+        return self.wildcard_fields + [f for f in extra if f not in self.wildcard_fields]
+
+    def candidates(self, field, symbol, old, new):
+        """[(rules that may arm, rules that may release)] for `symbol`'s `field` moving from `old` to `new`"""
+        found = []
+        for scope in ('*', symbol):
+            for above in (True, False):
+                group = self.groups.get((field, scope, above))
+                if group is not None:
+                    found.append(group.candidates(old, new))
+        return found
+
+
+# ========================================
+# SINKS
+# ========================================
+class FileSink:
+    """Appends alerts as JSON lines"""
+
+    def __init__(self, path=ALERT_LOG_FILE):
+        self.name = f"file:{path}"
+        self.path = path
+
+    def send(self, alerts):
+        with open(self.path, 'a') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + '\n')
+
+
+class WebhookSink:
+    """POSTs {'text': one line per alert, 'alerts': [...]} to a URL"""
+
+    def __init__(self, url, timeout=WEBHOOK_TIMEOUT):
+        self.name = 'webhook'
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alerts):
+        import requests
+        response = requests.post(self.url, json={'text': '\n'.join(a['message'] for a in alerts), 'alerts': alerts},
+                                 timeout=self.timeout)
+        response.raise_for_status()
+
+
+class MemorySink:
+    """Keeps alerts in a list (for trying rules out)"""
+
+    def __init__(self):
+        self.name = 'memory'
+        self.alerts = []
+
+    def send(self, alerts):
+        self.alerts.extend(alerts)
+
+
+def make_sink(spec):
+    """Sink for one ALERT_SINKS entry"""
+    kind, _, arg = spec.partition(':')
+    if kind == 'file':
+        return FileSink(arg or ALERT_LOG_FILE)
+    if kind == 'webhook':
+        url = arg or ALERT_WEBHOOK_URL
+        if not url:
+            raise ValueError("webhook sink needs ALERT_WEBHOOK_URL in config.py (or 'webhook:<url>')")
+        return WebhookSink(url)
+    if kind == 'memory':
+        return MemorySink()
+    raise ValueError(f"unknown alert sink {spec!r}")
+
+
+# ========================================
+# ENGINE
+# ========================================
+class AlertEngine:
+    """Evaluates snapshots against `rules`, keeping per-rule state in `state_path` (None = in memory only)"""
+
+    def __init__(self, rules, state_path=ALERT_STATE_FILE, sinks=()):
+        self.rules = {rule.name: rule for rule in rules}
+        self.index = RuleIndex(rules)
+        self.state_path = state_path
+        self.sinks = list(sinks)
+        self.timestamp = None
+        self.values = {}        # symbol -> {field: last value evaluated}
+        self.active = {}        # rule name -> {symbol: epoch it went active}
+        self.fired = {}         # rule name -> {symbol: epoch it last fired}
+        self.stats = {'rows': 0, 'changed': 0, 'checked': 0, 'suppressed': 0}
+        self._load()
+
+    def _load(self):
+        if self.state_path is None:
+            return
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        fingerprints = state.get('rules', {})
+        # State of a rule that was edited or removed no longer means anything
+        kept = {name for name, rule in self.rules.items() if fingerprints.get(name) == rule.fingerprint}
+        self.active = {name: symbols for name, symbols in state.get('active', {}).items() if name in kept}
+        self.fired = {name: symbols for name, symbols in state.get('fired', {}).items() if name in kept}
+        self.timestamp = state.get('timestamp')
+        # New or edited rules haven't seen any value yet, so every token is evaluated once in full
+        if kept == set(self.rules):
+            self.values = state.get('values', {})
+
+    def save(self):
+        if self.state_path is None:
+            return
+        state = {
+            'timestamp': self.timestamp,
+            'rules': {name: rule.fingerprint for name, rule in self.rules.items()},
+            'active': {name: symbols for name, symbols in self.active.items() if symbols},
+            'fired': {name: symbols for name, symbols in self.fired.items() if symbols},
+            'values': self.values
+        }
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(state, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+    def evaluate(self, snapshot):
+        """Alerts fired by `snapshot` ([] if it isn't newer than the last one evaluated)"""
+        timestamp = snapshot['metadata']['timestamp']
+        if self.timestamp is not None and timestamp <= self.timestamp:
+            return []
+        self.timestamp = timestamp
+        now = to_epoch(timestamp)
+        alerts = []
+        for row in snapshot['projects']:
+            self.stats['rows'] += 1
+            symbol = row['token_symbol']
+            seen = None
+            for field in self.index.fields_for(symbol):
+                new = row.get(field)
+                if new is None:
+                    continue
+                if seen is None:
+                    seen = self.values.setdefault(symbol, {})
+                old = seen.get(field)
+                if old == new:
+                    continue
+                seen[field] = new
+                self.stats['changed'] += 1
+                for arm, release in self.index.candidates(field, symbol, old, new):
+                    for rule in arm:
+                        self.stats['checked'] += 1
+                        active = self.active.setdefault(rule.name, {})
+                        if symbol in active or not rule.armed(new):
+                            continue
+                        active[symbol] = now
+                        fired = self.fired.setdefault(rule.name, {})
+                        if now - fired.get(symbol, -math.inf) < rule.cooldown:
+                            self.stats['suppressed'] += 1
+                            continue
+                        fired[symbol] = now
+                        alerts.append(self._alert(rule, row, old, new, timestamp))
+                    for rule in release:
+                        self.stats['checked'] += 1
+                        active = self.active.get(rule.name)
+                        if active and symbol in active and rule.released(new):
+                            del active[symbol]
+        return alerts
+
+    def _alert(self, rule, row, previous, value, timestamp):
+        alert = {
+            'rule': rule.name, 'symbol': row['token_symbol'], 'project_name': row.get('project_name'),
+            'field': rule.field, 'op': rule.op, 'threshold': rule.value,
+            'value': value, 'previous': previous, 'timestamp': timestamp
+        }
+        if rule.message:
+            try:
+                alert['message'] = rule.message.format_map({**row, **alert})
+            except (KeyError, ValueError, IndexError) as e:
+                alert['message'] = f"{rule.message} (bad template: {e})"
+        else:
+            alert['message'] = f"${alert['symbol']} {rule.field} {value:,.2f} {rule.op} {rule.value:,.10g} ({rule.name})"
+        return alert
+
+    def deliver(self, alerts):
+        """Send `alerts` to every sink; a failing sink is reported and doesn't stop the others"""
+        if not alerts:
+            return
+        for sink in self.sinks:
+            try:
+                sink.send(alerts)
+                instrumentation.inc('alerts_delivered', len(alerts), sink=sink.name)
+            except Exception as e:
+                print(f"⚠️  Could not deliver {len(alerts)} alerts to {sink.name}: {e}")
+                instrumentation.inc('alert_delivery_failures', sink=sink.name)
+
+
+def open_engine(rules_path=ALERT_RULES_FILE, state_path=ALERT_STATE_FILE, sinks=None):
+    """AlertEngine for the rules file, or None (with the problems printed) if there are no usable rules"""
+    if not os.path.exists(rules_path):
+        return None
+    try:
+        rules = load_rules(rules_path)
+        sinks = [make_sink(spec) for spec in (ALERT_SINKS if sinks is None else sinks)]
+    except (AlertRuleError, ValueError) as e:
+        print(f"❌ Alerts disabled, {rules_path} failed validation:")
+        for problem in getattr(e, 'problems', [str(e)]):
+            print(f"   - {problem}")
+        return None
+    return AlertEngine(rules, state_path, sinks)
+
+
+def check_alerts(snapshot, rules_path=ALERT_RULES_FILE, state_path=ALERT_STATE_FILE, sinks=None, say=print):
+    """Evaluate a freshly stored snapshot and deliver what fires; returns the alerts ([] without a rules file)"""
+    engine = open_engine(rules_path, state_path, sinks)
+    if engine is None:
+        return []
+    with instrumentation.timer('stage', stage='alerts'):
+        alerts = engine.evaluate(snapshot)
+        engine.deliver(alerts)
+        engine.save()
+    instrumentation.inc('alerts_fired', len(alerts))
+    if alerts:
+        say(f"🔔 {len(alerts)} alerts:")
+        for alert in alerts:
+            say(f"   {alert['message']}")
+    return alerts
+
+
+# ========================================
+# COMMAND LINE
+# ========================================
+def print_rules(engine):
+    print(f"🔔 {len(engine.rules)} alert rules ({len(engine.index.groups)} threshold groups), "
+          f"sinks: {', '.join(s.name for s in engine.sinks) or '-'}")
+    for rule in engine.rules.values():
+        active = sorted(engine.active.get(rule.name, {}))
+        scope = ', '.join(f'${s}' for s in rule.symbols) if rule.symbols else 'all tokens'
+        print(f"   {rule.name:<20} {rule.describe():<32} {scope}"
+              + (f" - active: {', '.join('$' + s for s in active)}" if active else ''))
+    if engine.timestamp:
+        print(f"   Last evaluated snapshot: {engine.timestamp}")
+
+
+def backtest(engine, start=None, end=None):
+    """Run every stored snapshot in range through `engine`; returns (snapshots, alerts)"""
+    store = open_history_store()
+    snapshots = 0
+    alerts = []
+    try:
+        for snapshot in store.iter_snapshots(start, end):
+            alerts.extend(engine.evaluate(snapshot))
+            snapshots += 1
+    finally:
+        store.close()
+    return snapshots, alerts
+
+
+def run_alerts(command=None, start=None, end=None, rules_path=ALERT_RULES_FILE):
+    """Run one alerts command (None = list rules, 'check', 'backtest', 'test'); returns an exit code"""
+    if not os.path.exists(rules_path):
+        print(f"❌ No {rules_path} - add rules to get alerts (see the README)")
+        return 1
+
+    if command == 'check':
+        store = open_history_store()
+        snapshot = store.latest_snapshot()
+        store.close()
+        if not snapshot:
+            print("❌ No stored snapshots yet")
+            print("   Run: python3 kaito_tracker.py fetch")
+            return 1
+        if not check_alerts(snapshot, rules_path):
+            print(f"✅ No new alerts for the snapshot of {snapshot['metadata']['timestamp']}")
+        return 0
+
+    if command == 'backtest':
+        engine = open_engine(rules_path, state_path=None, sinks=[])
+        if engine is None:
+            return 1
+        snapshots, alerts = backtest(engine, start, end)
+        for alert in alerts:
+            print(f"   {alert['timestamp']}  {alert['message']}")
+        stats = engine.stats
+        print(f"🔔 {len(alerts)} alerts over {snapshots} snapshots "
+              f"({stats['changed']:,} changed values, {stats['checked']:,} rule checks "
+              f"for {stats['rows']:,} rows x {len(engine.rules)} rules, {stats['suppressed']} in cooldown)")
+        return 0
+
+    engine = open_engine(rules_path)
+    if engine is None:
+        return 1
+    if command == 'test':
+        engine.deliver([{
+            'rule': 'test', 'symbol': 'TEST', 'project_name': 'Test', 'field': 'all_time_roi', 'op': '>',
+            'threshold': 0, 'value': 1, 'previous': None, 'timestamp': datetime.now().isoformat(),
+            'message': '🔔 Kaito tracker test alert'
+        }])
+        print(f"✅ Test alert sent to {', '.join(s.name for s in engine.sinks) or 'no sinks'}")
+    else:
+        print_rules(engine)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Threshold alerts on new tracker snapshots')
+    parser.add_argument('command', nargs='?', choices=['check', 'backtest', 'test'],
+                        help='check: evaluate the latest snapshot, backtest: replay the stored history '
+                             'without saving or sending, test: send a test alert (default: list rules)')
+    parser.add_argument('--from', dest='start', help='First snapshot timestamp for backtest (ISO, e.g. 2025-06-01)')
+    parser.add_argument('--to', dest='end', help='Last snapshot timestamp for backtest (ISO)')
+    parser.add_argument('--rules', default=ALERT_RULES_FILE)
+    args = parser.parse_args()
+    raise SystemExit(run_alerts(args.command, args.start, args.end, args.rules))
+
+
+if __name__ == "__main__":
+    main()
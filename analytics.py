@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Vectorized analytics over the full snapshot history (NumPy)
+ROI since TGE, max drawdown, realized volatility, Sharpe-like ratio, ROI rank
+
+History is streamed oldest snapshot first, one chunk of quote rows at a
+time (np.fromiter). Each chunk becomes a (symbols x chunk snapshots) block
+that updates running per-symbol state: last known price, running peak and
+worst drawdown, and Welford moments of the log returns in each volatility
+window. Memory stays at O(symbols) plus one block, whatever the history length.
+
+Results are cached per stored snapshot (in memory and in ANALYTICS_CACHE_FILE),
+so the renders after a fetch don't stream the history again.
+"""
+
+import json
+import os
+from itertools import islice
+
+import numpy as np
+
+from history_store import open_history_store
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_YEAR = 365 * SECONDS_PER_DAY
+VOL_WINDOWS = {'7d': 7, '30d': 30}   # Trailing windows for realized volatility (days)
+HISTORY_CHUNK_ROWS = 65536           # Quote rows read per streaming step
+ANALYTICS_CACHE_FILE = 'analytics_cache.json'
+
+# One quote row as read from the store; a None price reads as NaN
+HISTORY_ROW = np.dtype([('symbol', 'U64'), ('snapshot', np.int64), ('price', np.float64), ('tge', np.float64)])
+
+_cache = {}                          # history key -> {symbol: {metric: value}} (latest only)
+
+
+def epoch_seconds(timestamps):
+    """float64 epoch seconds for ISO timestamp strings (or datetimes)"""
+    return np.array(timestamps, dtype='datetime64[us]').astype(np.int64) / 1e6
+
+
+def forward_fill(prices):
+    """Carry the last known price forward along each row"""
+    valid = ~np.isnan(prices)
+    if valid.all():
+        return prices
+    idx = np.where(valid, np.arange(prices.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return np.take_along_axis(prices, idx, axis=1)
+
+
+def rank_percentiles(values):
+    """Percentile rank (0-100) of each value; NaN stays NaN"""
+    out = np.full(values.shape, np.nan)
+    valid = ~np.isnan(values)
+    n = valid.sum()
+    if n == 1:
+        out[valid] = 100.0
+    elif n > 1:
+        ranks = np.argsort(np.argsort(values[valid], kind='stable'), kind='stable')
+        out[valid] = ranks * 100.0 / (n - 1)
+    return out
+
+
+class RunningMetrics:
+    """Per-symbol metric state, fed one block of snapshot columns at a time
+
+    `timestamps` are every snapshot the metrics will cover (the volatility
+    windows end at the last one). feed() takes the next columns in order;
+    rows are symbols, added with rows_for() as they first appear.
+    """
+
+    def __init__(self, timestamps, size=0):
+        self.timestamps = timestamps
+        self.column = 0                 # Next snapshot column to feed
+        self.row_of = {}
+        # A return lands in column c; it is inside a window if c > the window's first snapshot
+        end = timestamps[-1] if len(timestamps) else 0
+        self.window_start = {label: int(np.searchsorted(timestamps, end - days * SECONDS_PER_DAY)) + 1
+                             for label, days in VOL_WINDOWS.items()}
+        self.last = np.full(size, np.nan)       # Forward-filled price
+        self.peak = np.full(size, np.nan)
+        self.worst = np.full(size, np.nan)      # Worst drawdown so far (fraction)
+        self.tge = np.full(size, np.nan)
+        self.count = {label: np.zeros(size) for label in VOL_WINDOWS}
+        self.mean = {label: np.zeros(size) for label in VOL_WINDOWS}
+        self.m2 = {label: np.zeros(size) for label in VOL_WINDOWS}
+
+    @property
+    def symbols(self):
+        return list(self.row_of)
+
+    def _arrays(self):
+        yield 'last', self.last
+        yield 'peak', self.peak
+        yield 'worst', self.worst
+        yield 'tge', self.tge
+
+    def grow(self, size):
+        """Make room for `size` rows; new rows start with no history"""
+        extra = size - len(self.last)
+        if extra <= 0:
+            return
+        for name, values in list(self._arrays()):
+            setattr(self, name, np.concatenate([values, np.full(extra, np.nan)]))
+        for moments in (self.count, self.mean, self.m2):
+            for label in moments:
+                moments[label] = np.concatenate([moments[label], np.zeros(extra)])
+
+    def rows_for(self, symbols):
+        """Row index per symbol (an array of strings), adding unseen symbols"""
+        unique, inverse = np.unique(symbols, return_inverse=True)
+        rows = np.array([self.row_of.setdefault(s, len(self.row_of)) for s in unique.tolist()], dtype=np.int64)
+        self.grow(len(self.row_of))
+        return rows[inverse]
+
+    def take(self, rows):
+        """Copy of the state for `rows` (-1: a symbol with no history), at the same column"""
+        rows = np.asarray(rows, dtype=np.int64)
+        known = rows >= 0
+        picked = RunningMetrics(self.timestamps, len(rows))
+        picked.column = self.column
+        for name, values in self._arrays():
+            getattr(picked, name)[known] = values[rows[known]]
+        for source, target in ((self.count, picked.count), (self.mean, picked.mean), (self.m2, picked.m2)):
+            for label in source:
+                target[label][known] = source[label][rows[known]]
+        return picked
+
+    def feed(self, block):
+        """Advance over the next block.shape[1] snapshot columns (NaN: no quote)"""
+        width = block.shape[1]
+        if width == 0:
+            return
+        with np.errstate(divide='ignore', invalid='ignore'):
+            filled = forward_fill(np.hstack([self.last[:, None], block]))
+            peaks = np.fmax.accumulate(np.hstack([self.peak[:, None], filled[:, 1:]]), axis=1)
+            drawdowns = filled[:, 1:] / peaks[:, 1:] - 1
+            self.worst = np.fmin(self.worst, np.fmin.reduce(drawdowns, axis=1))
+            returns = np.diff(np.log(filled), axis=1)     # returns[:, k] lands in column self.column + k
+        for label, start in self.window_start.items():
+            first = max(0, start - self.column)
+            if first < width:
+                self._merge(label, returns[:, first:])
+        self.last = filled[:, -1]
+        self.peak = peaks[:, -1]
+        self.column += width
+
+    def _merge(self, label, window):
+        """Fold a block of returns into the window's running moments (Welford/Chan)"""
+        valid = ~np.isnan(window)
+        count_b = valid.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_b = np.where(valid, window, 0.0).sum(axis=1) / count_b
+            dev = np.where(valid, window - mean_b[:, None], 0.0)
+            m2_b = np.einsum('ij,ij->i', dev, dev)
+            count_a, mean_a = self.count[label], self.mean[label]
+            total = count_a + count_b
+            delta = mean_b - mean_a
+            has = count_b > 0
+            self.mean[label] = np.where(has, mean_a + delta * count_b / total, mean_a)
+            self.m2[label] = np.where(has, self.m2[label] + m2_b + delta * delta * count_a * count_b / total,
+                                      self.m2[label])
+        self.count[label] = total
+
+    def metrics(self):
+        """Every metric as float64[N] arrays (NaN where not computable)"""
+        n_points = len(self.timestamps)
+        if n_points > 1:
+            step = np.median(np.diff(self.timestamps))
+            periods_per_year = SECONDS_PER_YEAR / step if step > 0 else np.nan
+        else:
+            periods_per_year = np.nan
+        annualize = np.sqrt(periods_per_year)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roi = (self.last - self.tge) / self.tge * 100
+        metrics = {
+            'current_price': self.last.copy(),
+            'roi_since_tge': roi,
+            'max_drawdown': self.worst * 100,
+            'roi_percentile': rank_percentiles(roi)
+        }
+        for label in VOL_WINDOWS:
+            count = self.count[label]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                std = np.sqrt(np.clip(self.m2[label] / (count - 1), 0, None))
+            std[count < 2] = np.nan
+            metrics[f'volatility_{label}'] = std * annualize * 100
+            if label == '30d':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    metrics['sharpe_30d'] = np.where(std > 0, self.mean[label] / std * annualize, np.nan)
+        return metrics
+
+
+def compute_metrics(timestamps, prices, tge_prices, chunk=1024):
+    """Compute every metric for a dense (symbols x snapshots) price matrix
+
+    Returns a dict of float64[N] arrays (NaN where not computable):
+    current_price, roi_since_tge, max_drawdown, volatility_7d, volatility_30d,
+    sharpe_30d, roi_percentile
+    """
+    running = RunningMetrics(timestamps, prices.shape[0])
+    running.tge[:] = tge_prices
+    for start in range(0, prices.shape[1], chunk):
+        running.feed(prices[:, start:start + chunk])
+    return running.metrics()
+
+
+def stream_history(store, pending=(), index=None):
+    """RunningMetrics fed with the whole stored history, oldest snapshot first
+
+    `pending` timestamps are extra snapshots after the stored ones: the
+    volatility windows end at the last of them, and they are left for the
+    caller to feed.
+    """
+    index = index if index is not None else store.snapshot_index()
+    timestamps = epoch_seconds([row[1] for row in index] + list(pending))
+    running = RunningMetrics(timestamps)
+    if not index:
+        return running
+
+    snapshot_ids = np.fromiter((row[0] for row in index), dtype=np.int64, count=len(index))
+    column_of = np.full(snapshot_ids.max() + 1, -1, dtype=np.int64)
+    column_of[snapshot_ids] = np.arange(len(snapshot_ids))
+
+    rows = map(tuple, store.price_rows())   # sqlite3.Row -> plain tuples for np.fromiter
+    held = np.empty(0, dtype=HISTORY_ROW)   # Rows of a snapshot the last chunk cut through
+    while True:
+        chunk = np.fromiter(islice(rows, HISTORY_CHUNK_ROWS), dtype=HISTORY_ROW)
+        exhausted = len(chunk) < HISTORY_CHUNK_ROWS
+        chunk = np.concatenate([held, chunk]) if len(held) else chunk
+        columns = column_of[chunk['snapshot']]
+        if exhausted:
+            end, held = len(index), chunk[:0]
+        else:
+            cut = int(np.searchsorted(columns, columns[-1]))
+            end, held, chunk, columns = columns[-1], chunk[cut:], chunk[:cut], columns[:cut]
+
+        symbol_rows = running.rows_for(chunk['symbol'])
+        block = np.full((len(running.last), end - running.column), np.nan)
+        block[symbol_rows, columns - running.column] = chunk['price']
+        tge = chunk['tge']
+        known = ~np.isnan(tge) & (tge != 0)
+        running.tge[symbol_rows[known]] = tge[known]
+        running.feed(block)
+        if exhausted:
+            return running
+
+
+def metrics_by_symbol(symbols, metrics):
+    """Convert metric arrays into {symbol: {metric: float or None}}"""
+    out = {}
+    for i, symbol in enumerate(symbols):
+        out[symbol] = {
+            key: (None if np.isnan(values[i]) else float(values[i]))
+            for key, values in metrics.items()
+        }
+    return out
+
+
+def history_key(store, index):
+    """Identifies the stored history: backend file plus the latest snapshot id and time"""
+    if not index:
+        return None
+    return [os.path.abspath(store.path), len(index), index[-1][0], index[-1][1]]
+
+
+def _load_cached(key, path):
+    try:
+        with open(path, 'r') as f:
+            cached = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return cached['metrics'] if cached.get('key') == key else None
+
+
+def _save_cached(key, metrics, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'key': key, 'metrics': metrics}, f)
+    os.replace(tmp, path)
+
+
+def compute_history_metrics(store=None, cache_path=ANALYTICS_CACHE_FILE):
+    """{symbol: {metric: value}} over the whole history store, cached per latest snapshot"""
+    own_store = store is None
+    store = store or open_history_store()
+    try:
+        index = store.snapshot_index()
+        key = history_key(store, index)
+        cache_id = json.dumps(key)
+        metrics = _cache.get(cache_id)
+        if metrics is None and key is not None and cache_path:
+            metrics = _load_cached(key, cache_path)
+        if metrics is None:
+            running = stream_history(store, index=index)
+            metrics = metrics_by_symbol(running.symbols, running.metrics())
+            if key is not None and cache_path:
+                _save_cached(key, metrics, cache_path)
+        _cache.clear()
+        _cache[cache_id] = metrics
+    finally:
+        if own_store:
+            store.close()
+    return {symbol: dict(values) for symbol, values in metrics.items()}
+
+
+class PendingSnapshotMetrics:
+    """History metrics for rows of a snapshot that isn't stored yet, one batch of rows at a time
+
+    The stored history is streamed once. Each batch's symbols take a copy of
+    their running state and are fed the pending snapshot as one more column,
+    so they match a pass over the history with that snapshot stored.
+    roi_percentile ranks every symbol against the others and is left out.
+    """
+
+    def __init__(self, store, timestamp):
+        self.running = stream_history(store, pending=[timestamp])
+
+    def for_rows(self, rows):
+        """{symbol: {metric: value}} for result rows of the pending snapshot"""
+        picked = self.running.take([self.running.row_of.get(row['token_symbol'], -1) for row in rows])
+        column = np.full((len(rows), 1), np.nan)
+        for i, row in enumerate(rows):
+            if row.get('current_price') is not None:
+                column[i, 0] = row['current_price']
+            if row.get('tge_price'):
+                picked.tge[i] = row['tge_price']
+        picked.feed(column)
+        metrics = picked.metrics()
+        del metrics['roi_percentile']
+        return metrics_by_symbol([row['token_symbol'] for row in rows], metrics)
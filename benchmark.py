@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the tracker pipeline
+Synthetic projects_database.json universes + a local fake CMC quotes server
+
+Each universe size runs in its own subprocess (so peak RSS is per size) and
+times fetch, metric computation, persistence, rendering and detail pages separately.
+
+Usage:
+    python3 benchmark.py                         # 10, 1k, 10k, 50k projects
+    python3 benchmark.py --sizes 10 1000 --latency 0.05 --error-rate 0.02
+    python3 benchmark.py --output bench_results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_SIZES = [10, 1000, 10000, 50000]
+QUOTES_PATH = '/v2/cryptocurrency/quotes/latest'
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# ========================================
+# SYNTHETIC DATA
+# ========================================
+def synthetic_symbol(i):
+    return f"T{i:05d}"
+
+
+def generate_universe(n, seed=42):
+    """n synthetic projects in projects_database.json format"""
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    return [
+        {
+            'name': f"Synthetic Agent {i}",
+            'twitter': f"@synthetic_{i}",
+            'token_symbol': synthetic_symbol(i),
+            'tge_date': (start + timedelta(days=rng.randrange(900))).strftime('%Y-%m-%d'),
+            'tge_price': round(rng.uniform(0.001, 2), 6),
+            'category': rng.choice(['AI Agents', 'AI Infra', 'AI Launchpad'])
+        }
+        for i in range(n)
+    ]
+
+
+def synthetic_quote(key):
+    """Deterministic fake CMC asset entry for a symbol or id"""
+    rng = random.Random(key)
+    return {
+        'id': zlib.crc32(key.encode()) % 10**6,
+        'symbol': key,
+        'name': key,
+        'quote': {'USD': {
+            'price': rng.uniform(0.001, 5),
+            'market_cap': rng.uniform(1e5, 5e9),
+            'volume_24h': rng.uniform(1e3, 1e8),
+            'percent_change_24h': rng.uniform(-40, 40),
+            'percent_change_7d': rng.uniform(-60, 60),
+            'percent_change_30d': rng.uniform(-90, 90)
+        }}
+    }
+
+
+# ========================================
+# FAKE CMC SERVER
+# ========================================
+class FakeCMCServer:
+    """Local stand-in for /v2/cryptocurrency/quotes/latest
+
+    Adds `latency` seconds per request and answers `error_rate` of requests
+    with a 500 (a fraction of those as 429 with Retry-After).
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                url = urlparse(self.path)
+                if server.latency:
+                    time.sleep(server.latency)
+                if server.rng.random() < server.error_rate:
+                    server.errors += 1
+                    status = 429 if server.rng.random() < 0.5 else 500
+                    self._send(status, {'status': {'error_code': status}}, {'Retry-After': '0'})
+                    return
+                if url.path != QUOTES_PATH:
+                    self._send(404, {'status': {'error_message': 'not found'}})
+                    return
+                params = parse_qs(url.query)
+                if 'id' in params:
+                    data = {k: synthetic_quote(k) for k in params['id'][0].split(',')}
+                else:
+                    data = {k: [synthetic_quote(k)] for k in params.get('symbol', [''])[0].split(',') if k}
+                self._send(200, {'data': data})
+
+            def _send(self, status, body, headers=None):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# ========================================
+# BENCHMARK RUN (one universe size)
+# ========================================
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(stages, name, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    stages[name] = {'seconds': round(time.perf_counter() - start, 4), 'peak_rss_mb': round(peak_rss_mb(), 1)}
+    return result
+
+
+def run_one(size, latency, error_rate):
+    """Benchmark one universe size inside a scratch directory; returns a result dict"""
+    sys.path.insert(0, REPO_DIR)
+    from analytics import compute_history_metrics
+    from cmc_client import CMCClient
+    from fetch_all_projects import fetch_quotes_for_projects, process_projects, save_snapshot
+    from generate_dashboard import generate_dashboard
+    from history_store import open_history_store
+    from project_pages import render_project_pages
+
+    server = FakeCMCServer(latency=latency, error_rate=error_rate)
+    client = CMCClient('benchmark', base_url=server.url, requests_per_minute=0,
+                       backoff_base=0.01, backoff_cap=0.1)
+    stages = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        projects = generate_universe(size)
+        with open('projects_database.json', 'w') as f:
+            json.dump(projects, f)
+
+        cmc_data = timed(stages, 'fetch', fetch_quotes_for_projects, projects, client=client)
+        results = timed(stages, 'process', process_projects, projects, cmc_data, verbose=False)
+
+        store = open_history_store()
+        timed(stages, 'persist', save_snapshot, results, store)
+        metrics = timed(stages, 'metrics', compute_history_metrics, store)
+        store.close()
+
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                timed(stages, 'render', generate_dashboard, detail_pages=False)
+                timed(stages, 'detail_pages', render_project_pages, results, metrics)
+            finally:
+                sys.stdout = stdout
+        html_bytes = os.path.getsize('dashboard.html')
+        os.chdir(REPO_DIR)
+
+    server.close()
+    return {
+        'projects': size,
+        'quotes_returned': len(results),
+        'requests': server.requests,
+        'injected_errors': server.errors,
+        'html_bytes': html_bytes,
+        'total_seconds': round(sum(s['seconds'] for s in stages.values()), 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'stages': stages
+    }
+
+
+def measure_startup(runs=5):
+    """Median wall time of `kaito_tracker.py --help` vs. a bare interpreter (lazy-import check)"""
+    def median_seconds(cmd):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(cmd, cwd=REPO_DIR, stdout=subprocess.DEVNULL, check=True)
+            times.append(time.perf_counter() - start)
+        return round(sorted(times)[len(times) // 2], 4)
+
+    return {
+        'python_seconds': median_seconds([sys.executable, '-c', 'pass']),
+        'cli_help_seconds': median_seconds([sys.executable, os.path.join(REPO_DIR, 'kaito_tracker.py'), '--help'])
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kaito tracker end-to-end benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--latency', type=float, default=0.02, help='Fake server latency per request (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered 429/500')
+    parser.add_argument('--output', help='Write results JSON here (default: stdout)')
+    parser.add_argument('--run-one', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one is not None:
+        print(json.dumps(run_one(args.run_one, args.latency, args.error_rate)))
+        return
+
+    runs = []
+    for size in args.sizes:
+        print(f"⏱️  Benchmarking {size:,} projects...", file=sys.stderr)
+        out = subprocess.check_output([
+            sys.executable, os.path.abspath(__file__), '--run-one', str(size),
+            '--latency', str(args.latency), '--error-rate', str(args.error_rate)
+        ], text=True)
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+        print(f"   ✅ {runs[-1]['total_seconds']:.2f}s, peak RSS {runs[-1]['peak_rss_mb']:.0f} MB", file=sys.stderr)
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'latency': args.latency,
+        'error_rate': args.error_rate,
+        'startup': measure_startup(),
+        'runs': runs
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📁 Results saved to: {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
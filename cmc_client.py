@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Shared CoinMarketCap HTTP client
+Pooled keep-alive session + timeouts + retries with backoff + rate limiting
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from instrumentation import instrumentation
+
+# ========================================
+# DEFAULTS
+# ========================================
+CMC_BASE_URL = "https://pro-api.coinmarketcap.com"
+
+REQUESTS_PER_MINUTE = 30    # CMC Basic plan limit
+CONNECT_TIMEOUT = 5         # Seconds to establish a connection
+READ_TIMEOUT = 30           # Seconds to wait for a response
+MAX_RETRIES = 5             # Retries after the first attempt
+BACKOFF_BASE = 1.0          # First backoff step in seconds
+BACKOFF_CAP = 60.0          # Longest single backoff sleep
+POOL_SIZE = 10              # Keep-alive connections per host
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CMCError(Exception):
+    """Raised when a CoinMarketCap request fails after all retries
+
+    `detail` is the API's own status.error_message, when the body had one.
+    """
+
+    def __init__(self, message, status=None, detail=None):
+        super().__init__(message)
+        self.status = status
+        self.detail = detail
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at rate_per_minute"""
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, rate_per_minute // 6))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Drain the bucket so no request goes out for `seconds` (used on 429)"""
+        with self.lock:
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+def api_error_message(response):
+    """status.error_message from a CMC error body, or None"""
+    try:
+        return (response.json().get('status') or {}).get('error_message')
+    except (ValueError, AttributeError):
+        return None
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CMCClient:
+    """Shared client for all CoinMarketCap calls"""
+
+    def __init__(self, api_key, base_url=CMC_BASE_URL,
+                 requests_per_minute=REQUESTS_PER_MINUTE,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE,
+                 backoff_cap=BACKOFF_CAP, pool_size=POOL_SIZE):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.limiter = TokenBucket(requests_per_minute) if requests_per_minute else None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'X-CMC_PRO_API_KEY': api_key,
+            'Accept': 'application/json'
+        })
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get(self, path, params=None):
+        """GET base_url + path and return the decoded JSON body"""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+
+            retry_after = None
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                instrumentation.observe('cmc_request', time.perf_counter() - start, endpoint=path)
+                instrumentation.inc('cmc_responses', endpoint=path, status=type(e).__name__)
+                last_error = CMCError(f"{type(e).__name__}: {e}")
+            else:
+                instrumentation.observe('cmc_request', time.perf_counter() - start, endpoint=path)
+                instrumentation.inc('cmc_responses', endpoint=path, status=response.status_code)
+                instrumentation.inc('cmc_response_bytes', len(response.content), endpoint=path)
+                if response.status_code < 400:
+                    try:
+                        body = response.json()
+                    except ValueError:
+                        # A proxy or maintenance page instead of the API - retried like a 5xx
+                        last_error = CMCError(f"HTTP {response.status_code} from {path} is not JSON: "
+                                              f"{response.text[:200]}", status=response.status_code)
+                    else:
+                        credits = (body.get('status') or {}).get('credit_count')
+                        if credits:
+                            instrumentation.inc('cmc_credits_used', credits, endpoint=path)
+                        return body
+                else:
+                    last_error = CMCError(
+                        f"HTTP {response.status_code} from {path}: {response.text[:200]}",
+                        status=response.status_code, detail=api_error_message(response)
+                    )
+                    if response.status_code not in RETRY_STATUSES:
+                        raise last_error
+
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if response.status_code == 429 and self.limiter:
+                        self.limiter.pause(retry_after or self.backoff_base)
+
+            if attempt < self.max_retries:
+                instrumentation.inc('cmc_retries', endpoint=path)
+                time.sleep(self._backoff(attempt, retry_after))
+
+        raise last_error
+
+    def close(self):
+        self.session.close()
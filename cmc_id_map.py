@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Locally cached CoinMarketCap id map
+Resolves tickers to stable CMC ids so quotes can be fetched by id=
+
+Tickers are ambiguous (several assets share IN or BID). The map is fetched
+rarely from /v1/cryptocurrency/map, cached in cmc_id_map.json and indexed
+in memory for O(1) lookups, so resolution works offline from the cache.
+
+Usage:
+    python3 cmc_id_map.py      # force a refresh of the cached map
+"""
+
+import json
+import os
+import time
+
+ID_MAP_FILE = 'cmc_id_map.json'
+ID_MAP_MAX_AGE = 7 * 86400      # Refresh the cached map weekly
+ID_MAP_PATH = '/v1/cryptocurrency/map'
+ID_MAP_PAGE_SIZE = 5000
+
+
+class IdMap:
+    """In-memory index over the cached CMC id map"""
+
+    def __init__(self, entries, fetched_at=0):
+        self.entries = entries
+        self.fetched_at = fetched_at
+        self.by_id = {}
+        self.by_symbol = {}
+        for entry in entries:
+            self.by_id[entry['id']] = entry
+            self.by_symbol.setdefault(entry['symbol'].upper(), []).append(entry)
+        for candidates in self.by_symbol.values():
+            candidates.sort(key=lambda e: e.get('rank') or float('inf'))
+
+    @classmethod
+    def load(cls, path=ID_MAP_FILE):
+        """Load the cached map; an empty map if there is no cache yet"""
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            return cls(cached['entries'], cached['fetched_at'])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return cls([])
+
+    def save(self, path=ID_MAP_FILE):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'fetched_at': self.fetched_at, 'entries': self.entries}, f)
+        os.replace(tmp, path)
+
+    def is_stale(self, max_age=ID_MAP_MAX_AGE, now=None):
+        now = now if now is not None else time.time()
+        return not self.entries or now - self.fetched_at > max_age
+
+    def candidates(self, symbol):
+        """All assets sharing a ticker, best CMC rank first"""
+        return self.by_symbol.get(symbol.upper(), [])
+
+    def resolve(self, project):
+        """CMC id for a project entry, or None if the ticker is unknown or ambiguous
+
+        An explicit cmc_id always wins. Otherwise the ticker's only candidate,
+        or the one whose name/slug matches the project's name exactly. Several
+        candidates and no exact match is left unresolved - rank says nothing
+        about which asset Kaito lists, and a wrong id would be pinned for good.
+        """
+        if project.get('cmc_id'):
+            return project['cmc_id']
+
+        candidates = self.candidates(project['token_symbol'])
+        if not candidates:
+            return None
+
+        name = project.get('name', '').lower()
+        for entry in candidates:
+            if entry['name'].lower() == name or entry['slug'] == name.replace(' ', '-'):
+                return entry['id']
+        return candidates[0]['id'] if len(candidates) == 1 else None
+
+
+def fetch_id_map(client):
+    """Download the full active id map from CMC (paged)"""
+    entries = []
+    start = 1
+    while True:
+        payload = client.get(ID_MAP_PATH, params={
+            'listing_status': 'active',
+            'start': start,
+            'limit': ID_MAP_PAGE_SIZE,
+            'aux': 'is_active'
+        })
+        page = payload.get('data', [])
+        entries.extend(
+            {'id': e['id'], 'symbol': e['symbol'], 'name': e['name'], 'slug': e['slug'], 'rank': e.get('rank')}
+            for e in page
+        )
+        if len(page) < ID_MAP_PAGE_SIZE:
+            break
+        start += ID_MAP_PAGE_SIZE
+    return IdMap(entries, time.time())
+
+
+def load_id_map(client=None, path=ID_MAP_FILE, max_age=ID_MAP_MAX_AGE):
+    """Cached id map, refreshed from CMC when stale; falls back to the cache when offline"""
+    id_map = IdMap.load(path)
+    if client is None or not id_map.is_stale(max_age):
+        return id_map
+
+    try:
+        fresh = fetch_id_map(client)
+    except Exception as e:
+        print(f"⚠️  Could not refresh CMC id map ({e}), using cached copy")
+        return id_map
+
+    fresh.save(path)
+    return fresh
+
+
+def id_map_is_fresh(path=ID_MAP_FILE, max_age=ID_MAP_MAX_AGE, now=None):
+    """True if the cached map exists and is younger than max_age (without parsing it)"""
+    now = now if now is not None else time.time()
+    try:
+        return now - os.path.getmtime(path) <= max_age
+    except OSError:
+        return False
+
+
+def resolve_projects(projects, id_map):
+    """Fill in cmc_id on projects that don't have one yet; returns the projects that changed"""
+    resolved = []
+    for project in projects:
+        if project.get('cmc_id'):
+            continue
+        cmc_id = id_map.resolve(project)
+        if cmc_id:
+            project['cmc_id'] = cmc_id
+            resolved.append(project)
+            continue
+        candidates = id_map.candidates(project['token_symbol'])
+        if len(candidates) > 1:
+            listed = ', '.join(f"{e['id']} ({e['name']})" for e in candidates)
+            print(f"⚠️  ${project['token_symbol']} matches {len(candidates)} CMC assets and none is named "
+                  f"{project.get('name')!r}: {listed}")
+            print("   Set its cmc_id in projects_database.json; it is quoted by symbol until then")
+    return resolved
+
+
+def main():
+    from fetch_all_projects import get_cmc_client
+
+    id_map = load_id_map(get_cmc_client(), max_age=0)
+    print(f"✅ {len(id_map.entries)} CMC assets cached in {ID_MAP_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Compact columnar snapshot format (.kcs)
+Field names stored once, numeric columns as contiguous float64 arrays
+
+Layout:
+    b'KCS1' | uint32 header length | JSON header | padding to 8 bytes | columns
+
+The JSON header holds the run metadata, the string columns and the offset of
+every numeric column. Numeric columns are written in native byte order and
+memory-mapped and read in place, so opening a snapshot costs one JSON parse
+and no per-row work. None is stored as NaN.
+
+Usage:
+    python3 columnar_snapshot.py export tracker_results_latest.kcs results.json
+    python3 columnar_snapshot.py import results.json tracker_results_latest.kcs
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from history_store import RESULT_FIELDS
+
+MAGIC = b'KCS1'
+LATEST_SNAPSHOT_FILE = 'tracker_results_latest.kcs'
+
+STRING_FIELDS = ['project_name', 'twitter', 'token_symbol', 'tge_date', 'timestamp', 'quote_source']
+INT_FIELDS = ['days_since_tge']
+NUMERIC_FIELDS = [f for f in RESULT_FIELDS if f not in STRING_FIELDS]
+FIELD_SET = frozenset(RESULT_FIELDS)
+
+
+def write_snapshot(path, data):
+    """Write a {'metadata', 'projects'} snapshot in columnar form (atomically)"""
+    projects = data['projects']
+    n_rows = len(projects)
+
+    columns = {}
+    offset = 0
+    for field in NUMERIC_FIELDS:
+        columns[field] = {'offset': offset, 'int': field in INT_FIELDS}
+        offset += n_rows * 8
+
+    header = json.dumps({
+        'metadata': data['metadata'],
+        'rows': n_rows,
+        'byteorder': sys.byteorder,
+        'strings': {field: [p.get(field) for p in projects] for field in STRING_FIELDS},
+        'columns': columns
+    }, separators=(',', ':')).encode()
+    padding = -(len(MAGIC) + 4 + len(header)) % 8
+
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        f.write(b'\0' * padding)
+        for field in NUMERIC_FIELDS:
+            values = array('d', (math.nan if p.get(field) is None else p[field] for p in projects))
+            f.write(values.tobytes())
+    os.replace(tmp, path)
+
+
+class ColumnarSnapshot:
+    """Read-only, memory-mapped view of a .kcs snapshot"""
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        if self.map[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a columnar snapshot")
+
+        (header_len,) = struct.unpack_from('<I', self.map, 4)
+        header = json.loads(self.map[8:8 + header_len])
+        data_start = 8 + header_len + (-(8 + header_len) % 8)
+
+        self.metadata = header['metadata']
+        self.n_rows = header['rows']
+        self.strings = header['strings']
+        for field in STRING_FIELDS:
+            self.strings.setdefault(field, [None] * self.n_rows)  # Written before the field existed
+        self.columns = {}
+        self.views = [memoryview(self.map)]     # Ours, released on close
+        view = self.views[0]
+        for field, info in header['columns'].items():
+            start = data_start + info['offset']
+            column = view[start:start + self.n_rows * 8].cast('d')
+            self.views.append(column)
+            if header['byteorder'] != sys.byteorder:
+                column = array('d', column)  # Written on a foreign-endian host: copy and swap
+                column.byteswap()
+            self.columns[field] = column
+        self.int_fields = {f for f, info in header['columns'].items() if info['int']}
+
+    def column(self, field):
+        """A whole column: list for strings, zero-copy float64 memoryview for numbers
+
+        The memoryview is the caller's own: it stays valid after close().
+        """
+        if field in self.strings:
+            return self.strings[field]
+        column = self.columns[field]
+        return column[:] if isinstance(column, memoryview) else column
+
+    def value(self, field, i):
+        if field in self.strings:
+            return self.strings[field][i]
+        v = self.columns[field][i]
+        if v != v:  # NaN
+            return None
+        return int(v) if field in self.int_fields else v
+
+    @property
+    def projects(self):
+        return RowSequence(self, 0, self.n_rows)
+
+    def to_dict(self):
+        """Materialize as a regular {'metadata', 'projects'} snapshot (JSON export)"""
+        return {
+            'metadata': self.metadata,
+            'projects': [{field: self.value(field, i) for field in RESULT_FIELDS} for i in range(self.n_rows)]
+        }
+
+    def close(self):
+        """Release the mapping; column views a caller still holds keep it alive until they're dropped"""
+        self.columns = {}
+        for view in reversed(getattr(self, 'views', [])):
+            view.release()
+        self.views = []
+        if isinstance(self.map, mmap.mmap):
+            try:
+                self.map.close()
+            except BufferError:
+                pass    # Unmapped once the last exported view is garbage collected
+        self.file.close()
+
+    def __getitem__(self, key):
+        """Mapping-style access so a snapshot can stand in for the JSON dict"""
+        if key == 'metadata':
+            return self.metadata
+        if key == 'projects':
+            return self.projects
+        raise KeyError(key)
+
+
+class RowView:
+    """One row, read lazily from the columns (a read-only dict over RESULT_FIELDS, never materialized)"""
+
+    __slots__ = ('snapshot', 'index')
+
+    def __init__(self, snapshot, index):
+        self.snapshot = snapshot
+        self.index = index
+
+    def __getitem__(self, field):
+        if field not in FIELD_SET:
+            raise KeyError(field)
+        return self.snapshot.value(field, self.index)
+
+    def get(self, field, default=None):
+        return self.snapshot.value(field, self.index) if field in FIELD_SET else default
+
+    def __contains__(self, field):
+        return field in FIELD_SET
+
+    def __iter__(self):
+        return iter(RESULT_FIELDS)
+
+    def __len__(self):
+        return len(RESULT_FIELDS)
+
+    def keys(self):
+        return list(RESULT_FIELDS)
+
+    def values(self):
+        return [self.snapshot.value(field, self.index) for field in RESULT_FIELDS]
+
+    def items(self):
+        return list(zip(RESULT_FIELDS, self.values()))
+
+
+class RowSequence:
+    """Sliceable sequence of RowViews over rows [start, stop)"""
+
+    def __init__(self, snapshot, start, stop):
+        self.snapshot = snapshot
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __iter__(self):
+        for i in range(self.start, self.stop):
+            yield RowView(self.snapshot, i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, _ = key.indices(len(self))
+            return RowSequence(self.snapshot, self.start + start, self.start + max(start, stop))
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return RowView(self.snapshot, self.start + key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert between JSON and columnar snapshots')
+    sub = parser.add_subparsers(dest='command', required=True)
+    export_cmd = sub.add_parser('export', help='Columnar snapshot -> JSON')
+    export_cmd.add_argument('source')
+    export_cmd.add_argument('target')
+    import_cmd = sub.add_parser('import', help='JSON snapshot -> columnar')
+    import_cmd.add_argument('source')
+    import_cmd.add_argument('target')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        snapshot = ColumnarSnapshot(args.source)
+        with open(args.target, 'w') as f:
+            json.dump(snapshot.to_dict(), f, indent=2)
+        snapshot.close()
+    else:
+        with open(args.source, 'r') as f:
+            write_snapshot(args.target, json.load(f))
+    print(f"✅ Wrote {args.target}")
+
+
+if __name__ == "__main__":
+    main()
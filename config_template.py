@@ -5,3 +5,37 @@ CMC_API_KEY = "50f9268450484020be2de5f9f20161f9"
 
 # Get your free API key at: https://coinmarketcap.com/api/
 # Free tier includes 10,000 calls/month
+
+# Optional: requests per minute allowed by your CMC plan (Basic = 30)
+# CMC_REQUESTS_PER_MINUTE = 30
+
+# Optional: seconds a cached quote is reused before CMC is asked again
+# CMC_QUOTE_CACHE_TTL = 300
+
+# Optional: format of the latest-snapshot file the dashboard reads
+# 'columnar' (tracker_results_latest.kcs, default), 'json' or None
+# SNAPSHOT_FORMAT = 'columnar'
+
+# Optional: history backend - 'sqlite' (tracker_history.db, default) or
+# 'delta' (tracker_history.dlog, stores only changed fields per run)
+# HISTORY_BACKEND = 'sqlite'
+
+# Optional: quote providers in order of preference ('cmc', 'coingecko', 'file:<snapshot>')
+# Backups are asked when the primary hasn't answered within HEDGE_AFTER seconds
+# PRICE_PROVIDERS = ['cmc', 'coingecko']
+# HEDGE_AFTER = 2.0
+# COINGECKO_API_KEY = "your-demo-key"
+
+# Optional: dashboard currencies - quotes are fetched in USD once and converted
+# locally with a cached conversion table (fx_rates.json, refreshed every FX_RATES_TTL seconds)
+# DASHBOARD_CURRENCIES = ['USD', 'EUR', 'BTC', 'ETH']
+# FX_RATES_TTL = 21600
+# FX_TGE_DATES_PER_RUN = 10
+
+# Optional: directory of OHLCV dumps (CSV/Parquet) used to backfill missing TGE prices
+# OHLCV_DUMP_DIR = 'ohlcv_dumps'
+
+# Optional: where alerts from alert_rules.json go - 'file' (alerts.log),
+# 'file:<path>', 'webhook' (ALERT_WEBHOOK_URL) or 'webhook:<url>'
+# ALERT_SINKS = ['file', 'webhook']
+# ALERT_WEBHOOK_URL = "https://hooks.slack.com/services/..."
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Live dashboard server - renders once per data change, not once per request
+
+The rendered page and a compact JSON payload are kept in memory with
+precompressed gzip bodies and ETags, so repeat visitors get a 304 and
+everyone else gets bytes straight from memory. A background thread watches
+the snapshot files; when a new fetch lands it re-renders once and pushes only
+the changed rows to open browsers over server-sent events (/events).
+
+Usage:
+    python3 dashboard_server.py [--port 3000] [--poll 5]
+    python3 kaito_tracker.py serve
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import queue
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from aggregation import StreamingAggregator, load_categories
+from analytics import compute_history_metrics
+from columnar_snapshot import LATEST_SNAPSHOT_FILE, ColumnarSnapshot
+from delta_log import DELTA_LOG_FILE
+from generate_dashboard import (
+    PROJECTS_DIR, _render_head, _render_tail, format_timestamp, load_latest_snapshot,
+    render_row, render_summary, write_page
+)
+from history_store import HISTORY_DB, RESULT_FIELDS
+from instrumentation import instrumentation
+from sparklines import load_sparklines, render_roi_chart
+
+# ========================================
+# SERVER SETTINGS
+# ========================================
+POLL_INTERVAL = 5         # Seconds between checks for a new snapshot
+KEEPALIVE_INTERVAL = 15   # Seconds between SSE keep-alive comments
+GZIP_LEVEL = 6
+
+# Files whose change means a new snapshot may have landed
+WATCHED_FILES = [
+    LATEST_SNAPSHOT_FILE, 'tracker_results_latest.json',
+    HISTORY_DB, f"{HISTORY_DB}-wal", f"{DELTA_LOG_FILE}.idx"
+]
+
+# Appended to the served page only (the static dashboard.html stays script-free)
+LIVE_SCRIPT = """<script>
+(function () {
+    var events = new EventSource('/events');
+    events.addEventListener('rows', function (e) {
+        var update = JSON.parse(e.data);
+        Object.keys(update.rows).forEach(function (symbol) {
+            var row = document.getElementById('row-' + symbol);
+            if (row) { row.outerHTML = update.rows[symbol]; }
+        });
+        document.getElementById('summary').outerHTML = update.summary;
+        document.getElementById('last-updated').textContent = 'Last updated: ' + update.timestamp;
+    });
+    events.addEventListener('reload', function () { location.reload(); });
+})();
+</script>
+"""
+
+
+def etag_matches(header, etag):
+    """Whether an If-None-Match header lists `etag` (weak tags compare equal, '*' matches anything)"""
+    for tag in (header or '').split(','):
+        tag = tag.strip()
+        if tag == '*' or (tag[2:] if tag.startswith('W/') else tag) == etag:
+            return True
+    return False
+
+
+class Body:
+    """One cached response body with its gzip variant and ETags"""
+
+    def __init__(self, content, content_type):
+        self.content = content
+        self.gzipped = gzip.compress(content, GZIP_LEVEL, mtime=0)
+        self.content_type = content_type
+        digest = hashlib.sha1(content).hexdigest()[:16]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+
+
+class RenderedDashboard:
+    """Everything served for one snapshot (immutable once built)"""
+
+    def __init__(self, data, metrics, series=None):
+        projects = list(data['projects'])
+        series = series or {}
+        self.timestamp = data['metadata'].get('timestamp')
+        self.timestamp_str = format_timestamp(data['metadata'])
+        summary = StreamingAggregator(load_categories()).consume(projects, metrics)
+        self.summary_html = render_summary(summary, data['metadata'].get('failed_symbols'),
+                                           render_roi_chart(projects, series))
+        self.rows = {p['token_symbol']: render_row(p, metrics.get(p['token_symbol']), series.get(p['token_symbol']))
+                     for p in projects}
+
+        page = io.StringIO()
+        write_page(page, _render_head(currency_nav='', summary_html=self.summary_html), self.rows.values(),
+                   _render_tail(pager='', timestamp_str=self.timestamp_str))
+        html = page.getvalue().replace('</body>', LIVE_SCRIPT + '</body>', 1)
+        self.page = Body(html.encode(), 'text/html; charset=utf-8')
+
+        payload = {
+            'metadata': dict(data['metadata']),
+            'fields': RESULT_FIELDS,
+            'rows': [[p.get(field) for field in RESULT_FIELDS] for p in projects],
+            'metrics': {p['token_symbol']: metrics.get(p['token_symbol']) for p in projects}
+        }
+        self.data = Body(json.dumps(payload, separators=(',', ':')).encode(), 'application/json')
+
+    def changes_since(self, previous):
+        """SSE event for viewers of `previous`: ('rows', changed rows) or ('reload', None)"""
+        if list(previous.rows) != list(self.rows):
+            return 'reload', None
+        changed = {s: html for s, html in self.rows.items() if previous.rows[s] != html}
+        return 'rows', {'rows': changed, 'summary': self.summary_html, 'timestamp': self.timestamp_str}
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """HTTP server holding the current RenderedDashboard and the SSE subscribers"""
+
+    daemon_threads = True
+
+    def __init__(self, address, poll_interval=POLL_INTERVAL):
+        super().__init__(address, DashboardHandler)
+        self.poll_interval = poll_interval
+        self.dashboard = None
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.files_key = None
+        self.static_pages = {}     # file path -> (mtime_ns, Body)
+        self.stopping = threading.Event()
+
+    def publish(self, data, metrics=None, series=None):
+        """Render `data` once and push the changed rows to every open browser"""
+        if metrics is None:
+            metrics = compute_history_metrics()
+        if series is None:
+            series = load_sparklines()
+        with instrumentation.timer('stage', stage='server_render'):
+            dashboard = RenderedDashboard(data, metrics, series)
+        previous, self.dashboard = self.dashboard, dashboard
+        instrumentation.inc('server_renders')
+        if previous is None or previous.timestamp == dashboard.timestamp:
+            return
+        event, payload = dashboard.changes_since(previous)
+        message = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode()
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for q in subscribers:
+            q.put(message)
+        instrumentation.inc('server_events', len(subscribers), event=event)
+
+    def refresh(self):
+        """Re-render if the snapshot files changed since the last check"""
+        key = []
+        for path in WATCHED_FILES:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            key.append((path, st.st_mtime_ns, st.st_size))
+        if key == self.files_key:
+            return
+        self.files_key = key
+        data = load_latest_snapshot()
+        if not data:
+            return
+        if self.dashboard is None or data['metadata'].get('timestamp') != self.dashboard.timestamp:
+            self.publish(data)
+        if isinstance(data, ColumnarSnapshot):
+            data.close()
+
+    def watch_files(self):
+        while not self.stopping.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️  Refresh failed: {e}")
+
+    def static_page(self, path):
+        """Body for a generated page from disk (cached until the file changes), or None"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        cached = self.static_pages.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                cached = self.static_pages[path] = (mtime, Body(f.read(), 'text/html; charset=utf-8'))
+        return cached[1]
+
+    def detail_page(self, name):
+        """Body for projects/<name>, or None"""
+        if not re.fullmatch(r'[A-Za-z0-9_-]+\.html', name):
+            return None
+        return self.static_page(os.path.join(PROJECTS_DIR, name))
+
+    def dashboard_view(self, name):
+        """Body for the other static views (dashboard_eur.html, dashboard_page2.html, ...), or None"""
+        if not re.fullmatch(r'dashboard_[A-Za-z0-9_]+\.html', name):
+            return None
+        return self.static_page(name)
+
+    def subscribe(self):
+        q = queue.Queue()
+        with self.lock:
+            self.subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            self.subscribers.discard(q)
+
+    def server_close(self):
+        self.stopping.set()
+        super().server_close()
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/events':
+            self.stream_events()
+            return
+        dashboard = self.server.dashboard
+        if dashboard is None:
+            self.send_text(503, 'No tracker results yet - run: python3 kaito_tracker.py fetch\n')
+            return
+        if path in ('/', '/dashboard.html', '/index.html'):
+            self.send_body(dashboard.page)
+        elif path == '/data.json':
+            self.send_body(dashboard.data)
+        elif path.startswith(f'/{PROJECTS_DIR}/'):
+            self.send_page(self.server.detail_page(path.rsplit('/', 1)[-1]))
+        elif path.startswith('/dashboard_'):
+            self.send_page(self.server.dashboard_view(path[1:]))
+        else:
+            self.send_text(404, 'Not found\n')
+
+    def send_page(self, body):
+        if body:
+            self.send_body(body)
+        else:
+            self.send_text(404, 'Not found\n')
+
+    def send_body(self, body):
+        use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        etag = body.gzip_etag if use_gzip else body.etag
+        instrumentation.inc('server_requests', path=self.path.split('?', 1)[0])
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        content = body.gzipped if use_gzip else body.content
+        self.send_response(200)
+        self.send_header('Content-Type', body.content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def send_text(self, status, text):
+        content = text.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'keep-alive')
+        self.end_headers()
+        self.close_connection = True
+
+        q = self.server.subscribe()
+        try:
+            self.wfile.write(b': connected\n\n')
+            self.wfile.flush()
+            while not self.server.stopping.is_set():
+                try:
+                    message = q.get(timeout=KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    message = b': keep-alive\n\n'
+                self.wfile.write(message)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.server.unsubscribe(q)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(host='127.0.0.1', port=3000, poll_interval=POLL_INTERVAL):
+    """Serve the live dashboard until interrupted"""
+    server = DashboardServer((host, port), poll_interval)
+    server.refresh()
+    threading.Thread(target=server.watch_files, daemon=True).start()
+    print(f"🌐 Live dashboard at http://{host}:{port}/ (JSON: /data.json, updates: /events)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Live Kaito tracker dashboard server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--poll', type=float, default=POLL_INTERVAL, help='Seconds between snapshot checks')
+    args = parser.parse_args()
+    serve(args.host, args.port, args.poll)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Delta-encoded snapshot history (append-only log + keyframe index)
+Each run writes only the fields that changed since the previous snapshot
+
+Layout:
+    tracker_history.dlog       one JSON record per line
+    tracker_history.dlog.idx   one "timestamp<TAB>offset<TAB>keyframe" line per record
+
+A keyframe holds every row; a delta holds only changed fields per symbol,
+added rows and dropped symbols. A full keyframe is written every
+KEYFRAME_INTERVAL records, so reconstructing any point in time reads one
+keyframe plus at most KEYFRAME_INTERVAL - 1 small deltas. A row timestamp
+equal to its snapshot's timestamp is stored as "@" and keeps following the
+snapshot timestamp until a delta sets it, so an unchanged row costs nothing.
+
+DeltaLog has the same read/write interface as HistoryStore, so it can be used
+as the history backend (HISTORY_BACKEND = 'delta' in config.py).
+
+Readers open the log read-only and only ever read records the index
+covers, so a record whose index line isn't written yet is invisible to
+them. Appends take an exclusive flock on the log, pick up records other
+processes appended, and only then drop a torn tail left by a crashed writer.
+
+Usage:
+    python3 delta_log.py import             # Convert tracker_history.db into a delta log
+    python3 delta_log.py at 2025-06-01T12:00 [--output snapshot.json]
+    python3 delta_log.py stats
+"""
+
+import argparse
+import json
+import os
+from bisect import bisect_left, bisect_right
+
+try:
+    import fcntl
+except ImportError:     # Windows: no cross-process locking
+    fcntl = None
+
+from history_store import HistoryStore, RESULT_FIELDS
+
+DELTA_LOG_FILE = 'tracker_history.dlog'
+KEYFRAME_INTERVAL = 288     # One keyframe per day at 5-minute polling
+
+SYMBOL_INDEX = RESULT_FIELDS.index('token_symbol')
+TIMESTAMP_INDEX = RESULT_FIELDS.index('timestamp')
+SAME_TIMESTAMP = '@'
+
+
+def encode_row(row, timestamp):
+    values = [row.get(field) for field in RESULT_FIELDS]
+    if values[TIMESTAMP_INDEX] == timestamp:
+        values[TIMESTAMP_INDEX] = SAME_TIMESTAMP
+    return values
+
+
+def decode_value(index, value, timestamp):
+    return timestamp if index == TIMESTAMP_INDEX and value == SAME_TIMESTAMP else value
+
+
+def decode_row(values, timestamp):
+    """Full row from stored values (rows written before a field was added are padded with None)"""
+    row = [decode_value(i, v, timestamp) for i, v in enumerate(values)]
+    return row + [None] * (len(RESULT_FIELDS) - len(row))
+
+
+class SnapshotState:
+    """Rows of one reconstructed snapshot, in order, keyed by symbol"""
+
+    def __init__(self):
+        self.timestamp = None
+        self.metadata = {}
+        self.order = []
+        self.rows = {}      # symbol -> list of values in RESULT_FIELDS order
+        self.follows = set()    # symbols whose row timestamp is stored as "@" (the snapshot's)
+
+    def _track(self, symbol, stored_timestamp):
+        if stored_timestamp == SAME_TIMESTAMP:
+            self.follows.add(symbol)
+        else:
+            self.follows.discard(symbol)
+
+    def apply(self, record):
+        """Apply a keyframe or delta record (in place)"""
+        t = record['t']
+        if record.get('k'):
+            self.order = []
+            self.rows = {}
+            self.follows = set()
+            for values in record['rows']:
+                symbol = values[SYMBOL_INDEX]
+                self.order.append(symbol)
+                self.rows[symbol] = decode_row(values, t)
+                self._track(symbol, values[TIMESTAMP_INDEX] if len(values) > TIMESTAMP_INDEX else None)
+        else:
+            dropped = set(record.get('drop', ()))
+            for symbol in self.follows:
+                self.rows[symbol][TIMESTAMP_INDEX] = t
+            for symbol, changes in record.get('set', {}).items():
+                row = self.rows[symbol]
+                for i, value in changes.items():
+                    row[int(i)] = decode_value(int(i), value, t)
+                    if int(i) == TIMESTAMP_INDEX:
+                        self._track(symbol, value)
+            for values in record.get('add', ()):
+                symbol = values[SYMBOL_INDEX]
+                self.rows[symbol] = decode_row(values, t)
+                self._track(symbol, values[TIMESTAMP_INDEX] if len(values) > TIMESTAMP_INDEX else None)
+            for symbol in dropped:
+                del self.rows[symbol]
+                self.follows.discard(symbol)
+            if 'order' in record:
+                self.order = record['order']
+            else:
+                self.order = [s for s in self.order if s not in dropped]
+                self.order += [values[SYMBOL_INDEX] for values in record.get('add', ())]
+        self.timestamp = t
+        self.metadata = record['m']
+
+    def diff(self, projects, timestamp):
+        """Delta record turning this state into `projects` at `timestamp`"""
+        record = {'t': timestamp}
+        changes, added, order = {}, [], []
+        for p in projects:
+            values = encode_row(p, timestamp)
+            symbol = values[SYMBOL_INDEX]
+            order.append(symbol)
+            previous = self.rows.get(symbol)
+            if previous is None:
+                added.append(values)
+                continue
+            changed = {}
+            for i, value in enumerate(values):
+                if i == TIMESTAMP_INDEX:
+                    # Compared as stored: "@" then "@" is no change, whatever the two snapshot times
+                    if value != (SAME_TIMESTAMP if symbol in self.follows else previous[i]):
+                        changed[i] = value
+                elif value != previous[i]:
+                    changed[i] = value
+            if changed:
+                changes[symbol] = changed
+
+        present = set(order)
+        dropped = [s for s in self.order if s not in present]
+        if changes:
+            record['set'] = changes
+        if added:
+            record['add'] = added
+        if dropped:
+            record['drop'] = dropped
+        kept = [s for s in self.order if s in present] + [v[SYMBOL_INDEX] for v in added]
+        if kept != order:
+            record['order'] = order
+        return record
+
+    def to_dict(self):
+        return {
+            'metadata': {'timestamp': self.timestamp, **self.metadata},
+            'projects': [dict(zip(RESULT_FIELDS, self.rows[s])) for s in self.order]
+        }
+
+
+class DeltaLog:
+    """Append-only delta-encoded snapshot history"""
+
+    def __init__(self, path=DELTA_LOG_FILE, keyframe_interval=KEYFRAME_INTERVAL):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.keyframe_interval = keyframe_interval
+        self.timestamps = []
+        self.offsets = []
+        self.keyframes = []     # Record positions of keyframes, ascending
+        self._latest = None     # SnapshotState of the newest record, built on demand
+        self.staged = []        # [(position, row)] of a snapshot still arriving (see stage_rows)
+        self.index_size = 0     # Bytes of complete index lines read so far
+        self.log = open(path, 'rb') if os.path.exists(path) else None
+        self._load_index()
+
+    def _load_index(self):
+        """Pick up complete index lines appended since the last read; returns how many"""
+        if not os.path.exists(self.index_path):
+            return 0
+        added = 0
+        with open(self.index_path, 'rb') as f:
+            f.seek(self.index_size)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break       # Being written right now (or torn by a crash)
+                timestamp, offset, keyframe = line.decode().rstrip('\n').split('\t')
+                if keyframe == '1':
+                    self.keyframes.append(len(self.timestamps))
+                self.timestamps.append(timestamp)
+                self.offsets.append(int(offset))
+                self.index_size += len(line)
+                added += 1
+        if added:
+            self._latest = None
+        return added
+
+    def _indexed_end(self, log):
+        """Byte offset just past the last indexed record"""
+        if not self.offsets:
+            return 0
+        log.seek(self.offsets[-1])
+        log.readline()
+        return log.tell()
+
+    def _repair_tail(self, log):
+        """Drop a torn index line and any record the index doesn't cover (crash mid-append)
+
+        Only called by a writer holding the exclusive lock, so nobody else is
+        half-way through an append.
+        """
+        if os.path.exists(self.index_path) and os.path.getsize(self.index_path) > self.index_size:
+            with open(self.index_path, 'r+b') as f:
+                f.truncate(self.index_size)
+        end = self._indexed_end(log)
+        if os.fstat(log.fileno()).st_size > end:
+            log.truncate(end)
+
+    def _reader(self):
+        if self.log is None:
+            self.log = open(self.path, 'rb')
+        return self.log
+
+    def _records(self, start, count):
+        """Decode `count` indexed records starting at record position `start`"""
+        log = self._reader()
+        log.seek(self.offsets[start])
+        for _ in range(count):
+            yield json.loads(log.readline())
+
+    def _state_at(self, position):
+        """Reconstruct the snapshot at record `position` from the nearest keyframe"""
+        keyframe = self.keyframes[bisect_right(self.keyframes, position) - 1]
+        state = SnapshotState()
+        for record in self._records(keyframe, position - keyframe + 1):
+            state.apply(record)
+        return state
+
+    def _latest_state(self):
+        if self._latest is None and self.timestamps:
+            self._latest = self._state_at(len(self.timestamps) - 1)
+        return self._latest
+
+    def append_snapshot(self, data):
+        """Append one {'metadata', 'projects'} snapshot; returns its id (None if not newer than the last)"""
+        with open(self.path, 'a+b') as log:
+            if fcntl is not None:
+                fcntl.flock(log, fcntl.LOCK_EX)     # Released when the file is closed
+            self._load_index()
+            self._repair_tail(log)
+            return self._append(log, data)
+
+    def _append(self, log, data):
+        metadata = data['metadata']
+        timestamp = metadata['timestamp']
+        if self.timestamps and timestamp <= self.timestamps[-1]:
+            return None
+
+        meta = {
+            'total_projects': metadata.get('total_projects', len(data['projects'])),
+            'data_sources': metadata.get('data_sources', [])
+        }
+        if metadata.get('failed_symbols'):
+            meta['failed_symbols'] = metadata['failed_symbols']
+        position = len(self.timestamps)
+        keyframe = not self.keyframes or position - self.keyframes[-1] >= self.keyframe_interval
+        if keyframe:
+            record = {'t': timestamp, 'k': 1, 'rows': [encode_row(p, timestamp) for p in data['projects']]}
+        else:
+            record = self._latest_state().diff(data['projects'], timestamp)
+        record['m'] = meta
+
+        line = json.dumps(record, separators=(',', ':')).encode() + b'\n'
+        log.seek(0, os.SEEK_END)
+        offset = log.tell()
+        log.write(line)
+        log.flush()
+        entry = f"{timestamp}\t{offset}\t{int(keyframe)}\n".encode()
+        with open(self.index_path, 'ab') as f:
+            f.write(entry)
+        self.index_size += len(entry)
+
+        self.timestamps.append(timestamp)
+        self.offsets.append(offset)
+        if keyframe:
+            self.keyframes.append(position)
+            self._latest = SnapshotState()
+        self._latest.apply(record)
+        return position + 1
+
+    def stage_rows(self, rows):
+        """Buffer [(position, row)] of a snapshot that is still arriving (a delta needs every row)"""
+        self.staged.extend(rows)
+
+    def commit_staged(self, metadata):
+        """Append the staged rows, in position order, as one snapshot; returns its id (None if not newer)"""
+        projects = [row for _, row in sorted(self.staged, key=lambda staged: staged[0])]
+        self.staged = []
+        return self.append_snapshot({'metadata': metadata, 'projects': projects})
+
+    def snapshot_at(self, timestamp):
+        """Snapshot as it stood at `timestamp` (ISO string), or None if before the first"""
+        position = bisect_right(self.timestamps, timestamp) - 1
+        if position < 0:
+            return None
+        if position == len(self.timestamps) - 1:
+            return self._latest_state().to_dict()
+        return self._state_at(position).to_dict()
+
+    def iter_snapshots(self, start=None, end=None):
+        """Every snapshot with start <= timestamp <= end (ISO strings), oldest first, in one sequential pass"""
+        first = bisect_left(self.timestamps, start) if start else 0
+        last = bisect_right(self.timestamps, end) if end else len(self.timestamps)
+        if first >= last:
+            return
+        keyframe = self.keyframes[bisect_right(self.keyframes, first) - 1]
+        state = SnapshotState()
+        for position, record in enumerate(self._records(keyframe, last - keyframe), keyframe):
+            state.apply(record)
+            if position >= first:
+                yield state.to_dict()
+
+    def latest_snapshot(self):
+        """Most recent snapshot in tracker_results JSON shape, or None if empty"""
+        state = self._latest_state()
+        return state.to_dict() if state else None
+
+    def latest_timestamp(self):
+        return self.timestamps[-1] if self.timestamps else None
+
+    def snapshot_timestamps(self):
+        return list(self.timestamps)
+
+    def snapshot_index(self):
+        """(id, timestamp) for every snapshot, oldest first"""
+        return [(position + 1, t) for position, t in enumerate(self.timestamps)]
+
+    def price_rows(self, since=None):
+        """(token_symbol, snapshot_id, current_price, tge_price) for all history, in one sequential pass
+        (or only snapshots newer than the `since` timestamp, replayed from the nearest keyframe)"""
+        start = bisect_right(self.timestamps, since) if since else 0
+        if start >= len(self.timestamps):
+            return
+        price = RESULT_FIELDS.index('current_price')
+        tge = RESULT_FIELDS.index('tge_price')
+        keyframe = self.keyframes[bisect_right(self.keyframes, start) - 1]
+        state = SnapshotState()
+        for position, record in enumerate(self._records(keyframe, len(self.timestamps) - keyframe), keyframe):
+            state.apply(record)
+            if position < start:
+                continue
+            for symbol in state.order:
+                row = state.rows[symbol]
+                yield symbol, position + 1, row[price], row[tge]
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Delta-encoded snapshot history')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('import', help='Convert the SQLite history into a delta log')
+    at_cmd = sub.add_parser('at', help='Reconstruct the snapshot at a point in time')
+    at_cmd.add_argument('timestamp', help='ISO timestamp, e.g. 2025-06-01T12:00')
+    at_cmd.add_argument('--output', help='Write the snapshot JSON here (default: stdout)')
+    sub.add_parser('stats', help='Compare the delta log against full snapshots')
+    args = parser.parse_args()
+
+    log = DeltaLog()
+
+    if args.command == 'import':
+        store = HistoryStore()
+        added = 0
+        for snapshot in store.iter_snapshots():
+            if log.append_snapshot(snapshot) is not None:
+                added += 1
+        store.close()
+        print(f"✅ Appended {added} snapshots to {DELTA_LOG_FILE}")
+    elif args.command == 'at':
+        snapshot = log.snapshot_at(args.timestamp)
+        if snapshot is None:
+            print(f"❌ No snapshot at or before {args.timestamp}")
+        elif args.output:
+            with open(args.output, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+            print(f"✅ Snapshot from {snapshot['metadata']['timestamp']} written to {args.output}")
+        else:
+            print(json.dumps(snapshot, indent=2))
+    elif args.command == 'stats':
+        log_bytes = os.path.getsize(log.path) if os.path.exists(log.path) else 0
+        full_bytes = 0
+        state = SnapshotState()
+        for record in log._records(0, len(log.timestamps)) if log.timestamps else ():
+            state.apply(record)
+            full_bytes += len(json.dumps(state.to_dict(), separators=(',', ':')))
+        print(f"📊 {len(log.timestamps)} snapshots, {len(log.keyframes)} keyframes")
+        print(f"   Delta log: {log_bytes / 1024:,.1f} KB")
+        if full_bytes:
+            print(f"   As full JSON snapshots: {full_bytes / 1024:,.1f} KB ({full_bytes / max(log_bytes, 1):.1f}x)")
+
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,98 +4,320 @@ Kaito-Listed AI Agents - Post-TGE Performance Tracker
 Uses CoinMarketCap for current data + hardcoded TGE prices for ROI calculation
 """
 
+import argparse
 import json
-import requests
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
+from itertools import islice
+
+from aggregation import StreamingAggregator, project_categories
+from alerts import check_alerts
+from analytics import compute_history_metrics
+from cmc_client import CMCClient, CMCError, REQUESTS_PER_MINUTE
+from cmc_id_map import id_map_is_fresh, load_id_map, resolve_projects
+from columnar_snapshot import LATEST_SNAPSHOT_FILE, write_snapshot
+from fx_rates import DASHBOARD_CURRENCIES, load_fx_table
+from history_store import open_history_store
+from instrumentation import instrumentation
+from price_providers import HedgedQuotes, build_providers
+from project_registry import ProjectRegistry, RegistryError, PROJECTS_FILE
+from quote_cache import QuoteCache, QUOTE_CACHE_TTL
+from symbol_blocklist import SymbolBlocklist
 
 # ========================================
-# API KEY - Load from config file
+# OPTIONAL SETTINGS - Load from config file
 # ========================================
 try:
-    from config import CMC_API_KEY
+    from config import CMC_REQUESTS_PER_MINUTE
+except ImportError:
+    CMC_REQUESTS_PER_MINUTE = REQUESTS_PER_MINUTE
+
+try:
+    from config import CMC_QUOTE_CACHE_TTL
+except ImportError:
+    CMC_QUOTE_CACHE_TTL = QUOTE_CACHE_TTL
+
+try:
+    from config import SNAPSHOT_FORMAT
 except ImportError:
-    print("❌ Error: config.py not found!")
-    print("   1. Copy config_template.py to config.py")
-    print("   2. Add your CoinMarketCap API key to config.py")
-    exit(1)
+    SNAPSHOT_FORMAT = 'columnar'    # Latest-snapshot file: 'columnar' (.kcs), 'json' or None
 
 # ========================================
 # API ENDPOINTS
 # ========================================
-CMC_BASE_URL = "https://pro-api.coinmarketcap.com/v2"
+CMC_QUOTES_PATH = "/v2/cryptocurrency/quotes/latest"
+INVALID_VALUE_PATTERN = re.compile(r'Invalid values? for "(\w+)": "([^"]*)"', re.IGNORECASE)
+
+# ========================================
+# BATCHING
+# ========================================
+CMC_BATCH_SIZE = 100      # Ids/symbols per quotes/latest request (keeps URLs short)
+CMC_MAX_IN_FLIGHT = 4     # Max concurrent batch requests
 
 
 def load_projects():
-    """Load projects from database (now includes TGE prices)"""
-    with open('projects_database.json', 'r') as f:
-        return json.load(f)
+    """Load and validate projects from the registry (now includes TGE prices)"""
+    return ProjectRegistry().projects
+
+
+def chunk_keys(keys, batch_size=CMC_BATCH_SIZE):
+    """Split ids/symbols into de-duplicated batches of at most batch_size"""
+    unique = list(dict.fromkeys(keys))
+    return [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+
+
+def load_api_key():
+    """CMC API key from config.py (exits with setup instructions if missing)"""
+    try:
+        from config import CMC_API_KEY
+    except ImportError:
+        print("❌ Error: config.py not found!")
+        print("   1. Copy config_template.py to config.py")
+        print("   2. Add your CoinMarketCap API key to config.py")
+        exit(1)
+    return CMC_API_KEY
+
+
+_client = None
+
+
+def get_cmc_client():
+    """Shared pooled CMC client (created on first use)"""
+    global _client
+    if _client is None:
+        _client = CMCClient(load_api_key(), requests_per_minute=CMC_REQUESTS_PER_MINUTE)
+    return _client
+
+
+def invalid_keys(error, by):
+    """Keys a CMC HTTP 400 names as invalid for the `by` parameter
+    ('Invalid value for "symbol": "FOO,BAR"'), or None if it blames something else"""
+    if not isinstance(error, CMCError) or error.status != 400:
+        return None
+    match = INVALID_VALUE_PATTERN.search(error.detail or '')
+    if not match or match.group(1) != by:
+        return None
+    return [key.strip() for key in match.group(2).split(',') if key.strip()]
 
 
-def get_current_prices_cmc(symbols):
-    """Fetch current prices and market data from CoinMarketCap"""
-    url = f"{CMC_BASE_URL}/cryptocurrency/quotes/latest"
+def request_quote_batch(keys, client, by):
+    """(payload, None) or (None, error) for one quotes/latest request"""
+    try:
+        return client.get(CMC_QUOTES_PATH, params={by: ','.join(keys), 'convert': 'USD'}), None
+    except Exception as e:
+        return None, e
+
+
+def fetch_quote_batch(keys, client=None, by='symbol', rejected=None):
+    """Fetch one batch of quotes from CoinMarketCap (by='symbol' or by='id')
     
-    headers = {
-        'X-CMC_PRO_API_KEY': CMC_API_KEY,
-        'Accept': 'application/json'
-    }
+    If CMC rejects the batch because some of its keys are invalid (HTTP 400
+    naming them, e.g. a delisted ticker) and a `rejected` list is given, the
+    named keys are appended to `rejected` and the rest of the batch is
+    fetched again. Keys named in a form that doesn't match the batch are
+    isolated by bisection, which stops if both halves fail with the parent's
+    error; a single key is only rejected if the error names it, otherwise
+    it fails. Any other error fails the batch without rejecting its keys.
+    """
+    client = client or get_cmc_client()
+    payload, error = request_quote_batch(keys, client, by)
+    if error is None:
+        return payload
+    return isolate_invalid_keys(keys, client, by, rejected, error)
+
+
+def isolate_invalid_keys(keys, client, by, rejected, error):
+    """Quotes for the valid keys of a batch that failed with `error` (None if none can be had)"""
+    named = invalid_keys(error, by)
+    if named is None or rejected is None:
+        print(f"❌ Error fetching CMC data for {len(keys)} {by}s: {error}")
+        return None
     
-    params = {
-        'symbol': ','.join(symbols),
-        'convert': 'USD'
-    }
+    wanted = {key.upper() for key in named}
+    bad = [key for key in keys if key.upper() in wanted]
+    if bad:
+        rejected.extend(bad)
+        rest = [key for key in keys if key.upper() not in wanted]
+        return fetch_quote_batch(rest, client, by, rejected) if rest else {'data': {}}
+    if len(keys) == 1:
+        # The error blames a key that isn't this one - don't blocklist the wrong key
+        print(f"❌ CMC rejected {by} {keys[0]} naming {', '.join(named)}: {error}")
+        return None
     
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"❌ Error fetching CMC data: {e}")
+    instrumentation.inc('batch_bisections', by=by)
+    mid = len(keys) // 2
+    halves = [keys[:mid], keys[mid:]]
+    results = [request_quote_batch(half, client, by) for half in halves]
+    if all(e is not None and str(e) == str(error) for _, e in results):
+        print(f"❌ CMC rejected both halves of {len(keys)} {by}s with the same error, "
+              f"not bisecting further: {error}")
         return None
+    
+    merged = {'data': {}}
+    fetched = False
+    for half, (payload, half_error) in zip(halves, results):
+        if half_error is not None:
+            payload = isolate_invalid_keys(half, client, by, rejected, half_error)
+        if payload and 'data' in payload:
+            merged['data'].update(payload['data'])
+            fetched = True
+    return merged if fetched else None
+
+
+def iter_quote_batches(keys, batch_size=CMC_BATCH_SIZE, max_in_flight=CMC_MAX_IN_FLIGHT,
+                       client=None, cache=None, by='symbol', blocklist=None, outcome=None):
+    """Yield {'data': {key: ...}} payloads as each batch of quotes arrives
+    
+    Fresh cached quotes (with a QuoteCache) come first as one payload. At most
+    max_in_flight requests are outstanding and a new one is only sent once the
+    consumer takes a finished batch, so a slow consumer throttles fetching
+    instead of piling up responses. `outcome`, if given, receives the number
+    of requested and failed batches. See get_current_prices_cmc for the
+    cache and blocklist handling.
+    """
+    keys = [str(k) for k in keys]
+    delivered = False
+    if cache is not None:
+        cached, stale = cache.split([f"{by}:{k}" for k in keys])
+        if cached:
+            delivered = True
+            yield {'data': {k.split(':', 1)[1]: v for k, v in cached.items()}}
+        keys = [k.split(':', 1)[1] for k in stale]
+    
+    rejected = None
+    if blocklist is not None:
+        allowed, blocked = blocklist.split([f"{by}:{k}" for k in keys])
+        keys = [k.split(':', 1)[1] for k in allowed]
+        rejected = []
+        if blocked:
+            print(f"🚫 Skipping {len(blocked)} blocklisted {by}s: "
+                  f"{', '.join(k.split(':', 1)[1] for k in blocked)}")
+            instrumentation.inc('blocklisted_keys', len(blocked), by=by)
+    
+    batches = chunk_keys(keys, batch_size)
+    outcome = outcome if outcome is not None else {}
+    outcome.update(batches=len(batches), failed=0)
+    if not batches:
+        return
+    client = client or get_cmc_client()
+    
+    workers = max(1, min(max_in_flight, len(batches)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        queued = iter(batches)
+        pending = {pool.submit(fetch_quote_batch, batch, client, by, rejected) for batch in islice(queued, workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                payload = future.result()
+                if not payload or 'data' not in payload:
+                    outcome['failed'] += 1
+                else:
+                    if cache is not None:
+                        cache.update({f"{by}:{k}": v for k, v in payload['data'].items()})
+                    delivered = delivered or bool(payload['data'])
+                    yield payload
+                pending |= {pool.submit(fetch_quote_batch, batch, client, by, rejected)
+                            for batch in islice(queued, 1)}
+    
+    if cache is not None:
+        cache.save()
+    
+    if rejected:
+        print(f"🚫 CoinMarketCap rejected {len(rejected)} {by}s: {', '.join(rejected)} "
+              f"(skipped for the next {blocklist.ttl // 3600}h)")
+        instrumentation.inc('rejected_keys', len(rejected), by=by)
+        for key in rejected:
+            blocklist.add(f"{by}:{key}", reason='HTTP 400')
+    if blocklist is not None:
+        blocklist.save()
+    
+    if outcome['failed'] and (delivered or outcome['failed'] < len(batches)):
+        print(f"⚠️  {outcome['failed']}/{len(batches)} CMC batches failed, continuing with partial data")
+
+
+def get_current_prices_cmc(keys, batch_size=CMC_BATCH_SIZE, max_in_flight=CMC_MAX_IN_FLIGHT,
+                           client=None, cache=None, by='symbol', blocklist=None):
+    """Fetch current prices and market data from CoinMarketCap
+    
+    Keys (ticker symbols, or CMC ids with by='id') are split into batches
+    that are fetched concurrently (at most max_in_flight requests at once)
+    and merged back into a single {'data': {key: ...}} response. Symbol
+    lookups map to a list of matching assets, id lookups to one asset.
+    Returns None if every batch failed.
+    
+    With a QuoteCache, only keys whose cached quote is stale are requested
+    and fresh cached quotes are merged into the response.
+    
+    With a SymbolBlocklist, blocklisted keys are skipped, and the keys CMC
+    names as invalid are dropped from their batch (see fetch_quote_batch) so
+    one bad key doesn't sink the rest; they are added to the blocklist.
+    """
+    merged = {'data': {}}
+    outcome = {}
+    for payload in iter_quote_batches(keys, batch_size, max_in_flight, client, cache, by, blocklist, outcome):
+        merged['data'].update(payload['data'])
+    
+    if outcome['batches'] and outcome['failed'] == outcome['batches'] and not merged['data']:
+        return None
+    return merged
+
+
+def fetch_quotes_for_projects(projects, client=None, cache=None, blocklist=None):
+    """Fetch quotes by CMC id where resolved, by ticker otherwise
+    
+    Returns one merged {'data': {...}} response (None if nothing could be fetched).
+    """
+    ids = [p['cmc_id'] for p in projects if p.get('cmc_id')]
+    symbols = [p['token_symbol'] for p in projects if not p.get('cmc_id')]
+    
+    merged = {'data': {}}
+    fetched = False
+    for keys, by in ((ids, 'id'), (symbols, 'symbol')):
+        if not keys:
+            continue
+        part = get_current_prices_cmc(keys, client=client, cache=cache, by=by, blocklist=blocklist)
+        if part:
+            merged['data'].update(part['data'])
+            fetched = True
+    
+    return merged if fetched or not projects else None
 
 
-def calculate_days_since_tge(tge_date_str):
-    """Calculate days since token generation event"""
+def find_quote(project, cmc_data):
+    """The CMC asset entry for a project, or None if it wasn't returned"""
+    data = cmc_data['data']
+    cmc_id = project.get('cmc_id')
+    if cmc_id and str(cmc_id) in data:
+        return data[str(cmc_id)]  # id lookups return a single asset
+    matches = data.get(project['token_symbol'])
+    return matches[0] if matches else None  # symbol lookups return an array
+
+
+def calculate_days_since_tge(tge_date_str, now=None):
+    """Calculate days since token generation event (as of `now`, default: the current time)"""
     try:
         tge_date = datetime.strptime(tge_date_str, "%Y-%m-%d")
-        today = datetime.now()
+        today = now or datetime.now()
         delta = today - tge_date
         return delta.days
     except:
         return None
 
 
-def fetch_all_data():
-    """Main function to fetch all token data"""
-    print("\n" + "="*70)
-    print("🚀 KAITO-LISTED AI AGENTS - POST-TGE PERFORMANCE TRACKER")
-    print("="*70)
-    print(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"💡 Data: CoinMarketCap (current) + Manual TGE Prices (historical)")
-    print("="*70 + "\n")
-    
-    # Load projects (now includes TGE prices!)
-    projects = load_projects()
-    print(f"📊 Tracking {len(projects)} Kaito-listed AI Agent projects...\n")
-    
-    # Prepare symbols for batch CMC request
-    symbols = [p['token_symbol'] for p in projects]
-    
-    # Fetch current data from CoinMarketCap
-    print("💰 Fetching current prices from CoinMarketCap...")
-    cmc_data = get_current_prices_cmc(symbols)
-    
-    if not cmc_data or 'data' not in cmc_data:
-        print("❌ Failed to fetch CMC data")
-        return
+def process_projects(projects, cmc_data, verbose=True, now=None):
+    """Turn a CMC quotes response into per-project tracker results
     
-    print("✅ Current prices fetched successfully!\n")
-    
-    # Process each project
+    Every result is stamped with the same run time (`now`, default: the current time).
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    now = now or datetime.now()
+    timestamp = now.isoformat()
     results = []
     
     for idx, project in enumerate(projects, 1):
-        print(f"Project {idx}/{len(projects)}: {project['name']}")
+        log(f"Project {idx}/{len(projects)}: {project['name']}")
         
         symbol = project['token_symbol']
         tge_date_str = project.get('tge_date')
@@ -103,8 +325,8 @@ def fetch_all_data():
         
         # Get current data from CMC
         token_data = {}
-        if symbol in cmc_data['data']:
-            cmc_info = cmc_data['data'][symbol][0]  # CMC returns array
+        cmc_info = find_quote(project, cmc_data)
+        if cmc_info:
             quote = cmc_info['quote']['USD']
             
             token_data = {
@@ -116,19 +338,20 @@ def fetch_all_data():
                 'percent_change_30d': quote['percent_change_30d']
             }
             
-            print(f"   ✅ Price: ${token_data['current_price']:.6f}")
-            print(f"   ✅ Market Cap: ${token_data['market_cap']:,.0f}")
-            print(f"   ✅ 24h Change: {token_data['percent_change_24h']:.2f}%")
+            log(f"   ✅ Price: ${token_data['current_price']:.6f}")
+            log(f"   ✅ Market Cap: ${token_data['market_cap'] or 0:,.0f}")
+            log(f"   ✅ 24h Change: {token_data['percent_change_24h'] or 0:.2f}%")
         else:
-            print(f"   ❌ Token ${symbol} not found on CoinMarketCap")
+            log(f"   ❌ Token ${symbol} not found on CoinMarketCap")
+            instrumentation.inc('projects', status='not_found')
             continue
         
         # Calculate days since TGE
         days_since_tge = None
         if tge_date_str:
-            days_since_tge = calculate_days_since_tge(tge_date_str)
+            days_since_tge = calculate_days_since_tge(tge_date_str, now)
             if days_since_tge:
-                print(f"   📅 Days since TGE: {days_since_tge} days")
+                log(f"   📅 Days since TGE: {days_since_tge} days")
         
         # Calculate All-Time ROI using hardcoded TGE price
         all_time_roi = None
@@ -137,10 +360,10 @@ def fetch_all_data():
             current_price = token_data['current_price']
             all_time_roi = ((current_price - tge_price) / tge_price) * 100
             
-            print(f"   💵 TGE Price: ${tge_price:.6f}")
-            print(f"   📈 All-Time ROI: {all_time_roi:+.2f}%")
+            log(f"   💵 TGE Price: ${tge_price:.6f}")
+            log(f"   📈 All-Time ROI: {all_time_roi:+.2f}%")
         else:
-            print(f"   ⚠️  No TGE price available")
+            log(f"   ⚠️  No TGE price available (backfill from OHLCV dumps: python3 tge_backfill.py)")
         
         # Compile result
         result = {
@@ -157,57 +380,222 @@ def fetch_all_data():
             'percent_change_7d': token_data['percent_change_7d'],
             'percent_change_30d': token_data['percent_change_30d'],
             'all_time_roi': all_time_roi,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp,
+            'quote_source': cmc_info.get('source', 'cmc')
         }
         
         results.append(result)
-        print()  # Blank line between projects
+        instrumentation.inc('projects', status='ok')
+        log()  # Blank line between projects
+    
+    return results
+
+
+def save_snapshot(results, store, snapshot_format=SNAPSHOT_FORMAT, now=None, failed_symbols=None):
+    """Append one run's results to the history store and refresh the latest-snapshot file
+    
+    failed_symbols lists tracked projects that got no quote this run, so the
+    dashboard can say which rows are missing.
+    Returns the snapshot ({'metadata', 'projects'}) so callers can render it directly.
+    """
+    data = snapshot_data(results, now, failed_symbols)
+    store.append_snapshot(data)
+    write_latest_snapshot(data, snapshot_format)
+    return data
+
+
+def snapshot_data(results, now=None, failed_symbols=None):
+    """One run's results as a {'metadata', 'projects'} snapshot"""
+    return {
+        'metadata': {
+            'timestamp': (now or datetime.now()).isoformat(),
+            'total_projects': len(results),
+            'data_sources': ['CoinMarketCap', 'Manual TGE Prices'],
+            'failed_symbols': sorted(failed_symbols or [])
+        },
+        'projects': results
+    }
+
+
+def write_latest_snapshot(data, snapshot_format=SNAPSHOT_FORMAT):
+    """Refresh the latest-snapshot file the dashboard reads ('columnar', 'json' or None)"""
+    if snapshot_format == 'columnar':
+        write_snapshot(LATEST_SNAPSHOT_FILE, data)
+    elif snapshot_format == 'json':
+        with open('tracker_results_latest.json', 'w') as f:
+            json.dump({**data, 'projects': list(data['projects'])}, f, indent=2)
+
+
+def load_tracked_projects(say=print):
+    """Validated registry projects with CMC ids resolved, or None if the registry is invalid"""
+    # Load projects (now includes TGE prices!)
+    with instrumentation.timer('stage', stage='load_projects'):
+        try:
+            registry = ProjectRegistry()
+        except RegistryError as e:
+            print(f"❌ {PROJECTS_FILE} failed validation:")
+            for problem in e.problems:
+                print(f"   - {problem}")
+            return None
+        projects = registry.projects
+    say(f"📊 Tracking {len(projects)} Kaito-listed AI Agent projects...\n")
+    
+    # Resolve tickers to CMC ids once (cached id map, works offline);
+    # skipped entirely while neither the registry nor the id map has changed
+    with instrumentation.timer('stage', stage='resolve_ids'):
+        if not (registry.is_current('resolve_ids') and id_map_is_fresh()):
+            id_map = load_id_map(get_cmc_client())
+            resolved = resolve_projects(projects, id_map)
+            for project in resolved:
+                registry.upsert(project)
+            registry.mark_current('resolve_ids')
+            if resolved:
+                say(f"🔗 Resolved {len(resolved)} new CMC ids (saved to the project journal)\n")
+    return projects
+
+
+def fetch_all_data(verbosity=1):
+    """Main function to fetch all token data
+    
+    verbosity: 0 = errors only, 1 = header + summary, 2 = also per-project detail.
+    Stage timings and CMC request stats are exported to metrics/fetch.prom (+ .json).
+    Returns (snapshot, history metrics), or (None, None) if the fetch failed.
+    """
+    started = time.time()
+    snapshot, metrics = None, None
+    try:
+        snapshot, metrics = _fetch_all_data(verbosity)
+        return snapshot, metrics
+    finally:
+        instrumentation.set('last_run_timestamp_seconds', round(started))
+        instrumentation.set('last_run_success', int(snapshot is not None))
+        instrumentation.set('last_run_duration_seconds', round(time.time() - started, 3))
+        instrumentation.export('fetch')
+
+
+def _fetch_all_data(verbosity):
+    say = print if verbosity >= 1 else (lambda *args, **kwargs: None)
+    
+    say("\n" + "="*70)
+    say("🚀 KAITO-LISTED AI AGENTS - POST-TGE PERFORMANCE TRACKER")
+    say("="*70)
+    say(f"📅 Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    say(f"💡 Data: CoinMarketCap (current) + Manual TGE Prices (historical)")
+    say("="*70 + "\n")
+    
+    projects = load_tracked_projects(say)
+    if projects is None:
+        return None, None
+    
+    # Fetch current data from CoinMarketCap
+    quote_cache = QuoteCache(ttl=CMC_QUOTE_CACHE_TTL)
+    blocklist = SymbolBlocklist()
+    providers = build_providers(cache=quote_cache, blocklist=blocklist)
+    with instrumentation.timer('stage', stage='fetch'):
+        if [p.name for p in providers] == ['cmc']:
+            say("💰 Fetching current prices from CoinMarketCap...")
+            cmc_data = fetch_quotes_for_projects(projects, cache=quote_cache, blocklist=blocklist)
+        else:
+            say(f"💰 Fetching current prices from {', '.join(p.name for p in providers)} (hedged)...")
+            cmc_data = HedgedQuotes(providers).fetch_response(projects)
+    instrumentation.inc('quote_cache', quote_cache.hits, result='hit')
+    instrumentation.inc('quote_cache', quote_cache.misses, result='miss')
+    
+    if not cmc_data or 'data' not in cmc_data:
+        print("❌ Failed to fetch price data")
+        return None, None
+    
+    say("✅ Current prices fetched successfully!\n")
+    
+    # Quotes stay USD-only; the (rarely refreshed) FX table converts them for other dashboards
+    if DASHBOARD_CURRENCIES != ['USD']:
+        with instrumentation.timer('stage', stage='fx_rates'):
+            load_fx_table(get_cmc_client(), tge_dates={p.get('tge_date') for p in projects})
+    
+    # Process each project
+    run_time = datetime.now()
+    with instrumentation.timer('stage', stage='process'):
+        results = process_projects(projects, cmc_data, verbose=verbosity >= 2, now=run_time)
+    
+    # Projects without a quote (rejected, blocklisted or not listed) are reported,
+    # the rest are still saved
+    quoted = {r['token_symbol'] for r in results}
+    failed_symbols = [p['token_symbol'] for p in projects if p['token_symbol'] not in quoted]
+    if projects and not results:
+        print("❌ No quotes returned for any project")
+        return None, None
+    if failed_symbols:
+        print(f"⚠️  No quote for {len(failed_symbols)}/{len(projects)} projects: "
+              f"{', '.join('$' + s for s in failed_symbols)}")
     
     # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"tracker_results_{timestamp}.json"
-    
-    with open(filename, 'w') as f:
-        json.dump({
-            'metadata': {
-                'timestamp': datetime.now().isoformat(),
-                'total_projects': len(results),
-                'data_sources': ['CoinMarketCap', 'Manual TGE Prices']
-            },
-            'projects': results
-        }, f, indent=2)
-    
-    print("="*70)
-    print("✅ DATA COLLECTION COMPLETE!")
-    print(f"📁 Results saved to: {filename}")
-    print("="*70 + "\n")
-    
-    # Print summary
-    print("💹 Performance Summary:")
+    store = open_history_store()
+    with instrumentation.timer('stage', stage='persist'):
+        snapshot = save_snapshot(results, store, now=run_time, failed_symbols=failed_symbols)
+    with instrumentation.timer('stage', stage='analytics'):
+        metrics = compute_history_metrics(store)
+    store.close()
+    
+    say("="*70)
+    say("✅ DATA COLLECTION COMPLETE!")
+    say(f"📁 Results appended to: {store.path}")
+    say("="*70 + "\n")
+    
+    # Print summary (one streaming pass, shared with the dashboard)
+    summary = StreamingAggregator(project_categories(projects)).consume(results, metrics)
+    overall = summary.overall
+    say("💹 Performance Summary:")
     if results:
-        total_mcap = sum(r['market_cap'] for r in results if r['market_cap'])
-        best_24h = max(results, key=lambda x: x['percent_change_24h'])
-        worst_24h = min(results, key=lambda x: x['percent_change_24h'])
+        say(f"   💰 Total Market Cap: ${overall.total('market_cap')/1e6:.1f}M")
+        best_24h = overall.best('percent_change_24h')
+        if best_24h:
+            worst_24h = overall.worst('percent_change_24h')
+            say(f"   🏆 Best 24h: {best_24h[1]} ({best_24h[0]:+.2f}%)")
+            say(f"   📉 Worst 24h: {worst_24h[1]} ({worst_24h[0]:+.2f}%)")
         
-        print(f"   💰 Total Market Cap: ${total_mcap/1e6:.1f}M")
-        print(f"   🏆 Best 24h: {best_24h['project_name']} ({best_24h['percent_change_24h']:+.2f}%)")
-        print(f"   📉 Worst 24h: {worst_24h['project_name']} ({worst_24h['percent_change_24h']:+.2f}%)")
+        # All-time ROI + history metrics (batched over the full history)
+        best_roi = overall.best('roi_since_tge')
+        if best_roi:
+            worst_roi = overall.worst('roi_since_tge')
+            say(f"\n   🚀 Best All-Time ROI: {best_roi[1]} ({best_roi[0]:+.2f}%)")
+            say(f"   📊 Worst All-Time ROI: {worst_roi[1]} ({worst_roi[0]:+.2f}%)")
+            say(f"   📈 Average ROI: {overall.mean('roi_since_tge'):+.2f}%")
         
-        # All-time ROI summary
-        roi_results = [r for r in results if r['all_time_roi'] is not None]
-        if roi_results:
-            best_roi = max(roi_results, key=lambda x: x['all_time_roi'])
-            worst_roi = min(roi_results, key=lambda x: x['all_time_roi'])
-            avg_roi = sum(r['all_time_roi'] for r in roi_results) / len(roi_results)
-            
-            print(f"\n   🚀 Best All-Time ROI: {best_roi['project_name']} ({best_roi['all_time_roi']:+.2f}%)")
-            print(f"   📊 Worst All-Time ROI: {worst_roi['project_name']} ({worst_roi['all_time_roi']:+.2f}%)")
-            print(f"   📈 Average ROI: {avg_roi:+.2f}%")
+        deepest_dd = overall.worst('max_drawdown')
+        if deepest_dd:
+            say(f"\n   🕳️  Deepest Drawdown: {deepest_dd[1]} ({deepest_dd[0]:.2f}%)")
+        most_volatile = overall.best('volatility_7d')
+        if most_volatile:
+            say(f"   🌪️  Most Volatile (7d): {most_volatile[1]} ({most_volatile[0]:.1f}% ann.)")
+        best_sharpe = overall.best('sharpe_30d')
+        if best_sharpe:
+            say(f"   ⚖️  Best Sharpe (30d): {best_sharpe[1]} ({best_sharpe[0]:.2f})")
+        
+        if len(summary.by_category) > 1:
+            say("\n   🏷️  By category:")
+            for category, rollup in sorted(summary.by_category.items()):
+                avg_roi = rollup.mean('roi_since_tge')
+                roi_str = f", avg ROI {avg_roi:+.1f}%" if avg_roi is not None else ''
+                say(f"      {category}: {rollup.count} projects, ${rollup.total('market_cap')/1e6:.1f}M{roi_str}")
+    
+    say(f"\n🗄️  Quote cache: {quote_cache.summary()}")
     
-    print("\n🎯 Next step: Copy results to dashboard")
-    print(f"   Run: cp {filename} tracker_results_latest.json")
-    print()
+    # Threshold alerts on the rows that changed (no-op without alert_rules.json)
+    check_alerts(snapshot, say=say)
+    
+    say("\n🎯 Next step: Generate the dashboard")
+    say("   Run: python3 kaito_tracker.py render")
+    say()
+    return snapshot, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kaito AI agents post-TGE tracker')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print per-project detail')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print errors')
+    args = parser.parse_args()
+    fetch_all_data(verbosity=0 if args.quiet else 2 if args.verbose else 1)
 
 
 if __name__ == "__main__":
-    fetch_all_data()
+    main()
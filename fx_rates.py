@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Locally cached USD conversion table (EUR, BTC, ETH, ...)
+Quotes are always fetched once in USD; other currencies are converted locally
+
+Asking CMC for extra `convert` targets multiplies the credit cost of every
+quotes call. Instead, one /v2/tools/price-conversion call (1 USD -> every
+configured currency) is made rarely and cached in fx_rates.json, together
+with one sample per day. Prices, market caps and volumes convert with the
+current rate; ROI and percent changes also need the rate at the start of
+their window (TGE date, 1/7/30 days ago) and are left empty where that day
+hasn't been recorded yet. Fetches record the rate on each tracked TGE date
+once (a historical price-conversion call per date, at most
+FX_TGE_DATES_PER_RUN per run); `import` backfills anything else.
+
+Usage:
+    python3 fx_rates.py              # show the cached table
+    python3 fx_rates.py refresh      # fetch fresh rates now
+    python3 fx_rates.py import rates.csv   # backfill daily rates: date,currency,units_per_usd
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from history_store import RESULT_FIELDS
+
+FX_RATES_FILE = 'fx_rates.json'
+FX_CONVERSION_PATH = '/v2/tools/price-conversion'
+USD_CMC_ID = 2781
+
+# ========================================
+# OPTIONAL SETTINGS - Load from config file
+# ========================================
+try:
+    from config import DASHBOARD_CURRENCIES
+except ImportError:
+    DASHBOARD_CURRENCIES = ['USD']      # e.g. ['USD', 'EUR', 'BTC', 'ETH']; first one is dashboard.html
+
+try:
+    from config import FX_RATES_TTL
+except ImportError:
+    FX_RATES_TTL = 6 * 3600             # Seconds before the conversion table is fetched again
+
+try:
+    from config import FX_TGE_DATES_PER_RUN
+except ImportError:
+    FX_TGE_DATES_PER_RUN = 10           # Historical TGE-date rates fetched per run (one call each)
+
+# Result fields converted with the current rate, and percent changes with their window in days
+AMOUNT_FIELDS = ['current_price', 'market_cap', 'volume_24h']
+CHANGE_WINDOWS = {'percent_change_24h': 1, 'percent_change_7d': 7, 'percent_change_30d': 30}
+
+
+class FXTable:
+    """Units of each currency per 1 USD, now and per recorded day"""
+
+    def __init__(self, rates=None, history=None, fetched_at=0):
+        self.rates = rates or {}
+        self.history = history or {}     # 'YYYY-MM-DD' -> {currency: units per USD}
+        self.fetched_at = fetched_at
+
+    @classmethod
+    def load(cls, path=FX_RATES_FILE):
+        """Load the cached table; an empty table if there is no cache yet"""
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            return cls(cached['rates'], cached.get('history'), cached['fetched_at'])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return cls()
+
+    def save(self, path=FX_RATES_FILE):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'fetched_at': self.fetched_at, 'rates': self.rates, 'history': self.history},
+                      f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+    def is_stale(self, currencies, max_age=FX_RATES_TTL, now=None):
+        now = now if now is not None else time.time()
+        missing = [c for c in currencies if c != 'USD' and c not in self.rates]
+        return bool(missing) or now - self.fetched_at > max_age
+
+    def update(self, rates, now=None):
+        """Take fresh rates; the first sample of each day is kept in the history"""
+        now = now if now is not None else time.time()
+        self.rates.update(rates)
+        self.fetched_at = now
+        day = self.history.setdefault(datetime.fromtimestamp(now).strftime('%Y-%m-%d'), {})
+        for currency, rate in rates.items():
+            day.setdefault(currency, rate)
+
+    def rate(self, currency):
+        """Current units of `currency` per USD (None if unknown)"""
+        return 1.0 if currency == 'USD' else self.rates.get(currency)
+
+    def rate_on(self, currency, day):
+        """Units of `currency` per USD recorded on `day` ('YYYY-MM-DD'), or None"""
+        if currency == 'USD':
+            return 1.0
+        return self.history.get(day, {}).get(currency)
+
+    def missing_days(self, days, currencies):
+        """Days (sorted) that lack a recorded rate for any of `currencies`"""
+        targets = [c for c in currencies if c != 'USD']
+        return sorted(day for day in set(days) if day and any(self.rate_on(c, day) is None for c in targets))
+
+
+def fetch_rates(client, currencies, day=None):
+    """{currency: units per USD} from one CMC price-conversion call (as of `day` 'YYYY-MM-DD' if given)"""
+    targets = [c for c in currencies if c != 'USD']
+    params = {'amount': 1, 'id': USD_CMC_ID, 'convert': ','.join(targets)}
+    if day:
+        params['time'] = f"{day}T00:00:00Z"
+    payload = client.get(FX_CONVERSION_PATH, params=params)
+    data = payload['data']
+    if isinstance(data, list):
+        data = data[0]
+    return {currency: data['quote'][currency]['price'] for currency in targets if currency in data['quote']}
+
+
+def record_day_rates(table, client, currencies, days, limit=FX_TGE_DATES_PER_RUN):
+    """Fetch the rates on up to `limit` of `days` the table lacks; returns the number recorded"""
+    recorded = 0
+    for day in table.missing_days(days, currencies)[:limit]:
+        try:
+            rates = fetch_rates(client, currencies, day)
+        except Exception as e:
+            print(f"⚠️  Could not fetch FX rates for {day} ({e}), ROI in other currencies stays N/A there")
+            break
+        for currency, rate in rates.items():
+            table.history.setdefault(day, {}).setdefault(currency, rate)
+        recorded += 1
+    return recorded
+
+
+def load_fx_table(client=None, currencies=None, path=FX_RATES_FILE, max_age=FX_RATES_TTL, tge_dates=()):
+    """Cached table, refreshed from CMC when stale; falls back to the cache when offline
+
+    Rates on `tge_dates` the table hasn't recorded yet are fetched too (see record_day_rates).
+    """
+    currencies = currencies or DASHBOARD_CURRENCIES
+    table = FXTable.load(path)
+    if client is None or currencies == ['USD']:
+        return table
+
+    changed = False
+    if table.is_stale(currencies, max_age):
+        try:
+            table.update(fetch_rates(client, currencies))
+            changed = True
+        except Exception as e:
+            print(f"⚠️  Could not refresh FX rates ({e}), using cached copy")
+    if tge_dates and record_day_rates(table, client, currencies, tge_dates):
+        changed = True
+
+    if changed:
+        table.save(path)
+    return table
+
+
+def convert_projects(projects, currency, table, as_of=None):
+    """Converted copies of USD result rows, in one pass
+
+    Amounts use the current rate. ROI uses the rate on the TGE date and percent
+    changes the rate at the start of their window; they are None where that
+    day's rate isn't in the table. Returns None if the currency's rate is unknown.
+    """
+    rate = table.rate(currency)
+    if rate is None:
+        return None
+    if currency == 'USD':
+        return [{field: p.get(field) for field in RESULT_FIELDS} for p in projects]
+
+    as_of = as_of or datetime.now()
+    window_rates = {
+        field: table.rate_on(currency, (as_of - timedelta(days=days)).strftime('%Y-%m-%d'))
+        for field, days in CHANGE_WINDOWS.items()
+    }
+    tge_rates = {}
+    converted = []
+    for p in projects:
+        row = {field: p.get(field) for field in RESULT_FIELDS}
+        for field in AMOUNT_FIELDS:
+            if row.get(field) is not None:
+                row[field] = row[field] * rate
+        for field, then in window_rates.items():
+            change = row.get(field)
+            row[field] = (1 + change / 100) * rate / then * 100 - 100 if change is not None and then else None
+
+        tge_date = row.get('tge_date')
+        if tge_date not in tge_rates:
+            tge_rates[tge_date] = table.rate_on(currency, tge_date) if tge_date else None
+        tge_rate = tge_rates[tge_date]
+        if row.get('tge_price') and tge_rate:
+            row['tge_price'] = row['tge_price'] * tge_rate
+            price = row.get('current_price')
+            row['all_time_roi'] = (price / row['tge_price'] - 1) * 100 if price is not None else None
+        else:
+            row['tge_price'] = None
+            row['all_time_roi'] = None
+        converted.append(row)
+    return converted
+
+
+def import_rates(path, table):
+    """Backfill daily rates from a CSV with columns date,currency,units_per_usd; returns the count"""
+    count = 0
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            table.history.setdefault(row['date'], {})[row['currency'].upper()] = float(row['units_per_usd'])
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cached USD conversion table for multi-currency dashboards')
+    sub = parser.add_subparsers(dest='command')
+    sub.add_parser('refresh', help='Fetch fresh rates from CoinMarketCap now')
+    import_cmd = sub.add_parser('import', help='Backfill daily rates from a CSV (date,currency,units_per_usd)')
+    import_cmd.add_argument('csv')
+    args = parser.parse_args()
+
+    table = FXTable.load()
+    if args.command == 'refresh':
+        from fetch_all_projects import get_cmc_client
+        table.update(fetch_rates(get_cmc_client(), DASHBOARD_CURRENCIES))
+        table.save()
+        print(f"✅ Refreshed rates for {', '.join(table.rates)}")
+    elif args.command == 'import':
+        count = import_rates(args.csv, table)
+        table.save()
+        print(f"✅ Imported {count} daily rates ({len(table.history)} days recorded)")
+
+    fetched = datetime.fromtimestamp(table.fetched_at).strftime('%Y-%m-%d %H:%M') if table.fetched_at else 'never'
+    print(f"💱 1 USD = {', '.join(f'{rate:.8g} {c}' for c, rate in sorted(table.rates.items())) or '-'} "
+          f"(fetched {fetched}, {len(table.history)} days of history)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,119 +1,39 @@
 #!/usr/bin/env python3
 """
 Generate DEGEN dashboard with embedded JSON data
-Run this after fetch_all_projects.py
+Run this after fetch_all_projects.py (or use `kaito_tracker.py pipeline`)
+
+Rows are streamed to the output file through a generator, so render time and
+memory stay linear in the number of projects. Very large tables can be
+sharded into paginated static pages.
 """
 
 import json
+import os
+import re
 from datetime import datetime
 
-def generate_dashboard():
-    # Load the JSON data
-    try:
-        with open('tracker_results_latest.json', 'r') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print("❌ Error: tracker_results_latest.json not found!")
-        print("   Run fetch_all_projects.py first.")
-        return
-    
-    projects = data['projects']
-    
-    # Calculate stats
-    total_projects = len(projects)
-    total_mcap = sum(p['market_cap'] for p in projects if p.get('market_cap'))
-    
-    best_24h = max(projects, key=lambda x: x.get('percent_change_24h', -float('inf')))
-    best_24h_change = best_24h.get('percent_change_24h', 0)
-    
-    # Calculate best all-time ROI
-    roi_projects = [p for p in projects if p.get('all_time_roi') is not None]
-    if roi_projects:
-        best_roi = max(roi_projects, key=lambda x: x['all_time_roi'])
-        best_roi_value = best_roi['all_time_roi']
-        best_roi_name = best_roi['project_name']
-    else:
-        best_roi_value = 0
-        best_roi_name = "N/A"
-    
-    valid_days = [p['days_since_tge'] for p in projects if p.get('days_since_tge')]
-    avg_days = round(sum(valid_days) / len(valid_days)) if valid_days else 0
-    
-    # Format market cap
-    if total_mcap >= 1e9:
-        mcap_str = f"${total_mcap/1e9:.2f}B"
-    elif total_mcap >= 1e6:
-        mcap_str = f"${total_mcap/1e6:.2f}M"
-    else:
-        mcap_str = f"${total_mcap:.0f}"
-    
-    # Generate table rows
-    rows_html = ""
-    for p in projects:
-        # Format price
-        price = p.get('current_price', 0)
-        if price < 0.01:
-            price_str = f"${price:.6f}"
-        elif price < 1:
-            price_str = f"${price:.4f}"
-        else:
-            price_str = f"${price:.2f}"
-        
-        # Format market cap
-        mcap = p.get('market_cap', 0)
-        if mcap >= 1e9:
-            mcap_str_row = f"${mcap/1e9:.2f}B"
-        elif mcap >= 1e6:
-            mcap_str_row = f"${mcap/1e6:.2f}M"
-        else:
-            mcap_str_row = f"${mcap:.0f}"
-        
-        # Format changes - cleaner style
-        def format_change(val):
-            if val is None:
-                return 'N/A', ''
-            sign = '+' if val >= 0 else ''
-            color_class = 'moon' if val >= 0 else 'rekt'
-            return f"{sign}{val:.2f}%", color_class
-        
-        roi_str, roi_class = format_change(p.get('all_time_roi'))
-        # Add fire emoji only for massive gains (>1000%)
-        if p.get('all_time_roi') and p.get('all_time_roi') > 1000:
-            roi_str = f"🔥 {roi_str}"
-        
-        change_24h_str, change_24h_class = format_change(p.get('percent_change_24h'))
-        change_7d_str, change_7d_class = format_change(p.get('percent_change_7d'))
-        change_30d_str, change_30d_class = format_change(p.get('percent_change_30d'))
-        
-        days_str = f"{p.get('days_since_tge', 'N/A')} days" if p.get('days_since_tge') else 'N/A'
-        
-        rows_html += f"""
-                    <tr>
-                        <td><strong>{p['project_name']}</strong><br><small style="color:#1da1f2">{p['twitter']}</small></td>
-                        <td><span class="token">${p['token_symbol']}</span></td>
-                        <td>{price_str}</td>
-                        <td>{mcap_str_row}</td>
-                        <td class="{roi_class}">{roi_str}</td>
-                        <td class="{change_24h_class}">{change_24h_str}</td>
-                        <td class="{change_7d_class}">{change_7d_str}</td>
-                        <td class="{change_30d_class}">{change_30d_str}</td>
-                        <td>{days_str}</td>
-                    </tr>
-        """
-    
-    # Get timestamp
-    timestamp = data['metadata'].get('timestamp', '')
-    if timestamp:
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        timestamp_str = dt.strftime('%Y-%m-%d %H:%M:%S')
-    else:
-        timestamp_str = 'Unknown'
-    
-    # Determine best ROI emoji
-    roi_display_emoji = '🔥💎🚀' if best_roi_value > 1000 else '🚀' if best_roi_value > 100 else '📈'
-    
-    # Generate HTML with DEGEN theme
-    html = f"""<!DOCTYPE html>
+from aggregation import StreamingAggregator, load_categories
+from analytics import compute_history_metrics
+from columnar_snapshot import LATEST_SNAPSHOT_FILE, ColumnarSnapshot
+from fx_rates import DASHBOARD_CURRENCIES, FXTable, convert_projects
+from history_store import open_history_store
+from instrumentation import instrumentation
+from sparklines import load_sparklines, render_roi_chart, render_sparkline
+
+# ========================================
+# RENDER SETTINGS
+# ========================================
+ROWS_PER_WRITE = 500    # Rows buffered per file write
+PAGE_SIZE = None        # Rows per static page (None = everything on one page)
+DETAIL_PAGES = True     # Also write projects/<SYMBOL>.html (only pages whose data changed)
+PROJECTS_DIR = 'projects'
+CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'BTC': '₿', 'ETH': 'Ξ'}
+
+# ========================================
+# TEMPLATES (compiled once, filled per page / per row)
+# ========================================
+PAGE_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -306,6 +226,90 @@ def generate_dashboard():
             margin: 5px 0;
         }}
         
+        .category-rollup {{
+            margin-bottom: 40px;
+        }}
+        
+        .roi-chart {{
+            padding: 20px 30px;
+            margin-bottom: 40px;
+        }}
+        
+        .roi-chart h3 {{
+            color: #60a5fa;
+            margin-bottom: 15px;
+        }}
+        
+        .chart-legend {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 15px;
+            margin-top: 10px;
+            font-weight: 600;
+        }}
+        
+        .currency-nav {{
+            display: flex;
+            justify-content: center;
+            gap: 10px;
+            margin-top: 15px;
+        }}
+        
+        .currency-nav a, .currency-nav span {{
+            color: #60a5fa;
+            padding: 4px 12px;
+            border: 1px solid rgba(59, 130, 246, 0.3);
+            border-radius: 10px;
+            text-decoration: none;
+        }}
+        
+        .currency-nav .current {{
+            color: white;
+            background: rgba(59, 130, 246, 0.2);
+        }}
+        
+        .project-link {{
+            color: white;
+            text-decoration: none;
+        }}
+        
+        .project-link:hover {{
+            text-decoration: underline;
+        }}
+        
+        .sparkline {{
+            display: block;
+        }}
+        
+        .fetch-warning {{
+            color: #fbbf24;
+            background: rgba(251, 191, 36, 0.08);
+            border: 1px solid rgba(251, 191, 36, 0.3);
+            border-radius: 10px;
+            padding: 12px 18px;
+            margin-bottom: 30px;
+        }}
+        
+        .pager {{
+            display: flex;
+            justify-content: center;
+            gap: 10px;
+            margin-top: 30px;
+        }}
+        
+        .pager a, .pager span {{
+            color: #60a5fa;
+            padding: 8px 14px;
+            border: 1px solid rgba(59, 130, 246, 0.3);
+            border-radius: 10px;
+            text-decoration: none;
+        }}
+        
+        .pager .current {{
+            color: white;
+            background: rgba(59, 130, 246, 0.2);
+        }}
+        
         @keyframes fadeInDown {{
             from {{
                 opacity: 0;
@@ -361,8 +365,31 @@ def generate_dashboard():
         <div class="header">
             <h1>Kaito AI Agents Tracker</h1>
             <div class="subtitle">Post-TGE Performance</div>
-        </div>
+{currency_nav}        </div>
+
+{summary_html}
+        <div class="table-container">
+            <table>
+                <thead>
+                    <tr>
+                        <th>Project</th>
+                        <th>Token</th>
+                        <th>Price</th>
+                        <th>Market Cap</th>
+                        <th>All-Time ROI</th>
+                        <th>24h Change</th>
+                        <th>7d Change</th>
+                        <th>30d Change</th>
+                        <th>Price Trend</th>
+                        <th>Max Drawdown</th>
+                        <th>30d Volatility</th>
+                        <th>Days Since TGE</th>
+                    </tr>
+                </thead>
+                <tbody>
+"""
 
+STATS_TEMPLATE = """        <div id="summary">
         <div class="stats-grid">
             <div class="stat-card">
                 <div class="stat-value">{total_projects}</div>
@@ -373,7 +400,7 @@ def generate_dashboard():
                 <div class="stat-label">Total Market Cap</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value">{roi_display_emoji} {'+' if best_roi_value >= 0 else ''}{best_roi_value:.1f}%</div>
+                <div class="stat-value">{best_roi_display}</div>
                 <div class="stat-label">Best All-Time ROI</div>
             </div>
             <div class="stat-card">
@@ -381,47 +408,433 @@ def generate_dashboard():
                 <div class="stat-label">Avg Days Since TGE</div>
             </div>
         </div>
+{categories_html}{chart_html}{failures_html}        </div>
+"""
 
-        <div class="table-container">
+FAILURES_TEMPLATE = """        <div class="fetch-warning">⚠️ No fresh quote for {count} project{plural}: {symbols}</div>
+"""
+
+CATEGORY_TABLE_TEMPLATE = """        <div class="table-container category-rollup">
             <table>
                 <thead>
                     <tr>
-                        <th>Project</th>
-                        <th>Token</th>
-                        <th>Price</th>
+                        <th>Category</th>
+                        <th>Projects</th>
                         <th>Market Cap</th>
-                        <th>All-Time ROI</th>
-                        <th>24h Change</th>
-                        <th>7d Change</th>
-                        <th>30d Change</th>
-                        <th>Days Since TGE</th>
+                        <th>Avg All-Time ROI</th>
+                        <th>Best 24h</th>
+                        <th>Worst 24h</th>
                     </tr>
                 </thead>
                 <tbody>
-{rows_html}
-                </tbody>
+{rows}                </tbody>
             </table>
         </div>
+"""
+
+CATEGORY_ROW_TEMPLATE = """                    <tr>
+                        <td><strong>{category}</strong></td>
+                        <td>{count}</td>
+                        <td>{mcap_str}</td>
+                        <td class="{roi_class}">{roi_str}</td>
+                        <td>{best_24h}</td>
+                        <td>{worst_24h}</td>
+                    </tr>
+"""
+
+ROW_TEMPLATE = """
+                    <tr id="row-{token_symbol}">
+                        <td><strong><a class="project-link" href="{detail_href}">{project_name}</a></strong><br><small style="color:#1da1f2">{twitter}</small></td>
+                        <td><span class="token">${token_symbol}</span></td>
+                        <td>{price_str}</td>
+                        <td>{mcap_str}</td>
+                        <td class="{roi_class}">{roi_str}</td>
+                        <td class="{change_24h_class}">{change_24h_str}</td>
+                        <td class="{change_7d_class}">{change_7d_str}</td>
+                        <td class="{change_30d_class}">{change_30d_str}</td>
+                        <td>{sparkline_html}</td>
+                        <td class="{drawdown_class}">{drawdown_str}</td>
+                        <td>{volatility_str}</td>
+                        <td>{days_str}</td>
+                    </tr>
+        """
 
+PAGE_TAIL = """                </tbody>
+            </table>
+        </div>
+{pager}
         <div class="footer">
             <p>Data: CoinMarketCap + Manual TGE Prices</p>
-            <p>Last updated: {timestamp_str}</p>
+            <p id="last-updated">Last updated: {timestamp_str}</p>
         </div>
     </div>
 </body>
 </html>
 """
+
+_render_head = PAGE_HEAD.format
+_render_stats = STATS_TEMPLATE.format
+_render_category_table = CATEGORY_TABLE_TEMPLATE.format
+_render_failures = FAILURES_TEMPLATE.format
+_render_category_row = CATEGORY_ROW_TEMPLATE.format
+_render_row = ROW_TEMPLATE.format
+_render_tail = PAGE_TAIL.format
+
+
+def format_price(price, currency='USD'):
+    symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+    if 0 < price < 1e-6:
+        return f"{symbol}{price:.3g}"    # BTC/ETH-denominated small caps
+    elif price < 0.01:
+        return f"{symbol}{price:.6f}"
+    elif price < 1:
+        return f"{symbol}{price:.4f}"
+    return f"{symbol}{price:.2f}"
+
+
+def format_mcap(mcap, currency='USD'):
+    symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+    if mcap >= 1e9:
+        return f"{symbol}{mcap/1e9:.2f}B"
+    elif mcap >= 1e6:
+        return f"{symbol}{mcap/1e6:.2f}M"
+    return f"{symbol}{mcap:.0f}"
+
+
+def format_change(val):
+    """Format a percent change - returns (text, css class)"""
+    if val is None:
+        return 'N/A', ''
+    sign = '+' if val >= 0 else ''
+    color_class = 'moon' if val >= 0 else 'rekt'
+    return f"{sign}{val:.2f}%", color_class
+
+
+def detail_page_name(symbol):
+    """File name of a project's detail page (symbols are sanitized for the filesystem)"""
+    return f"{re.sub(r'[^A-Za-z0-9_-]', '_', symbol)}.html"
+
+
+def render_row(p, metrics=None, series=None, currency='USD'):
+    """Render one project as a table row (metrics: analytics output for its symbol, series: its sparkline)"""
+    metrics = metrics or {}
+    roi_str, roi_class = format_change(p.get('all_time_roi'))
+    # Add fire emoji only for massive gains (>1000%)
+    if p.get('all_time_roi') and p.get('all_time_roi') > 1000:
+        roi_str = f"🔥 {roi_str}"
+    
+    change_24h_str, change_24h_class = format_change(p.get('percent_change_24h'))
+    change_7d_str, change_7d_class = format_change(p.get('percent_change_7d'))
+    change_30d_str, change_30d_class = format_change(p.get('percent_change_30d'))
+    drawdown_str, drawdown_class = format_change(metrics.get('max_drawdown'))
+    volatility = metrics.get('volatility_30d')
+    volatility_str = f"{volatility:.1f}%" if volatility is not None else 'N/A'
+    
+    days_str = f"{p.get('days_since_tge', 'N/A')} days" if p.get('days_since_tge') else 'N/A'
+    
+    return _render_row(
+        project_name=p['project_name'],
+        twitter=p['twitter'],
+        token_symbol=p['token_symbol'],
+        detail_href=f"{PROJECTS_DIR}/{detail_page_name(p['token_symbol'])}",
+        price_str=format_price(p.get('current_price') or 0, currency),
+        mcap_str=format_mcap(p.get('market_cap') or 0, currency),
+        roi_str=roi_str, roi_class=roi_class,
+        change_24h_str=change_24h_str, change_24h_class=change_24h_class,
+        change_7d_str=change_7d_str, change_7d_class=change_7d_class,
+        change_30d_str=change_30d_str, change_30d_class=change_30d_class,
+        sparkline_html=render_sparkline(series),
+        drawdown_str=drawdown_str, drawdown_class=drawdown_class,
+        volatility_str=volatility_str,
+        days_str=days_str
+    )
+
+
+def render_rows(projects, metrics=None, series=None, currency='USD'):
+    """Yield rendered rows one at a time"""
+    metrics = metrics or {}
+    series = series or {}
+    for p in projects:
+        yield render_row(p, metrics.get(p['token_symbol']), series.get(p['token_symbol']), currency)
+
+
+def render_leader(entry):
+    """'Name (+12.34%)' for a leaderboard entry, or N/A"""
+    if not entry:
+        return 'N/A'
+    value, name = entry
+    text, color_class = format_change(value)
+    return f'{name} <span class="{color_class}">({text})</span>'
+
+
+def render_categories(summary, currency='USD'):
+    """Per-category rollup table ('' when everything is in one category)"""
+    if len(summary.by_category) < 2:
+        return ''
+    rows = []
+    for category, rollup in sorted(summary.by_category.items()):
+        roi_str, roi_class = format_change(rollup.mean('roi_since_tge'))
+        rows.append(_render_category_row(
+            category=category,
+            count=rollup.count,
+            mcap_str=format_mcap(rollup.total('market_cap'), currency),
+            roi_str=roi_str, roi_class=roi_class,
+            best_24h=render_leader(rollup.best('percent_change_24h')),
+            worst_24h=render_leader(rollup.worst('percent_change_24h'))
+        ))
+    return _render_category_table(rows=''.join(rows))
+
+
+def render_failures(failed_symbols):
+    """Notice listing projects the last fetch couldn't quote ('' when none)"""
+    if not failed_symbols:
+        return ''
+    return _render_failures(
+        count=len(failed_symbols),
+        plural='' if len(failed_symbols) == 1 else 's',
+        symbols=', '.join(f"${symbol}" for symbol in failed_symbols)
+    )
+
+
+def render_summary(summary, failed_symbols=None, chart_html='', currency='USD'):
+    """Stats cards (+ category rollups, ROI chart and fetch failures) from a StreamingAggregator"""
+    overall = summary.overall
+    best_roi = overall.best('roi_since_tge')
+    avg_days = overall.mean('days_since_tge')
+    avg_days = round(avg_days) if avg_days else 0
+    
+    # Determine best ROI emoji (no ROI at all, e.g. no FX rate for the TGE dates: N/A)
+    if best_roi:
+        best_roi_value = best_roi[0]
+        roi_display_emoji = '🔥💎🚀' if best_roi_value > 1000 else '🚀' if best_roi_value > 100 else '📈'
+        best_roi_display = f"{roi_display_emoji} {'+' if best_roi_value >= 0 else ''}{best_roi_value:.1f}%"
+    else:
+        best_roi_display = 'N/A'
+    
+    return _render_stats(
+        total_projects=overall.count,
+        mcap_str=format_mcap(overall.total('market_cap'), currency),
+        best_roi_display=best_roi_display,
+        avg_days=avg_days,
+        categories_html=render_categories(summary, currency),
+        chart_html=chart_html,
+        failures_html=render_failures(failed_symbols)
+    )
+
+
+def format_timestamp(metadata):
+    timestamp = metadata.get('timestamp', '')
+    if timestamp:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m-%d %H:%M:%S')
+    return 'Unknown'
+
+
+def write_page(f, head_html, rows, tail_html, rows_per_write=ROWS_PER_WRITE):
+    """Stream head, rows (in chunks) and tail to an open file"""
+    f.write(head_html)
+    buffer = []
+    for row in rows:
+        buffer.append(row)
+        if len(buffer) >= rows_per_write:
+            f.write(''.join(buffer))
+            buffer.clear()
+    if buffer:
+        f.write(''.join(buffer))
+    f.write('\n')
+    f.write(tail_html)
+
+
+def page_filename(output, page):
+    """dashboard.html, dashboard_page2.html, ..."""
+    if page == 1:
+        return output
+    stem, dot, ext = output.rpartition('.')
+    return f"{stem}_page{page}.{ext}" if dot else f"{output}_page{page}"
+
+
+def render_pager(output, page, pages):
+    """Prev / numbered / next links between the pages of one view"""
+    if pages <= 1:
+        return ''
+
+    def href(n):
+        return page_filename(output, n).rsplit('/', 1)[-1]
+
+    links = []
+    if page > 1:
+        links.append(f'<a href="{href(page - 1)}" rel="prev">&lsaquo; Prev</a>')
+    for n in range(1, pages + 1):
+        if n == page:
+            links.append(f'<span class="current">{n}</span>')
+        else:
+            links.append(f'<a href="{href(n)}">{n}</a>')
+    if page < pages:
+        links.append(f'<a href="{href(page + 1)}" rel="next">Next &rsaquo;</a>')
+    return f'        <div class="pager">{"".join(links)}</div>\n'
+
+
+def load_latest_snapshot():
+    """Latest snapshot: the columnar file if current, else the history store, else tracker_results_latest.json
+    
+    A columnar snapshot is returned as a ColumnarSnapshot whose projects are
+    lazy row views, so rendering never builds per-row dicts.
+    """
+    store = open_history_store()
+    latest_timestamp = store.latest_timestamp()
+    
+    if os.path.exists(LATEST_SNAPSHOT_FILE):
+        snapshot = ColumnarSnapshot(LATEST_SNAPSHOT_FILE)
+        if latest_timestamp is None or snapshot.metadata['timestamp'] >= latest_timestamp:
+            store.close()
+            return snapshot
+        snapshot.close()
     
-    # Save HTML
-    with open('dashboard.html', 'w') as f:
-        f.write(html)
+    data = store.latest_snapshot()
+    store.close()
+    if data:
+        return data
+    
+    try:
+        with open('tracker_results_latest.json', 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def currency_filename(output, currency, currencies):
+    """dashboard.html for the first currency, dashboard_eur.html, dashboard_btc.html, ... for the rest"""
+    if currency == currencies[0]:
+        return output
+    stem, dot, ext = output.rpartition('.')
+    return f"{stem}_{currency.lower()}.{ext}" if dot else f"{output}_{currency.lower()}"
+
+
+def render_currency_nav(output, currency, currencies):
+    if len(currencies) <= 1:
+        return ''
+    links = []
+    for other in currencies:
+        if other == currency:
+            links.append(f'<span class="current">{other}</span>')
+        else:
+            href = currency_filename(output, other, currencies).rsplit('/', 1)[-1]
+            links.append(f'<a href="{href}">{other}</a>')
+    return f'            <div class="currency-nav">{"".join(links)}</div>\n'
+
+
+def converted_metrics(metrics, projects):
+    """History metrics with roi_since_tge swapped for the converted all-time ROI"""
+    return {
+        p['token_symbol']: {**(metrics.get(p['token_symbol']) or {}), 'roi_since_tge': p['all_time_roi']}
+        for p in projects
+    }
+
+
+def render_view(output, page_size, projects, metrics, series, categories, metadata,
+                currency='USD', currency_nav='', chart=True):
+    """Write one currency's dashboard (one or more static pages); returns the file names"""
+    total_projects = len(projects)
+    summary = StreamingAggregator(categories).consume(projects, metrics)
+    head_html = _render_head(
+        currency_nav=currency_nav,
+        summary_html=render_summary(summary, metadata.get('failed_symbols'),
+                                    render_roi_chart(projects, series) if chart else '', currency)
+    )
+    timestamp_str = format_timestamp(metadata)
+    
+    # Stream rows to one or more static pages
+    page_size = page_size or max(1, total_projects)
+    pages = max(1, -(-total_projects // page_size))
+    written = []
+    for page in range(1, pages + 1):
+        chunk = projects[(page - 1) * page_size:page * page_size]
+        filename = page_filename(output, page)
+        tail_html = _render_tail(pager=render_pager(output, page, pages), timestamp_str=timestamp_str)
+        with open(filename, 'w') as f:
+            write_page(f, head_html, render_rows(chunk, metrics, series, currency), tail_html)
+        written.append(filename)
+    return written
+
+
+def generate_dashboard(output='dashboard.html', page_size=PAGE_SIZE, data=None, metrics=None, series=None,
+                       detail_pages=DETAIL_PAGES, currencies=None):
+    """Render the dashboard; `data`/`metrics`/`series` skip the reload when the caller already has them
+    
+    One view is written per currency in `currencies` (default DASHBOARD_CURRENCIES),
+    converted locally from the USD snapshot with the cached FX table - no API calls.
+    """
+    # Load the latest snapshot
+    if data is None:
+        with instrumentation.timer('stage', stage='load_snapshot'):
+            data = load_latest_snapshot()
+    if not data:
+        print("❌ Error: no tracker results found!")
+        print("   Run: python3 kaito_tracker.py fetch")
+        return False
+    
+    projects = data['projects']
+    if metrics is None:
+        with instrumentation.timer('stage', stage='analytics'):
+            metrics = compute_history_metrics()
+    if series is None:
+        with instrumentation.timer('stage', stage='sparklines'):
+            series = load_sparklines()
+    
+    total_projects = len(projects)
+    categories = load_categories()
+    currencies = currencies or DASHBOARD_CURRENCIES
+    fx_table = FXTable.load() if currencies != ['USD'] else None
+    timestamp = data['metadata'].get('timestamp')
+    as_of = datetime.fromisoformat(timestamp.replace('Z', '+00:00')) if timestamp else None
+    
+    views = {}
+    with instrumentation.timer('stage', stage='render'):
+        for currency in currencies:
+            view_projects, view_metrics = projects, metrics
+            if currency != 'USD':
+                with instrumentation.timer('stage', stage='fx_convert'):
+                    view_projects = convert_projects(projects, currency, fx_table, as_of)
+                if view_projects is None:
+                    print(f"⚠️  No {currency} rate cached, skipping that view (run: python3 fx_rates.py refresh)")
+                    continue
+                view_metrics = converted_metrics(metrics, view_projects)
+            # History metrics, sparklines and the ROI chart stay USD-denominated,
+            # so the chart is only drawn on the USD view
+            views[currency] = render_view(
+                currency_filename(output, currency, currencies), page_size, view_projects, view_metrics,
+                series, categories, data['metadata'], currency,
+                currency_nav=render_currency_nav(output, currency, currencies), chart=currency == 'USD'
+            )
+    if detail_pages:
+        from project_pages import render_project_pages  # imports this module
+        with instrumentation.timer('stage', stage='detail_pages'):
+            rendered, unchanged, removed = render_project_pages(
+                projects, metrics, series, categories,
+                output_dir=os.path.join(os.path.dirname(output), PROJECTS_DIR)
+            )
+        instrumentation.inc('detail_pages', rendered, result='rendered')
+        instrumentation.inc('detail_pages', unchanged, result='unchanged')
+    if isinstance(data, ColumnarSnapshot):
+        data.close()
+    instrumentation.inc('rows_rendered', total_projects * len(views))
+    instrumentation.set('last_render_timestamp_seconds', round(datetime.now().timestamp()))
+    instrumentation.export('dashboard')
     
     print("✅ Dashboard generated successfully!")
-    print("📁 Saved to: dashboard.html")
+    for currency, written in views.items():
+        label = f" ({currency})" if len(currencies) > 1 else ''
+        if len(written) > 1:
+            print(f"📁 Saved {len(written)} pages{label}: {written[0]} ... {written[-1]}")
+        else:
+            print(f"📁 Saved to: {written[0]}{label}")
+    if detail_pages:
+        print(f"📄 Detail pages: {rendered} rendered, {unchanged} unchanged, {removed} removed")
     print("\n🎯 To view:")
-    print("   1. python3 -m http.server 3000")
-    print("   2. Open: http://localhost:3000/dashboard.html")
+    print("   1. python3 kaito_tracker.py serve")
+    print(f"   2. Open: http://localhost:3000/{output}")
     print()
+    return True
 
 if __name__ == "__main__":
     generate_dashboard()
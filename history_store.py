@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Append-only price history store (SQLite)
+One row per (snapshot, symbol), indexed on (symbol, timestamp)
+
+Usage:
+    python3 history_store.py import [tracker_results_*.json ...]
+    python3 history_store.py range VIRTUAL --days 30
+"""
+
+import argparse
+import glob
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+HISTORY_DB = 'tracker_history.db'
+
+# ========================================
+# OPTIONAL SETTINGS - Load from config file
+# ========================================
+try:
+    from config import HISTORY_BACKEND
+except ImportError:
+    HISTORY_BACKEND = 'sqlite'      # 'sqlite' (tracker_history.db) or 'delta' (tracker_history.dlog)
+
+# Per-project fields written by fetch_all_data, in column order
+RESULT_FIELDS = [
+    'project_name', 'twitter', 'token_symbol', 'tge_date', 'days_since_tge',
+    'tge_price', 'current_price', 'market_cap', 'volume_24h',
+    'percent_change_24h', 'percent_change_7d', 'percent_change_30d',
+    'all_time_roi', 'timestamp', 'quote_source'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL UNIQUE,
+    total_projects INTEGER NOT NULL,
+    data_sources TEXT,
+    failed_symbols TEXT
+);
+CREATE TABLE IF NOT EXISTS quotes (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    project_name TEXT,
+    twitter TEXT,
+    token_symbol TEXT NOT NULL,
+    tge_date TEXT,
+    days_since_tge INTEGER,
+    tge_price REAL,
+    current_price REAL,
+    market_cap REAL,
+    volume_24h REAL,
+    percent_change_24h REAL,
+    percent_change_7d REAL,
+    percent_change_30d REAL,
+    all_time_roi REAL,
+    timestamp TEXT NOT NULL,
+    quote_source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_quotes_symbol_ts ON quotes(token_symbol, timestamp);
+CREATE INDEX IF NOT EXISTS idx_quotes_snapshot ON quotes(snapshot_id);
+"""
+
+# Rows of a snapshot that is still arriving (per connection, see stage_rows)
+STAGED_SCHEMA = f"CREATE TEMP TABLE IF NOT EXISTS staged_quotes (position INTEGER, {', '.join(RESULT_FIELDS)})"
+
+
+class HistoryStore:
+    """Embedded snapshot history backed by a single SQLite file"""
+
+    def __init__(self, path=HISTORY_DB, check_same_thread=True):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self._add_missing_columns()
+
+    def _add_missing_columns(self):
+        """Upgrade databases created before a field was added to RESULT_FIELDS (or snapshots)"""
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(quotes)')}
+        snapshot_columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(snapshots)')}
+        with self.conn:
+            for field in RESULT_FIELDS:
+                if field not in columns:
+                    self.conn.execute(f'ALTER TABLE quotes ADD COLUMN {field} TEXT')
+            if 'failed_symbols' not in snapshot_columns:
+                self.conn.execute('ALTER TABLE snapshots ADD COLUMN failed_symbols TEXT')
+
+    def _insert_snapshot(self, metadata, total_projects):
+        """Insert the snapshots row (inside the caller's transaction); None if the timestamp is already stored"""
+        cursor = self.conn.execute(
+            'INSERT OR IGNORE INTO snapshots (timestamp, total_projects, data_sources, failed_symbols) '
+            'VALUES (?, ?, ?, ?)',
+            (metadata['timestamp'], metadata.get('total_projects', total_projects),
+             json.dumps(metadata.get('data_sources', [])), json.dumps(metadata.get('failed_symbols', [])))
+        )
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def append_snapshot(self, data):
+        """Append one {'metadata', 'projects'} snapshot; returns its id (None if already stored)"""
+        projects = data['projects']
+        with self.conn:
+            snapshot_id = self._insert_snapshot(data['metadata'], len(projects))
+            if snapshot_id is None:
+                return None
+            self.conn.executemany(
+                f"INSERT INTO quotes (snapshot_id, {', '.join(RESULT_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' * len(RESULT_FIELDS))})",
+                [(snapshot_id, *(p.get(field) for field in RESULT_FIELDS)) for p in projects]
+            )
+        return snapshot_id
+
+    def stage_rows(self, rows):
+        """Write [(position, row)] of a snapshot that is still arriving to a temp table (see commit_staged)"""
+        with self.conn:
+            self.conn.execute(STAGED_SCHEMA)
+            self.conn.executemany(
+                f"INSERT INTO staged_quotes (position, {', '.join(RESULT_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' * len(RESULT_FIELDS))})",
+                [(position, *(row.get(field) for field in RESULT_FIELDS)) for position, row in rows]
+            )
+
+    def commit_staged(self, metadata):
+        """Append the staged rows, in position order, as one snapshot; returns its id (None if already stored)"""
+        with self.conn:
+            self.conn.execute(STAGED_SCHEMA)
+            staged = self.conn.execute('SELECT COUNT(*) FROM staged_quotes').fetchone()[0]
+            snapshot_id = self._insert_snapshot(metadata, staged)
+            if snapshot_id is not None:
+                self.conn.execute(
+                    f"INSERT INTO quotes (snapshot_id, {', '.join(RESULT_FIELDS)}) "
+                    f"SELECT ?, {', '.join(RESULT_FIELDS)} FROM staged_quotes ORDER BY position",
+                    (snapshot_id,)
+                )
+            self.conn.execute('DELETE FROM staged_quotes')
+        return snapshot_id
+
+    def _snapshot(self, row):
+        projects = [
+            {field: q[field] for field in RESULT_FIELDS}
+            for q in self.conn.execute('SELECT * FROM quotes WHERE snapshot_id = ? ORDER BY rowid', (row['id'],))
+        ]
+        return {
+            'metadata': {
+                'timestamp': row['timestamp'],
+                'total_projects': row['total_projects'],
+                'data_sources': json.loads(row['data_sources'] or '[]'),
+                'failed_symbols': json.loads(row['failed_symbols'] or '[]')
+            },
+            'projects': projects
+        }
+
+    def iter_snapshots(self, start=None, end=None):
+        """Every snapshot with start <= timestamp <= end (ISO strings), oldest first"""
+        sql = 'SELECT * FROM snapshots'
+        clauses, params = [], []
+        if start:
+            clauses.append('timestamp >= ?')
+            params.append(start)
+        if end:
+            clauses.append('timestamp <= ?')
+            params.append(end)
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        for row in self.conn.execute(sql + ' ORDER BY timestamp', params).fetchall():
+            yield self._snapshot(row)
+
+    def latest_snapshot(self):
+        """Most recent snapshot in tracker_results JSON shape, or None if empty"""
+        row = self.conn.execute('SELECT * FROM snapshots ORDER BY timestamp DESC LIMIT 1').fetchone()
+        return self._snapshot(row) if row else None
+
+    def latest_timestamp(self):
+        """Timestamp of the newest snapshot, or None if empty"""
+        return self.conn.execute('SELECT MAX(timestamp) FROM snapshots').fetchone()[0]
+
+    def snapshot_timestamps(self):
+        """All snapshot timestamps, oldest first"""
+        return [r[0] for r in self.conn.execute('SELECT timestamp FROM snapshots ORDER BY timestamp')]
+
+    def snapshot_index(self):
+        """(id, timestamp) for every snapshot, oldest first"""
+        return self.conn.execute('SELECT id, timestamp FROM snapshots ORDER BY timestamp').fetchall()
+
+    def price_rows(self, since=None):
+        """Cursor over (token_symbol, snapshot_id, current_price, tge_price) for all history,
+        oldest snapshot first (or only snapshots newer than the `since` timestamp)"""
+        sql = ('SELECT q.token_symbol, q.snapshot_id, q.current_price, q.tge_price FROM snapshots s '
+               'JOIN quotes q ON q.snapshot_id = s.id')
+        if since is None:
+            return self.conn.execute(sql + ' ORDER BY s.timestamp')
+        return self.conn.execute(sql + ' WHERE s.timestamp > ? ORDER BY s.timestamp', (since,))
+
+    def query_range(self, symbol, start=None, end=None):
+        """Rows for one symbol with start <= timestamp <= end (ISO strings), oldest first"""
+        sql = f"SELECT {', '.join(RESULT_FIELDS)} FROM quotes WHERE token_symbol = ?"
+        params = [symbol]
+        if start:
+            sql += ' AND timestamp >= ?'
+            params.append(start)
+        if end:
+            sql += ' AND timestamp <= ?'
+            params.append(end)
+        sql += ' ORDER BY timestamp'
+        return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def query_last_days(self, symbol, days):
+        start = (datetime.now() - timedelta(days=days)).isoformat()
+        return self.query_range(symbol, start=start)
+
+    def import_json_snapshots(self, paths):
+        """One-time import of tracker_results_*.json files; returns snapshots added"""
+        added = 0
+        for path in sorted(paths):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"   ⚠️  Skipping {path}: {e}")
+                continue
+            if self.append_snapshot(data) is not None:
+                added += 1
+        return added
+
+    def close(self):
+        self.conn.close()
+
+
+def open_history_store(backend=None, shared=False):
+    """Open the configured history backend (HistoryStore or DeltaLog - same interface)
+
+    shared: the store is handed between threads (used by one at a time).
+    """
+    if (backend or HISTORY_BACKEND) == 'delta':
+        from delta_log import DeltaLog
+        return DeltaLog()
+    return HistoryStore(check_same_thread=not shared)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kaito tracker price history store')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    import_cmd = sub.add_parser('import', help='Import existing tracker_results_*.json snapshots')
+    import_cmd.add_argument('files', nargs='*')
+
+    range_cmd = sub.add_parser('range', help='Print history for one symbol')
+    range_cmd.add_argument('symbol')
+    range_cmd.add_argument('--days', type=int, default=30)
+
+    args = parser.parse_args()
+    store = HistoryStore()
+
+    if args.command == 'import':
+        files = args.files or glob.glob('tracker_results_*.json')
+        added = store.import_json_snapshots(files)
+        print(f"✅ Imported {added} new snapshots from {len(files)} files into {HISTORY_DB}")
+    elif args.command == 'range':
+        rows = store.query_last_days(args.symbol, args.days)
+        for r in rows:
+            print(f"{r['timestamp']}  ${r['current_price']:.6f}  mcap ${r['market_cap'] or 0:,.0f}")
+        print(f"📊 {len(rows)} rows for ${args.symbol} over the last {args.days} days")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Lightweight run instrumentation - stage timers and counters
+Exported as a Prometheus textfile (node_exporter textfile collector) and JSON
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+METRICS_DIR = 'metrics'          # Point the textfile collector at this directory
+METRIC_PREFIX = 'kaito_tracker'
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in key) + '}'
+
+
+def _sorted_series(series):
+    """Series in label order (values compared as text - a label may hold ints and strings)"""
+    return sorted(series.items(), key=lambda item: [(name, str(value)) for name, value in item[0]])
+
+
+class Instrumentation:
+    """Thread-safe registry of timers, counters and gauges for one run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timers = {}     # name -> {labels: [count, total, max]}
+        self.counters = {}   # name -> {labels: value}
+        self.gauges = {}     # name -> {labels: value}
+
+    def observe(self, name, seconds, **labels):
+        with self.lock:
+            stats = self.timers.setdefault(name, {}).setdefault(_label_key(labels), [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time a block: with instrumentation.timer('stage', stage='fetch'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def inc(self, name, value=1, **labels):
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def total(self, name):
+        """Sum of a counter over all its label sets (0 if never incremented)"""
+        with self.lock:
+            return sum(self.counters.get(name, {}).values())
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def to_prometheus(self, job):
+        """Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            for name, series in sorted(self.timers.items()):
+                metric = f"{METRIC_PREFIX}_{name}_seconds"
+                lines.append(f"# TYPE {metric} summary")
+                for key, (count, total, _) in _sorted_series(series):
+                    labels = _format_labels((('job', job),) + key)
+                    lines.append(f"{metric}_count{labels} {count}")
+                    lines.append(f"{metric}_sum{labels} {total:.6f}")
+                lines.append(f"# TYPE {metric}_max gauge")
+                for key, (_, _, peak) in _sorted_series(series):
+                    lines.append(f"{metric}_max{_format_labels((('job', job),) + key)} {peak:.6f}")
+            for name, series in sorted(self.counters.items()):
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in _sorted_series(series):
+                    lines.append(f"{metric}{_format_labels((('job', job),) + key)} {value}")
+            for name, series in sorted(self.gauges.items()):
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} gauge")
+                for key, value in _sorted_series(series):
+                    lines.append(f"{metric}{_format_labels((('job', job),) + key)} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'timers': {
+                    name: [{'labels': dict(key), 'count': c, 'sum': round(t, 6), 'max': round(m, 6)}
+                           for key, (c, t, m) in series.items()]
+                    for name, series in self.timers.items()
+                },
+                'counters': {
+                    name: [{'labels': dict(key), 'value': v} for key, v in series.items()]
+                    for name, series in self.counters.items()
+                },
+                'gauges': {
+                    name: [{'labels': dict(key), 'value': v} for key, v in series.items()]
+                    for name, series in self.gauges.items()
+                }
+            }
+
+    def export(self, job, directory=METRICS_DIR):
+        """Write <directory>/<job>.prom and <job>.json atomically; returns the .prom path"""
+        os.makedirs(directory, exist_ok=True)
+        outputs = {
+            f"{job}.prom": self.to_prometheus(job),
+            f"{job}.json": json.dumps({'job': job, 'exported_at': time.time(), **self.to_dict()}, indent=2)
+        }
+        for filename, content in outputs.items():
+            path = os.path.join(directory, filename)
+            with open(f"{path}.tmp", 'w') as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+        return os.path.join(directory, f"{job}.prom")
+
+
+# Process-wide registry used by the fetcher, CMC client and dashboard
+instrumentation = Instrumentation()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Kaito tracker command line - one entry point for fetch, render, pipeline, serve, replay, backfill and alerts
+
+Only argparse is imported at startup; each subcommand imports the modules it
+needs (requests, numpy, config.py) when it runs, so `render` and `serve` work
+without an API key and `--help` returns immediately.
+
+Usage:
+    python3 kaito_tracker.py fetch [-v | -q]
+    python3 kaito_tracker.py render [--output dashboard.html] [--page-size N] [--currencies USD EUR BTC]
+    python3 kaito_tracker.py pipeline [-v | -q]      # fetch + render in concurrent stages
+    python3 kaito_tracker.py serve [--port 3000]
+    python3 kaito_tracker.py replay [--from 2025-06-01] [--to 2025-07-01]   # re-run stored history
+    python3 kaito_tracker.py backfill [DUMP ...]    # missing TGE prices from OHLCV dumps
+    python3 kaito_tracker.py alerts [check | backtest | test]
+
+Tip: alias kaito-tracker='python3 /path/to/kaito_tracker.py'
+"""
+
+import argparse
+import sys
+
+
+def verbosity(args):
+    return 0 if args.quiet else 2 if args.verbose else 1
+
+
+def cmd_fetch(args):
+    from fetch_all_projects import fetch_all_data
+    snapshot, _ = fetch_all_data(verbosity=verbosity(args))
+    return 0 if snapshot is not None else 1
+
+
+def cmd_render(args):
+    from generate_dashboard import generate_dashboard
+    return 0 if generate_dashboard(output=args.output, page_size=args.page_size,
+                                   currencies=args.currencies) else 1
+
+
+def cmd_pipeline(args):
+    from pipeline import run_pipeline
+    return run_pipeline(output=args.output, page_size=args.page_size, currencies=args.currencies,
+                        verbosity=verbosity(args), sequential=args.sequential)
+
+
+def cmd_serve(args):
+    if args.static:
+        from functools import partial
+        from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+        handler = partial(SimpleHTTPRequestHandler, directory=args.static)
+        httpd = ThreadingHTTPServer((args.host, args.port), handler)
+        print(f"🌐 Serving {args.static} at http://{args.host}:{args.port}/dashboard.html")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Server stopped")
+        finally:
+            httpd.server_close()
+        return 0
+
+    from dashboard_server import serve
+    serve(args.host, args.port, args.poll)
+    return 0
+
+
+def cmd_replay(args):
+    from replay import run_replay
+    return run_replay(args.start, args.end, args.source, args.render_every, args.output_dir)
+
+
+def cmd_backfill(args):
+    from tge_backfill import run_backfill
+    return run_backfill(args.dumps, dry_run=args.dry_run)
+
+
+def cmd_alerts(args):
+    from alerts import run_alerts
+    return run_alerts(args.action, args.start, args.end)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='kaito-tracker', description='Kaito AI agents post-TGE tracker')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_verbosity(cmd):
+        cmd.add_argument('-v', '--verbose', action='store_true', help='Print per-project detail')
+        cmd.add_argument('-q', '--quiet', action='store_true', help='Only print errors')
+
+    def add_render_options(cmd):
+        cmd.add_argument('--output', default='dashboard.html')
+        cmd.add_argument('--page-size', type=int, help='Rows per static page (default: one page)')
+        cmd.add_argument('--currencies', nargs='+', metavar='CUR',
+                         help='Dashboard currencies, e.g. USD EUR BTC ETH (default: DASHBOARD_CURRENCIES)')
+
+    fetch = sub.add_parser('fetch', help='Fetch quotes and append a snapshot to the history')
+    add_verbosity(fetch)
+    fetch.set_defaults(func=cmd_fetch)
+
+    render = sub.add_parser('render', help='Render the dashboard from the latest stored snapshot')
+    add_render_options(render)
+    render.set_defaults(func=cmd_render)
+
+    pipeline = sub.add_parser('pipeline', help='Fetch and render in concurrent stages, batch by batch')
+    add_verbosity(pipeline)
+    add_render_options(pipeline)
+    pipeline.add_argument('--sequential', action='store_true',
+                          help='Fetch everything first, then render (the pre-pipeline behaviour)')
+    pipeline.set_defaults(func=cmd_pipeline)
+
+    serve = sub.add_parser('serve', help='Serve the live dashboard (in-memory, ETag/gzip, push updates)')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=3000)
+    serve.add_argument('--poll', type=float, default=5, help='Seconds between checks for a new snapshot')
+    serve.add_argument('--static', metavar='DIR', help='Just serve the generated files in DIR instead')
+    serve.set_defaults(func=cmd_serve)
+
+    replay = sub.add_parser('replay', help='Re-run the stored history through processing and rendering')
+    replay.add_argument('--from', dest='start', help='First snapshot timestamp (ISO, e.g. 2025-06-01)')
+    replay.add_argument('--to', dest='end', help='Last snapshot timestamp (ISO)')
+    replay.add_argument('--source', choices=['sqlite', 'delta'], help='History backend (default: HISTORY_BACKEND)')
+    replay.add_argument('--render-every', type=int, default=0, metavar='N',
+                        help='Render the dashboard after every N snapshots (default: only after the last)')
+    replay.add_argument('--output-dir', default='replay')
+    replay.set_defaults(func=cmd_replay)
+
+    backfill = sub.add_parser('backfill', help='Fill missing TGE prices from local OHLCV dumps')
+    backfill.add_argument('dumps', nargs='*', help='Dump files or directories (default: OHLCV_DUMP_DIR)')
+    backfill.add_argument('--dry-run', action='store_true', help="Show what would be filled, don't edit")
+    backfill.set_defaults(func=cmd_backfill)
+
+    alerts = sub.add_parser('alerts', help='List alert rules, check the latest snapshot or backtest them')
+    alerts.add_argument('action', nargs='?', choices=['check', 'backtest', 'test'],
+                        help='check: evaluate the latest snapshot, backtest: replay the stored history '
+                             'without saving or sending, test: send a test alert (default: list rules)')
+    alerts.add_argument('--from', dest='start', help='First snapshot timestamp for backtest (ISO)')
+    alerts.add_argument('--to', dest='end', help='Last snapshot timestamp for backtest (ISO)')
+    alerts.set_defaults(func=cmd_alerts)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Staged fetch -> compute -> persist -> render pipeline
+
+Each stage runs in its own thread and hands batches of projects to the next
+through a bounded queue, so rows are processed, written to the history and
+rendered as soon as their quote batch arrives instead of after the whole
+universe has been fetched. The fetch stage only sends a new CMC request when
+a finished batch has been taken off its hands, so a slow stage throttles
+the ones before it and at most PIPELINE_QUEUE_SIZE batches wait between any
+two stages, whatever the universe size. Rendered rows and the result rows
+behind them are spooled to temp files, addressed by registry position, and
+the summary is aggregated as rows go by - nothing per-row is held in memory
+beyond that offset index and one ROI value (for the percentile ranks).
+
+Once the last batch is through, the page is assembled (summary and ROI
+chart, then the spooled rows) and the detail pages are rendered from the
+spool. Only then
+is the snapshot committed (rows in registry order) and the page moved into
+place, so a run that fails anywhere leaves the history untouched. The result
+is the same dashboard.html, history and latest-snapshot file as `fetch`
+followed by `render`.
+
+Only the CMC provider and a single-page, USD-only dashboard are streamed;
+other setups fall back to the sequential fetch + render.
+
+Usage:
+    python3 pipeline.py [-q] [--output dashboard.html] [--sequential]
+    python3 kaito_tracker.py pipeline
+"""
+
+import argparse
+import heapq
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from aggregation import StreamingAggregator, load_categories
+from alerts import check_alerts
+from analytics import PendingSnapshotMetrics, rank_percentiles
+from fetch_all_projects import (
+    CMC_QUOTE_CACHE_TTL, SNAPSHOT_FORMAT, iter_quote_batches, load_tracked_projects,
+    process_projects, snapshot_data, write_latest_snapshot
+)
+from generate_dashboard import (
+    DETAIL_PAGES, PROJECTS_DIR, _render_head, _render_tail, format_timestamp, render_row,
+    render_summary, write_page
+)
+from history_store import open_history_store
+from instrumentation import instrumentation
+from price_providers import PRICE_PROVIDERS
+from quote_cache import QuoteCache
+from sparklines import ROI_CHART_TOKENS, SparklineCache, lttb, render_roi_chart, to_epoch
+from symbol_blocklist import SymbolBlocklist
+
+PIPELINE_QUEUE_SIZE = 4     # Batches buffered between two stages (bounds memory)
+
+DONE = object()             # End-of-stream marker passed down the queues
+
+
+class Spool:
+    """Byte records written in any order to a temp file, read back by position"""
+
+    def __init__(self, size):
+        self.file = tempfile.TemporaryFile()
+        self.offsets = np.full(size, -1, dtype=np.int64)
+        self.lengths = np.zeros(size, dtype=np.int64)
+
+    def __len__(self):
+        return int((self.offsets >= 0).sum())
+
+    def write(self, position, data):
+        self.file.seek(0, os.SEEK_END)
+        self.offsets[position] = self.file.tell()
+        self.lengths[position] = len(data)
+        self.file.write(data)
+
+    def read(self, position):
+        self.file.seek(int(self.offsets[position]))
+        return self.file.read(int(self.lengths[position]))
+
+    def positions(self):
+        """Written positions, ascending (registry order)"""
+        return (int(position) for position in np.flatnonzero(self.offsets >= 0))
+
+    def close(self):
+        self.file.close()
+
+
+class SpooledRows:
+    """Re-iterable, sized view of the spooled result rows in registry order"""
+
+    def __init__(self, spool):
+        self.spool = spool
+
+    def __len__(self):
+        return len(self.spool)
+
+    def __iter__(self):
+        for position in self.spool.positions():
+            yield json.loads(self.spool.read(position))['row']
+
+
+class SpooledMetrics:
+    """symbol -> metrics lookups against the spool, with this run's ROI percentiles filled in"""
+
+    def __init__(self, spool, position, percentiles):
+        self.spool = spool
+        self.position = position
+        self.percentiles = percentiles
+
+    def get(self, symbol, default=None):
+        position = self.position.get(symbol)
+        if position is None or self.spool.offsets[position] < 0:
+            return default
+        metrics = json.loads(self.spool.read(position))['metrics']
+        if metrics is None:
+            return default
+        percentile = self.percentiles[position]
+        metrics['roi_percentile'] = None if np.isnan(percentile) else float(percentile)
+        return metrics
+
+
+class Stage(threading.Thread):
+    """One pipeline stage: func(item) for every item in `inbox`, results to `outbox`
+
+    After an error the stage keeps draining its inbox, so upstream stages
+    never block on a full queue; `error` holds the first exception. `finish`
+    runs once the inbox is drained, error or not.
+    """
+
+    def __init__(self, name, func, inbox, outbox=None, setup=None, finish=None):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self.stage = name
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.setup = setup
+        self.finish = finish
+        self.error = None
+        self.items = 0
+        self.busy = 0.0         # Seconds spent working
+        self.blocked = 0.0      # Seconds spent waiting for room downstream (backpressure)
+
+    def _call(self, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception as e:
+            self.error = self.error or e
+        finally:
+            self.busy += time.perf_counter() - started
+
+    def run(self):
+        if self.setup:
+            self._call(self.setup)
+        while True:
+            item = self.inbox.get()
+            if item is DONE:
+                break
+            if self.error:
+                continue
+            result = self._call(self.func, item)
+            self.items += 1
+            if self.outbox is not None and not self.error:
+                started = time.perf_counter()
+                self.outbox.put(result)
+                self.blocked += time.perf_counter() - started
+        if self.finish:
+            self._call(self.finish)
+        if self.outbox is not None:
+            self.outbox.put(DONE)
+
+
+class StagedPipeline:
+    """One run: quotes for `projects` through every stage into dashboard `output`"""
+
+    def __init__(self, projects, output='dashboard.html', run_time=None, queue_size=PIPELINE_QUEUE_SIZE,
+                 snapshot_format=SNAPSHOT_FORMAT, detail_pages=DETAIL_PAGES):
+        self.projects = projects
+        self.output = output
+        self.run_time = run_time or datetime.now()
+        self.timestamp = self.run_time.isoformat()
+        self.queue_size = queue_size
+        self.snapshot_format = snapshot_format
+        self.detail_pages = detail_pages
+        self.position = {p['token_symbol']: i for i, p in enumerate(projects)}
+        self.by_key = {}
+        for p in projects:
+            key = ('id', str(p['cmc_id'])) if p.get('cmc_id') else ('symbol', p['token_symbol'])
+            self.by_key.setdefault(key, []).append(p)
+
+        self.snapshot = None
+        self.store = None
+        self.pages = Spool(len(projects))       # rendered rows
+        self.results = Spool(len(projects))     # result rows + metrics (JSON)
+        self.roi = np.full(len(projects), np.nan)
+        self.summary = StreamingAggregator(load_categories())
+        self.charted = []       # min-heap of the best chartable (all_time_roi, -position, row)
+        self.page = f"{output}.tmp"
+        self.stages = []
+
+    # ========================================
+    # STAGES
+    # ========================================
+    def fetch(self, stage, outbox, cache, blocklist):
+        """Put (projects, quotes payload) on `outbox` as each CMC batch arrives"""
+        for by in ('id', 'symbol'):
+            keys = [key for kind, key in self.by_key if kind == by]
+            if not keys:
+                continue
+            for payload in iter_quote_batches(keys, cache=cache, by=by, blocklist=blocklist):
+                batch = [p for key in payload['data'] for p in self.by_key.get((by, key), [])]
+                if batch:
+                    started = time.perf_counter()
+                    outbox.put((batch, payload))
+                    stage.blocked += time.perf_counter() - started
+                    stage.items += 1
+                if any(stage.error for stage in self.stages):
+                    return      # No point fetching what a failed stage will discard
+
+    def compute_setup(self):
+        store = open_history_store()
+        self.pending_metrics = PendingSnapshotMetrics(store, self.timestamp)
+        store.close()
+
+    def compute(self, item):
+        """Result rows and their history metrics for one batch"""
+        batch, payload = item
+        rows = process_projects(batch, payload, verbose=False, now=self.run_time)
+        return rows, self.pending_metrics.for_rows(rows) if rows else {}
+
+    def persist_setup(self):
+        self.store = open_history_store(shared=True)     # Committed from the main thread (see commit)
+
+    def persist(self, item):
+        """Stage the batch's rows; they stay staged until commit()"""
+        rows, _ = item
+        self.store.stage_rows([(self.position[row['token_symbol']], row) for row in rows])
+        return item
+
+    def render_setup(self):
+        store = open_history_store()
+        self.sparklines = SparklineCache()
+        self.sparklines.update(store)
+        store.close()
+        self.epoch = to_epoch(self.timestamp)
+
+    def render(self, item):
+        """Render each row (with its sparkline as of this run) to the spool and fold it into the summary"""
+        rows, metrics = item
+        for row in rows:
+            symbol = row['token_symbol']
+            position = self.position[symbol]
+            row_metrics = metrics.get(symbol)
+            points = list(self.sparklines.series.get(symbol, []))
+            if row.get('current_price') is not None:
+                points.append((self.epoch, float(row['current_price'])))
+            self.pages.write(position, render_row(row, row_metrics, lttb(points, self.sparklines.points)).encode())
+            self.results.write(position, json.dumps({'row': row, 'metrics': row_metrics}).encode())
+
+            self.summary.add(row, row_metrics, seq=position)
+            if (row_metrics or {}).get('roi_since_tge') is not None:
+                self.roi[position] = row_metrics['roi_since_tge']
+            self.sparklines.extend(self.timestamp, [row])
+            self.chart_candidate(position, row)
+
+    def chart_candidate(self, position, row):
+        """Keep the ROI_CHART_TOKENS best rows render_roi_chart would pick (ties: registry order)"""
+        if not row.get('tge_price') or row.get('all_time_roi') is None:
+            return
+        if sum(1 for _, price in self.sparklines.series.get(row['token_symbol'], ()) if price > 0) < 2:
+            return
+        item = (row['all_time_roi'], -position, row)
+        if len(self.charted) < ROI_CHART_TOKENS:
+            heapq.heappush(self.charted, item)
+        elif item[:2] > self.charted[0][:2]:
+            heapq.heapreplace(self.charted, item)
+
+    # ========================================
+    # RUN
+    # ========================================
+    def run(self, cache=None, blocklist=None):
+        """Run every stage to completion; returns the stages (for timings)"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(3)]
+        fetch_stage = Stage('fetch', None, None)
+        stages = [
+            Stage('compute', self.compute, queues[0], queues[1], setup=self.compute_setup),
+            Stage('persist', self.persist, queues[1], queues[2], setup=self.persist_setup),
+            Stage('render', self.render, queues[2], setup=self.render_setup)
+        ]
+        self.stages = [fetch_stage] + stages
+        for stage in stages:
+            stage.start()
+
+        started = time.perf_counter()
+        try:
+            self.fetch(fetch_stage, queues[0], cache, blocklist)
+        except Exception as e:
+            fetch_stage.error = e
+        finally:
+            fetch_stage.busy = time.perf_counter() - started
+            queues[0].put(DONE)
+        for stage in stages:
+            stage.join()
+
+        if self.store is not None and not any(stage.error for stage in self.stages) and len(self.results):
+            quoted = self.results.offsets >= 0
+            failed = [p['token_symbol'] for p in self.projects if not quoted[self.position[p['token_symbol']]]]
+            self.snapshot = snapshot_data(SpooledRows(self.results), self.run_time, failed)
+        return self.stages
+
+    def rows_in_order(self):
+        """Spooled rows in registry order"""
+        for position in self.pages.positions():
+            yield self.pages.read(position).decode()
+
+    def write_dashboard(self):
+        """Summary, ROI chart and the spooled rows -> a temp copy of `output` (+ detail pages)"""
+        charted = [row for _, _, row in sorted(self.charted, key=lambda item: -item[1])]
+        metadata = self.snapshot['metadata']
+        head_html = _render_head(
+            currency_nav='',
+            summary_html=render_summary(self.summary, metadata.get('failed_symbols'),
+                                        render_roi_chart(charted, self.sparklines))
+        )
+        tail_html = _render_tail(pager='', timestamp_str=format_timestamp(metadata))
+        with open(self.page, 'w') as f:
+            write_page(f, head_html, self.rows_in_order(), tail_html)
+
+        if self.detail_pages:
+            from project_pages import render_project_pages
+            # Percentiles rank this run's tokens against each other, so they wait for every row
+            metrics = SpooledMetrics(self.results, self.position, rank_percentiles(self.roi))
+            with instrumentation.timer('stage', stage='detail_pages'):
+                render_project_pages(self.snapshot['projects'], metrics, self.sparklines, self.summary.categories,
+                                     output_dir=os.path.join(os.path.dirname(self.output), PROJECTS_DIR))
+
+    def commit(self):
+        """Append the staged snapshot to the history, then publish the page and latest-snapshot file"""
+        self.store.commit_staged(self.snapshot['metadata'])
+        write_latest_snapshot(self.snapshot, self.snapshot_format)
+        os.replace(self.page, self.output)
+        self.sparklines.save()
+
+    def close(self):
+        """Release the store (dropping rows that were never committed), the spools and any unpublished page"""
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        self.pages.close()
+        self.results.close()
+        if os.path.exists(self.page):
+            os.remove(self.page)
+
+
+def can_stream(page_size=None, currencies=None):
+    """Whether the staged pipeline covers this setup (CMC quotes, one USD page)"""
+    from fx_rates import DASHBOARD_CURRENCIES
+    return not page_size and (currencies or DASHBOARD_CURRENCIES) == ['USD'] and PRICE_PROVIDERS == ['cmc']
+
+
+def run_pipeline(output='dashboard.html', page_size=None, currencies=None, verbosity=1, sequential=False):
+    """Fetch and render through the staged pipeline; returns an exit code
+
+    Falls back to fetch_all_data + generate_dashboard when asked (`sequential`)
+    or for setups the staged pipeline doesn't stream (other providers, paging,
+    extra currencies).
+    """
+    if sequential or not can_stream(page_size, currencies):
+        from fetch_all_projects import fetch_all_data
+        from generate_dashboard import generate_dashboard
+        snapshot, metrics = fetch_all_data(verbosity=verbosity)
+        if snapshot is None:
+            return 1
+        return 0 if generate_dashboard(output=output, page_size=page_size, data=snapshot, metrics=metrics,
+                                       currencies=currencies) else 1
+
+    say = print if verbosity >= 1 else (lambda *args, **kwargs: None)
+    started = time.perf_counter()
+    success = False
+    try:
+        projects = load_tracked_projects(say)
+        if projects is None:
+            return 1
+        say("💰 Fetching, processing, storing and rendering in parallel stages...")
+        cache = QuoteCache(ttl=CMC_QUOTE_CACHE_TTL)
+        pipeline = StagedPipeline(projects, output)
+        try:
+            stages = pipeline.run(cache, SymbolBlocklist())
+            instrumentation.inc('quote_cache', cache.hits, result='hit')
+            instrumentation.inc('quote_cache', cache.misses, result='miss')
+            for stage in stages:
+                instrumentation.observe('stage', stage.busy, stage=f'pipeline_{stage.stage}')
+                instrumentation.observe('pipeline_backpressure', stage.blocked, stage=stage.stage)
+
+            failed = [stage for stage in stages if stage.error]
+            for stage in failed:
+                print(f"❌ Pipeline {stage.stage} stage failed: {stage.error}")
+            if failed:
+                return 1
+            if pipeline.snapshot is None:
+                print("❌ No quotes returned for any project")
+                return 1
+
+            page_started = time.perf_counter()
+            with instrumentation.timer('stage', stage='pipeline_page'):
+                pipeline.write_dashboard()
+            page_seconds = time.perf_counter() - page_started
+            pipeline.commit()      # Only now - a failed render leaves the history as it was
+            check_alerts(pipeline.snapshot, say=say)
+            success = True
+        finally:
+            pipeline.close()
+
+        elapsed = time.perf_counter() - started
+        failed_symbols = pipeline.snapshot['metadata']['failed_symbols']
+        if failed_symbols:
+            print(f"⚠️  No quote for {len(failed_symbols)}/{len(projects)} projects: "
+                  f"{', '.join('$' + s for s in failed_symbols)}")
+        say(f"✅ {len(pipeline.snapshot['projects'])} projects fetched, stored and rendered in {elapsed:.2f}s")
+        for stage in stages:
+            say(f"   {stage.stage:<8} busy {stage.busy:7.2f}s, waited on downstream {stage.blocked:6.2f}s "
+                f"({stage.items} batches)")
+        say(f"   page     busy {page_seconds:7.2f}s (summary, rows in order, detail pages)")
+        say(f"📁 Dashboard: {output}")
+        return 0
+    finally:
+        instrumentation.set('last_run_timestamp_seconds', round(datetime.now().timestamp()))
+        instrumentation.set('last_run_success', int(success))
+        instrumentation.set('last_run_duration_seconds', round(time.perf_counter() - started, 3))
+        instrumentation.export('pipeline')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch and render through concurrent stages')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Only print errors')
+    parser.add_argument('--output', default='dashboard.html')
+    parser.add_argument('--sequential', action='store_true', help='Fetch everything first, then render')
+    args = parser.parse_args()
+    raise SystemExit(run_pipeline(args.output, verbosity=0 if args.quiet else 1, sequential=args.sequential))
+
+
+if __name__ == "__main__":
+    main()
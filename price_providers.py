@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Pluggable quote providers with hedged requests and per-field merge
+
+Every provider returns quotes normalized to {token_symbol: {field: value}}
+using the CMC quote field names (QUOTE_KEYS). HedgedQuotes asks the provider
+with the best latency record first, fires the next one if no answer arrived
+within HEDGE_AFTER seconds (or the first one failed), and merges the answers
+per field. The first complete answer wins; gaps are filled from the others.
+Each asset records which provider supplied its fields ('source'). Quotes
+without a price are dropped before the merge.
+
+fetch(projects, abandoned) gets a threading.Event that is set once the
+hedge settled without it; a provider still running then must not touch
+shared state (the CMC provider keeps its quote cache writes to itself and
+discards them).
+
+Providers:
+    cmc          CoinMarketCap (fetch_quotes_for_projects, shares the quote cache)
+    coingecko    CoinGecko /coins/markets (by coingecko_id, else by symbol)
+    file:<path>  A saved tracker snapshot (.json or .kcs) - offline runs and replays
+    StubProvider Fixed quotes with configurable latency/failure, for local tests
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import requests
+
+from cmc_client import CONNECT_TIMEOUT, READ_TIMEOUT
+from instrumentation import instrumentation
+
+# ========================================
+# OPTIONAL SETTINGS - Load from config file
+# ========================================
+try:
+    from config import PRICE_PROVIDERS
+except ImportError:
+    PRICE_PROVIDERS = ['cmc']       # In order of preference, e.g. ['cmc', 'coingecko']
+
+try:
+    from config import HEDGE_AFTER
+except ImportError:
+    HEDGE_AFTER = 2.0               # Seconds before a backup provider is asked as well
+
+try:
+    from config import COINGECKO_API_KEY
+except ImportError:
+    COINGECKO_API_KEY = None
+
+COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
+COINGECKO_PAGE_SIZE = 250
+PROVIDER_STATS_FILE = 'provider_stats.json'
+STATS_ALPHA = 0.3                   # Weight of the newest sample in the latency/failure averages
+
+QUOTE_KEYS = ['price', 'market_cap', 'volume_24h',
+              'percent_change_24h', 'percent_change_7d', 'percent_change_30d']
+
+
+class CMCProvider:
+    """CoinMarketCap quotes (by CMC id where resolved, by ticker otherwise)"""
+
+    name = 'cmc'
+
+    def __init__(self, client=None, cache=None, blocklist=None):
+        self.client = client
+        self.cache = cache
+        self.blocklist = blocklist
+
+    def fetch(self, projects, abandoned=None):
+        from fetch_all_projects import fetch_quotes_for_projects, find_quote
+        cache = StagedCache(self.cache) if self.cache is not None else None
+        cmc_data = fetch_quotes_for_projects(projects, client=self.client, cache=cache,
+                                             blocklist=self.blocklist)
+        if cache is not None:
+            cache.commit(abandoned)
+        if not cmc_data:
+            return None
+        quotes = {}
+        for project in projects:
+            asset = find_quote(project, cmc_data)
+            if asset:
+                usd = asset['quote']['USD']
+                quotes[project['token_symbol']] = {key: usd.get(key) for key in QUOTE_KEYS}
+        return quotes
+
+
+class StagedCache:
+    """QuoteCache front that holds writes back until commit()
+
+    Reads go to the shared cache; updates stay here so a provider that lost
+    the hedge can drop them instead of writing the cache behind the winner.
+    """
+
+    lock = threading.Lock()
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.entries = {}
+
+    def split(self, symbols, now=None):
+        with self.lock:
+            return self.cache.split(symbols, now)
+
+    def update(self, data, now=None):
+        now = now if now is not None else time.time()
+        for symbol, value in data.items():
+            self.entries[symbol] = {'fetched_at': now, 'data': value}
+
+    def save(self):
+        pass                # commit() saves once, if the answer was still wanted
+
+    def commit(self, abandoned=None):
+        with self.lock:
+            if not self.entries or (abandoned is not None and abandoned.is_set()):
+                return False
+            self.cache.entries.update(self.entries)
+            self.cache.save()
+            return True
+
+
+class CoinGeckoProvider:
+    """CoinGecko market data (by the project's coingecko_id, else by symbol)"""
+
+    name = 'coingecko'
+
+    def __init__(self, api_key=COINGECKO_API_KEY, base_url=COINGECKO_BASE_URL):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+        self.session.headers['Accept'] = 'application/json'
+        if api_key:
+            self.session.headers['x-cg-demo-api-key'] = api_key
+
+    def _markets(self, params):
+        response = self.session.get(
+            f"{self.base_url}/coins/markets",
+            params={'vs_currency': 'usd', 'price_change_percentage': '24h,7d,30d',
+                    'per_page': COINGECKO_PAGE_SIZE, **params},
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _normalize(coin):
+        return {
+            'price': coin.get('current_price'),
+            'market_cap': coin.get('market_cap'),
+            'volume_24h': coin.get('total_volume'),
+            'percent_change_24h': coin.get('price_change_percentage_24h_in_currency'),
+            'percent_change_7d': coin.get('price_change_percentage_7d_in_currency'),
+            'percent_change_30d': coin.get('price_change_percentage_30d_in_currency')
+        }
+
+    def fetch(self, projects, abandoned=None):
+        by_id = {p['coingecko_id']: p['token_symbol'] for p in projects if p.get('coingecko_id')}
+        by_symbol = {p['token_symbol'].lower(): p['token_symbol'] for p in projects if not p.get('coingecko_id')}
+        quotes = {}
+        ids = list(by_id)
+        for i in range(0, len(ids), COINGECKO_PAGE_SIZE):
+            for coin in self._markets({'ids': ','.join(ids[i:i + COINGECKO_PAGE_SIZE])}):
+                if coin['id'] in by_id:
+                    quotes[by_id[coin['id']]] = self._normalize(coin)
+        symbols = list(by_symbol)
+        for i in range(0, len(symbols), COINGECKO_PAGE_SIZE):
+            # Sorted by market cap, so the first coin per ticker is the one we want
+            for coin in self._markets({'symbols': ','.join(symbols[i:i + COINGECKO_PAGE_SIZE])}):
+                symbol = by_symbol.get(coin['symbol'].lower())
+                if symbol and symbol not in quotes:
+                    quotes[symbol] = self._normalize(coin)
+        return quotes
+
+
+class FileProvider:
+    """Quotes from a saved tracker snapshot (tracker_results JSON or .kcs)"""
+
+    name = 'file'
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self, projects, abandoned=None):
+        if self.path.endswith('.kcs'):
+            from columnar_snapshot import ColumnarSnapshot
+            snapshot = ColumnarSnapshot(self.path)
+            rows = snapshot.to_dict()['projects']
+            snapshot.close()
+        else:
+            with open(self.path, 'r') as f:
+                rows = json.load(f)['projects']
+        wanted = {p['token_symbol'] for p in projects}
+        return {
+            r['token_symbol']: {
+                key: r.get('current_price' if key == 'price' else key) for key in QUOTE_KEYS
+            }
+            for r in rows if r['token_symbol'] in wanted
+        }
+
+
+class StubProvider:
+    """Fixed quotes after `latency` seconds (or raise `error`) - for local tests"""
+
+    def __init__(self, name, quotes, latency=0.0, error=None):
+        self.name = name
+        self.quotes = quotes
+        self.latency = latency
+        self.error = error
+
+    def fetch(self, projects, abandoned=None):
+        time.sleep(self.latency)
+        if self.error:
+            raise self.error
+        wanted = {p['token_symbol'] for p in projects}
+        return {s: dict(q) for s, q in self.quotes.items() if s in wanted}
+
+
+def build_providers(names=None, client=None, cache=None, blocklist=None):
+    """Provider instances from names like ['cmc', 'coingecko', 'file:tracker_results_latest.json']"""
+    providers = []
+    for name in names or PRICE_PROVIDERS:
+        if name == 'cmc':
+            providers.append(CMCProvider(client=client, cache=cache, blocklist=blocklist))
+        elif name == 'coingecko':
+            providers.append(CoinGeckoProvider())
+        elif name.startswith('file:'):
+            providers.append(FileProvider(name.split(':', 1)[1]))
+        else:
+            raise ValueError(f"Unknown price provider: {name}")
+    return providers
+
+
+class ProviderStats:
+    """Moving averages of latency and failure rate per provider (persisted)"""
+
+    def __init__(self, path=PROVIDER_STATS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.stats = {}
+        if path:
+            try:
+                with open(path, 'r') as f:
+                    self.stats = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.stats = {}
+
+    def record(self, name, seconds, ok):
+        with self.lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                self.stats[name] = {'latency': seconds, 'failure_rate': 0.0 if ok else 1.0, 'calls': 1}
+                return
+            entry['latency'] += STATS_ALPHA * (seconds - entry['latency'])
+            entry['failure_rate'] += STATS_ALPHA * ((0.0 if ok else 1.0) - entry['failure_rate'])
+            entry['calls'] += 1
+
+    def record_abandoned(self, name, seconds):
+        """A request still running when the hedge settled: `seconds` is a lower
+        bound on its latency, and it neither failed nor succeeded"""
+        with self.lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                self.stats[name] = {'latency': seconds, 'failure_rate': 0.0, 'calls': 0}
+            elif seconds > entry['latency']:
+                entry['latency'] += STATS_ALPHA * (seconds - entry['latency'])
+
+    def score(self, name, default):
+        """Expected seconds to a usable answer (lower is better)"""
+        entry = self.stats.get(name)
+        if entry is None:
+            return default
+        return entry['latency'] / max(0.05, 1.0 - entry['failure_rate'])
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            content = json.dumps(self.stats, indent=2)
+        with open(f"{self.path}.tmp", 'w') as f:
+            f.write(content)
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+class HedgedQuotes:
+    """Ask providers in order of past performance, hedging slow or failed ones"""
+
+    def __init__(self, providers, hedge_after=HEDGE_AFTER, stats=None):
+        self.providers = providers
+        self.hedge_after = hedge_after
+        self.stats = stats if stats is not None else ProviderStats()
+
+    def ranked(self):
+        """Providers ordered by score; untried ones count as hedge_after (config order breaks ties)"""
+        order = {p.name: i for i, p in enumerate(self.providers)}
+        return sorted(self.providers, key=lambda p: (self.stats.score(p.name, self.hedge_after), order[p.name]))
+
+    def _timed_fetch(self, provider, projects, abandoned):
+        start = time.perf_counter()
+        try:
+            quotes = provider.fetch(projects, abandoned)
+        except Exception as e:
+            print(f"⚠️  {provider.name} quotes failed: {e}")
+            quotes = None
+        return quotes, time.perf_counter() - start
+
+    def _collect(self, done, pending, answers):
+        for future in done:
+            provider = pending.pop(future)
+            quotes, seconds = future.result()
+            self.stats.record(provider.name, seconds, quotes is not None)
+            instrumentation.observe('provider_request', seconds, provider=provider.name)
+            if quotes is not None:
+                answers[provider.name] = quotes
+
+    def fetch(self, projects):
+        """Merged quotes and per-field provenance: ({symbol: {field: value}}, {symbol: {field: provider}})"""
+        ranked = self.ranked()
+        answers = {}            # provider name -> quotes, in the order they arrived
+        pending = {}            # future -> provider
+        launched = {}           # provider name -> perf_counter at launch
+        abandoned = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=len(ranked))
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            provider = ranked[next_index]
+            next_index += 1
+            launched[provider.name] = time.perf_counter()
+            pending[pool.submit(self._timed_fetch, provider, projects, abandoned)] = provider
+
+        launch()
+        hedge_at = time.perf_counter() + self.hedge_after
+        while pending and not answers:
+            more = next_index < len(ranked)
+            timeout = max(0.0, hedge_at - time.perf_counter()) if more else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                launch()        # Latency threshold passed - hedge with the next provider
+                instrumentation.inc('provider_hedges')
+                hedge_at = time.perf_counter() + self.hedge_after
+                continue
+            self._collect(done, pending, answers)
+            if not answers and next_index < len(ranked):
+                launch()        # Failed outright - no point waiting for the threshold
+                hedge_at = time.perf_counter() + self.hedge_after
+
+        # Incomplete answer: give the backups (launched now if need be) one more window to fill gaps
+        wanted = {p['token_symbol'] for p in projects}
+        if answers and not self._complete(answers, wanted):
+            if not pending and next_index < len(ranked):
+                launch()
+            if pending:
+                done, _ = wait(pending, timeout=self.hedge_after)
+                self._collect(done, pending, answers)
+        # Losers still running are ignored: their results (and cache writes) are discarded
+        abandoned.set()
+        for provider in pending.values():
+            self.stats.record_abandoned(provider.name, time.perf_counter() - launched[provider.name])
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.stats.save()
+
+        if answers:
+            instrumentation.inc('provider_wins', provider=next(iter(answers)))
+        return self.merge(answers)
+
+    @staticmethod
+    def _complete(answers, wanted):
+        for symbol in wanted:
+            if not any(symbol in quotes and None not in quotes[symbol].values() for quotes in answers.values()):
+                return False
+        return True
+
+    @staticmethod
+    def merge(answers):
+        """Per-field merge: the first answer wins, later ones fill missing symbols and fields
+
+        Quotes without a price are dropped first; a symbol no provider priced is left out.
+        """
+        merged, provenance = {}, {}
+        for name, quotes in answers.items():
+            for symbol, quote in quotes.items():
+                if quote.get('price') is None:
+                    continue
+                target = merged.setdefault(symbol, {})
+                sources = provenance.setdefault(symbol, {})
+                for key in QUOTE_KEYS:
+                    if target.get(key) is None and quote.get(key) is not None:
+                        target[key] = quote[key]
+                        sources[key] = name
+        return merged, provenance
+
+    def fetch_response(self, projects):
+        """Merged quotes in CMC quotes/latest shape, so process_projects can use them unchanged"""
+        merged, provenance = self.fetch(projects)
+        if not merged:
+            return None
+        return {'data': {
+            symbol: [{
+                'symbol': symbol,
+                'quote': {'USD': {key: quote.get(key) for key in QUOTE_KEYS}},
+                'source': format_provenance(provenance[symbol])
+            }]
+            for symbol, quote in merged.items()
+        }}
+
+
+def format_provenance(sources):
+    """'cmc' if one provider supplied every field, else 'cmc;market_cap=coingecko'"""
+    if not sources:
+        return None
+    counts = {}
+    for name in sources.values():
+        counts[name] = counts.get(name, 0) + 1
+    primary = max(counts, key=counts.get)
+    overrides = [f"{key}={name}" for key, name in sources.items() if name != primary]
+    return ';'.join([primary] + overrides)
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Static per-project detail pages (projects/<SYMBOL>.html)
+
+Each page's display values are fingerprinted (sha256, together with the
+template) and recorded in projects/manifest.json. Only pages whose
+fingerprint changed are rendered, spread across a process pool, so a
+re-render - and the Vercel upload after it - scales with the number of
+changed projects rather than the size of the universe.
+
+Usage:
+    python3 project_pages.py           # render changed pages from the latest snapshot
+    python3 project_pages.py --force   # re-render every page
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from generate_dashboard import PROJECTS_DIR, detail_page_name, format_change, format_mcap, format_price
+from history_store import RESULT_FIELDS
+from sparklines import render_sparkline
+
+MANIFEST_FILE = 'manifest.json'
+PARALLEL_THRESHOLD = 200    # Changed pages below this are rendered in-process (pool startup isn't worth it)
+PAGES_PER_TASK = 100        # Pages handed to a worker at a time
+CHART_WIDTH = 900
+CHART_HEIGHT = 220
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{project_name} (${token_symbol}) - Kaito AI Agents Tracker</title>
+    <style>
+        body {{
+            font-family: 'Space Grotesk', -apple-system, BlinkMacSystemFont, sans-serif;
+            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
+            color: white;
+            margin: 0;
+            padding: 40px 20px;
+            min-height: 100vh;
+        }}
+        .container {{ max-width: 960px; margin: 0 auto; }}
+        a {{ color: #60a5fa; }}
+        h1 {{ margin: 10px 0 5px; }}
+        .subtitle {{ color: #9ca3af; margin-bottom: 30px; }}
+        .card {{
+            background: rgba(255, 255, 255, 0.05);
+            border: 1px solid rgba(59, 130, 246, 0.2);
+            border-radius: 20px;
+            padding: 25px 30px;
+            margin-bottom: 25px;
+        }}
+        .card h2 {{ color: #60a5fa; font-size: 1.1em; margin-top: 0; }}
+        .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; }}
+        .label {{ color: rgba(255, 255, 255, 0.6); font-size: 0.8em; text-transform: uppercase; letter-spacing: 1px; }}
+        .value {{ font-size: 1.3em; font-weight: 700; }}
+        .moon {{ color: #10b981; }}
+        .rekt {{ color: #ef4444; }}
+        .chart svg {{ width: 100%; height: auto; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <a href="../dashboard.html">&larr; All projects</a>
+        <h1>{project_name} <small>${token_symbol}</small></h1>
+        <div class="subtitle"><a href="https://x.com/{twitter_handle}">{twitter}</a> &middot; {category}</div>
+
+        <div class="card">
+            <h2>TGE</h2>
+            <div class="grid">
+                <div><div class="label">TGE Date</div><div class="value">{tge_date}</div></div>
+                <div><div class="label">TGE Price</div><div class="value">{tge_price_str}</div></div>
+                <div><div class="label">Days Since TGE</div><div class="value">{days_str}</div></div>
+                <div><div class="label">All-Time ROI</div><div class="value {roi_class}">{roi_str}</div></div>
+            </div>
+        </div>
+
+        <div class="card">
+            <h2>Market</h2>
+            <div class="grid">
+                <div><div class="label">Price</div><div class="value">{price_str}</div></div>
+                <div><div class="label">Market Cap</div><div class="value">{mcap_str}</div></div>
+                <div><div class="label">24h Volume</div><div class="value">{volume_str}</div></div>
+                <div><div class="label">24h</div><div class="value {change_24h_class}">{change_24h_str}</div></div>
+                <div><div class="label">7d</div><div class="value {change_7d_class}">{change_7d_str}</div></div>
+                <div><div class="label">30d</div><div class="value {change_30d_class}">{change_30d_str}</div></div>
+            </div>
+        </div>
+
+        <div class="card">
+            <h2>History Metrics</h2>
+            <div class="grid">
+                <div><div class="label">Max Drawdown</div><div class="value {drawdown_class}">{drawdown_str}</div></div>
+                <div><div class="label">7d Volatility</div><div class="value">{volatility_7d_str}</div></div>
+                <div><div class="label">30d Volatility</div><div class="value">{volatility_30d_str}</div></div>
+                <div><div class="label">30d Sharpe</div><div class="value">{sharpe_str}</div></div>
+                <div><div class="label">ROI Percentile</div><div class="value">{percentile_str}</div></div>
+            </div>
+        </div>
+
+        <div class="card chart">
+            <h2>Price History</h2>
+            {chart_html}
+            <div class="label">{history_range}</div>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+TEMPLATE_HASH = hashlib.sha256(PAGE_TEMPLATE.encode()).hexdigest()[:16]
+
+
+def price_steps(series):
+    """Series with repeated prices collapsed, so re-polling an unchanged price doesn't change the page"""
+    steps = []
+    for t, price in series or ():
+        if not steps or price != steps[-1][1]:
+            steps.append((t, price))
+    return steps
+
+
+def format_number(value, fmt, suffix=''):
+    return f"{value:{fmt}}{suffix}" if value is not None else 'N/A'
+
+
+def page_inputs(p, metrics=None, series=None, category=None):
+    """Everything one page displays, as already-formatted values (this is what gets fingerprinted)"""
+    metrics = metrics or {}
+    roi_str, roi_class = format_change(p.get('all_time_roi'))
+    change_24h_str, change_24h_class = format_change(p.get('percent_change_24h'))
+    change_7d_str, change_7d_class = format_change(p.get('percent_change_7d'))
+    change_30d_str, change_30d_class = format_change(p.get('percent_change_30d'))
+    drawdown_str, drawdown_class = format_change(metrics.get('max_drawdown'))
+    twitter = p.get('twitter') or ''
+    return {
+        'project_name': p['project_name'],
+        'token_symbol': p['token_symbol'],
+        'twitter': twitter,
+        'twitter_handle': twitter.lstrip('@'),
+        'category': category or 'Uncategorized',
+        'tge_date': p.get('tge_date') or 'N/A',
+        'tge_price_str': format_price(p['tge_price']) if p.get('tge_price') else 'N/A',
+        'days_str': f"{p['days_since_tge']} days" if p.get('days_since_tge') else 'N/A',
+        'roi_str': roi_str, 'roi_class': roi_class,
+        'price_str': format_price(p.get('current_price') or 0),
+        'mcap_str': format_mcap(p.get('market_cap') or 0),
+        'volume_str': format_mcap(p.get('volume_24h') or 0),
+        'change_24h_str': change_24h_str, 'change_24h_class': change_24h_class,
+        'change_7d_str': change_7d_str, 'change_7d_class': change_7d_class,
+        'change_30d_str': change_30d_str, 'change_30d_class': change_30d_class,
+        'drawdown_str': drawdown_str, 'drawdown_class': drawdown_class,
+        'volatility_7d_str': format_number(metrics.get('volatility_7d'), '.1f', '%'),
+        'volatility_30d_str': format_number(metrics.get('volatility_30d'), '.1f', '%'),
+        'sharpe_str': format_number(metrics.get('sharpe_30d'), '.2f'),
+        'percentile_str': format_number(metrics.get('roi_percentile'), '.0f', '%'),
+        'history': price_steps(series)
+    }
+
+
+def fingerprint(inputs):
+    """sha256 over the template, the display values and the raw history floats"""
+    fields = {key: value for key, value in inputs.items() if key != 'history'}
+    digest = hashlib.sha256(f"{TEMPLATE_HASH}:{json.dumps(fields, sort_keys=True)}".encode())
+    # Hashing the history as packed doubles is exact and much cheaper than JSON-encoding it
+    digest.update(array('d', [value for point in inputs['history'] for value in point]).tobytes())
+    return digest.hexdigest()
+
+
+def render_page(inputs):
+    """Full HTML for one project page"""
+    history = inputs['history']
+    if len(history) > 1:
+        start = datetime.fromtimestamp(history[0][0]).strftime('%Y-%m-%d %H:%M')
+        end = datetime.fromtimestamp(history[-1][0]).strftime('%Y-%m-%d %H:%M')
+        history_range = f"{start} to {end} (last price change)"
+    else:
+        history_range = 'Not enough history yet'
+    fields = {key: value for key, value in inputs.items() if key != 'history'}
+    return PAGE_TEMPLATE.format(
+        chart_html=render_sparkline(history, CHART_WIDTH, CHART_HEIGHT),
+        history_range=history_range,
+        **fields
+    )
+
+
+def write_pages(jobs):
+    """Render and write [(path, inputs)] (runs in a worker process); returns the count"""
+    for path, inputs in jobs:
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(render_page(inputs))
+        os.replace(tmp, path)
+    return len(jobs)
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def render_project_pages(projects, metrics=None, series=None, categories=None,
+                         output_dir=PROJECTS_DIR, force=False, workers=None):
+    """Render the pages whose fingerprint changed and remove the ones of untracked symbols;
+    returns (rendered, unchanged, removed)
+
+    `projects` may be dicts or columnar row views; metrics/series/categories
+    are keyed by token symbol as elsewhere in the dashboard.
+    """
+    metrics = metrics or {}
+    series = series or {}
+    categories = categories or {}
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    previous = {} if force else load_manifest(manifest_path)
+
+    manifest = {}
+    jobs = []
+    for p in projects:
+        symbol = p['token_symbol']
+        row = {field: p.get(field) for field in RESULT_FIELDS}
+        inputs = page_inputs(row, metrics.get(symbol), series.get(symbol), categories.get(symbol))
+        name = detail_page_name(symbol)
+        digest = fingerprint(inputs)
+        manifest[name] = digest
+        path = os.path.join(output_dir, name)
+        if previous.get(name) != digest or not os.path.exists(path):
+            jobs.append((path, inputs))
+
+    # Pages of symbols no longer tracked - listed in the old manifest or just left on disk
+    removed = sorted({name for name in previous if name not in manifest} |
+                     {name for name in os.listdir(output_dir) if name.endswith('.html') and name not in manifest})
+    for name in removed:
+        try:
+            os.remove(os.path.join(output_dir, name))
+        except FileNotFoundError:
+            pass
+
+    if len(jobs) < PARALLEL_THRESHOLD:
+        write_pages(jobs)
+    else:
+        tasks = [jobs[i:i + PAGES_PER_TASK] for i in range(0, len(jobs), PAGES_PER_TASK)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for _ in pool.map(write_pages, tasks):
+                pass
+
+    tmp = f"{manifest_path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return len(jobs), len(manifest) - len(jobs), len(removed)
+
+
+def main():
+    from aggregation import load_categories
+    from analytics import compute_history_metrics
+    from generate_dashboard import load_latest_snapshot
+    from sparklines import load_sparklines
+
+    parser = argparse.ArgumentParser(description='Render per-project detail pages')
+    parser.add_argument('--output-dir', default=PROJECTS_DIR)
+    parser.add_argument('--force', action='store_true', help='Re-render every page')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per core)')
+    args = parser.parse_args()
+
+    data = load_latest_snapshot()
+    if not data:
+        print("❌ Error: no tracker results found!")
+        print("   Run: python3 kaito_tracker.py fetch")
+        raise SystemExit(1)
+    rendered, unchanged, removed = render_project_pages(
+        data['projects'], compute_history_metrics(), load_sparklines(), load_categories(),
+        output_dir=args.output_dir, force=args.force, workers=args.workers
+    )
+    print(f"📄 Detail pages: {rendered} rendered, {unchanged} unchanged, {removed} removed ({args.output_dir}/)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Validated, indexed project registry
+projects_database.json plus an append-only journal of adds/edits/removals
+
+Edits are appended to projects_journal.jsonl instead of rewriting the whole
+database; `compact` folds the journal back in. A crash mid-append leaves
+at most a half-written last entry, which is ignored (and dropped by the
+next edit). Every entry is validated at
+load time, and the registry is indexed by symbol, category and TGE date.
+content_hash changes whenever any project does, so downstream stages can
+skip work when the registry hasn't changed (see is_current / mark_current).
+
+Usage:
+    python3 project_registry.py validate
+    python3 project_registry.py list [--category "AI Agents"] [--tge-from 2025-01-01] [--tge-to 2025-06-30]
+    python3 project_registry.py add --name "Creator Bid" --twitter @CreatorBid --symbol BID \\
+        --tge-date 2025-01-23 --tge-price 0.2862 --category "AI Agents"
+    python3 project_registry.py edit BID tge_price=0.29 category="AI Agents"
+    python3 project_registry.py remove BID
+    python3 project_registry.py compact
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+PROJECTS_FILE = 'projects_database.json'
+JOURNAL_FILE = 'projects_journal.jsonl'
+REGISTRY_STATE_FILE = 'registry_state.json'
+COMPACT_AFTER = 500     # Journal entries before an edit triggers compaction
+
+# field -> (accepted types, required)
+SCHEMA = {
+    'name': ((str,), True),
+    'twitter': ((str,), True),
+    'token_symbol': ((str,), True),
+    'tge_date': ((str,), False),
+    'tge_price': ((int, float), False),
+    'tge_price_source': ((str,), False),
+    'category': ((str,), False),
+    'cmc_id': ((int,), False),
+    'coingecko_id': ((str,), False)
+}
+
+
+class RegistryError(ValueError):
+    """Raised when projects fail validation"""
+
+    def __init__(self, problems):
+        super().__init__('\n'.join(problems))
+        self.problems = problems
+
+
+def validate_project(project):
+    """List of problems with one project entry (empty if valid)"""
+    if not isinstance(project, dict):
+        return [f"not an object: {project!r}"]
+    label = project.get('token_symbol') or project.get('name') or '?'
+    problems = []
+    for field, (types, required) in SCHEMA.items():
+        value = project.get(field)
+        if value is None:
+            if required:
+                problems.append(f"{label}: missing {field}")
+            continue
+        if not isinstance(value, types) or isinstance(value, bool):
+            problems.append(f"{label}: {field} should be {'/'.join(t.__name__ for t in types)}, got {value!r}")
+    if isinstance(project.get('token_symbol'), str) and not project['token_symbol'].strip():
+        problems.append(f"{label}: empty token_symbol")
+    if isinstance(project.get('tge_date'), str):
+        try:
+            datetime.strptime(project['tge_date'], "%Y-%m-%d")
+        except ValueError:
+            problems.append(f"{label}: tge_date should be YYYY-MM-DD, got {project['tge_date']!r}")
+    if isinstance(project.get('tge_price'), (int, float)) and project['tge_price'] <= 0:
+        problems.append(f"{label}: tge_price should be positive, got {project['tge_price']!r}")
+    return problems
+
+
+class ProjectRegistry:
+    """All tracked projects with symbol / category / TGE-date indexes"""
+
+    def __init__(self, path=PROJECTS_FILE, journal_path=JOURNAL_FILE, state_path=REGISTRY_STATE_FILE):
+        self.path = path
+        self.journal_path = journal_path
+        self.state_path = state_path
+        self.by_symbol = {}
+        self.journal_entries = 0
+        self.journal_torn = None    # Byte offset of a half-written last entry (crash mid-append)
+        self._hash = None
+        self._indexes = None
+
+        with open(path, 'r') as f:
+            base = json.load(f)
+        problems = []
+        for project in base:
+            problems += self._add(project)
+        if os.path.exists(journal_path):
+            with open(journal_path, 'rb') as f:
+                offset = 0
+                for line_no, line in enumerate(f, 1):
+                    start, offset = offset, offset + len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        if not line.endswith(b'\n'):
+                            self.journal_torn = start     # Never completed - dropped on the next edit
+                            break
+                        problems.append(f"{journal_path}:{line_no}: unreadable journal entry")
+                        continue
+                    if entry.get('op') == 'remove':
+                        self.by_symbol.pop(entry['token_symbol'], None)
+                    else:
+                        problems += [f"{journal_path}:{line_no}: {p}" for p in validate_project(entry.get('project'))]
+                        if isinstance(entry.get('project'), dict):
+                            self.by_symbol[entry['project'].get('token_symbol')] = entry['project']
+                    self.journal_entries += 1
+        if problems:
+            raise RegistryError(problems)
+
+    def _add(self, project):
+        problems = validate_project(project)
+        if not problems and project['token_symbol'] in self.by_symbol:
+            problems.append(f"{project['token_symbol']}: duplicate token_symbol")
+        if not problems:
+            self.by_symbol[project['token_symbol']] = project
+        return problems
+
+    # ========================================
+    # LOOKUPS
+    # ========================================
+    @property
+    def projects(self):
+        """All projects, in database order (journal additions last)"""
+        return list(self.by_symbol.values())
+
+    def __len__(self):
+        return len(self.by_symbol)
+
+    def get(self, symbol):
+        return self.by_symbol.get(symbol)
+
+    def _build_indexes(self):
+        if self._indexes is None:
+            by_category = {}
+            dated = []
+            for project in self.by_symbol.values():
+                by_category.setdefault(project.get('category') or 'Uncategorized', []).append(project)
+                if project.get('tge_date'):
+                    dated.append((project['tge_date'], project['token_symbol']))
+            dated.sort()
+            self._indexes = (by_category, dated)
+        return self._indexes
+
+    def categories(self):
+        return sorted(self._build_indexes()[0])
+
+    def in_category(self, category):
+        return list(self._build_indexes()[0].get(category, []))
+
+    def tge_between(self, start=None, end=None):
+        """Projects with start <= tge_date <= end (YYYY-MM-DD strings), oldest TGE first"""
+        dated = self._build_indexes()[1]
+        lo = bisect_left(dated, (start,)) if start else 0
+        hi = bisect_right(dated, (end, '\uffff')) if end else len(dated)
+        return [self.by_symbol[symbol] for _, symbol in dated[lo:hi]]
+
+    # ========================================
+    # CHANGE DETECTION
+    # ========================================
+    @property
+    def content_hash(self):
+        """sha256 over the canonical JSON of every project (order-sensitive)"""
+        if self._hash is None:
+            canonical = json.dumps(self.projects, sort_keys=True, separators=(',', ':'))
+            self._hash = hashlib.sha256(canonical.encode()).hexdigest()
+        return self._hash
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def is_current(self, stage, extra=''):
+        """True if `stage` last ran against exactly this registry (and the same `extra` key)"""
+        return self._load_state().get(stage) == f"{self.content_hash}:{extra}"
+
+    def mark_current(self, stage, extra=''):
+        state = self._load_state()
+        state[stage] = f"{self.content_hash}:{extra}"
+        with open(f"{self.state_path}.tmp", 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(f"{self.state_path}.tmp", self.state_path)
+
+    # ========================================
+    # INCREMENTAL EDITS
+    # ========================================
+    def _journal(self, entry):
+        with open(self.journal_path, 'a+b') as f:
+            if self.journal_torn is not None:
+                f.truncate(self.journal_torn)
+                self.journal_torn = None
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(json.dumps(entry, separators=(',', ':')).encode() + b'\n')
+        self.journal_entries += 1
+        self._hash = None
+        self._indexes = None
+        if self.journal_entries >= COMPACT_AFTER:
+            self.compact()
+
+    def upsert(self, project):
+        """Add or replace a project (keyed by token_symbol) by appending to the journal"""
+        problems = validate_project(project)
+        if problems:
+            raise RegistryError(problems)
+        self.by_symbol[project['token_symbol']] = project
+        self._journal({'op': 'upsert', 'project': project})
+
+    def add(self, project):
+        """Add a new project; a token_symbol already in the registry is an error (upsert replaces)"""
+        if isinstance(project, dict) and project.get('token_symbol') in self.by_symbol:
+            raise RegistryError([f"{project['token_symbol']}: duplicate token_symbol"])
+        self.upsert(project)
+
+    def remove(self, symbol):
+        if symbol not in self.by_symbol:
+            raise KeyError(symbol)
+        del self.by_symbol[symbol]
+        self._journal({'op': 'remove', 'token_symbol': symbol})
+
+    def compact(self):
+        """Rewrite projects_database.json with the journal applied, then clear the journal"""
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.projects, f, indent=2)
+            f.write('\n')
+        os.replace(tmp, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_entries = 0
+        self.journal_torn = None
+
+
+def parse_value(text):
+    """CLI value: JSON if it parses (numbers, null, quoted strings), else the raw string"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kaito tracker project registry')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('validate', help='Validate the database and journal')
+    list_cmd = sub.add_parser('list', help='List projects')
+    list_cmd.add_argument('--category')
+    list_cmd.add_argument('--tge-from')
+    list_cmd.add_argument('--tge-to')
+    add_cmd = sub.add_parser('add', help='Add a project')
+    add_cmd.add_argument('--name', required=True)
+    add_cmd.add_argument('--twitter', required=True)
+    add_cmd.add_argument('--symbol', required=True)
+    add_cmd.add_argument('--tge-date')
+    add_cmd.add_argument('--tge-price', type=float)
+    add_cmd.add_argument('--category')
+    edit_cmd = sub.add_parser('edit', help='Edit fields of a project: edit BID tge_price=0.29')
+    edit_cmd.add_argument('symbol')
+    edit_cmd.add_argument('assignments', nargs='+', metavar='field=value')
+    remove_cmd = sub.add_parser('remove', help='Remove a project')
+    remove_cmd.add_argument('symbol')
+    sub.add_parser('compact', help='Fold the journal into projects_database.json')
+    args = parser.parse_args()
+
+    try:
+        run_command(args)
+    except RegistryError as e:
+        print(f"❌ {len(e.problems)} validation problems:")
+        for problem in e.problems:
+            print(f"   - {problem}")
+        raise SystemExit(1)
+
+
+def run_command(args):
+    registry = ProjectRegistry()
+
+    if args.command == 'validate':
+        print(f"✅ {len(registry)} projects valid ({registry.journal_entries} journal entries), "
+              f"hash {registry.content_hash[:12]}")
+    elif args.command == 'list':
+        if args.tge_from or args.tge_to:
+            projects = registry.tge_between(args.tge_from, args.tge_to)
+        else:
+            projects = registry.projects
+        if args.category:
+            projects = [p for p in projects if (p.get('category') or 'Uncategorized') == args.category]
+        for p in projects:
+            print(f"${p['token_symbol']:<10} {p['name']:<30} {p.get('tge_date') or '-':<12} {p.get('category') or '-'}")
+        print(f"📊 {len(projects)} projects")
+    elif args.command == 'add':
+        project = {
+            'name': args.name, 'twitter': args.twitter, 'token_symbol': args.symbol,
+            'tge_date': args.tge_date, 'tge_price': args.tge_price, 'category': args.category
+        }
+        registry.add({k: v for k, v in project.items() if v is not None})
+        print(f"✅ Added ${args.symbol}")
+    elif args.command == 'edit':
+        project = registry.get(args.symbol)
+        if project is None:
+            print(f"❌ Unknown symbol ${args.symbol}")
+            raise SystemExit(1)
+        project = dict(project)
+        for assignment in args.assignments:
+            field, _, value = assignment.partition('=')
+            project[field] = parse_value(value)
+        if project['token_symbol'] != args.symbol:
+            if registry.get(project['token_symbol']) is not None:
+                raise RegistryError([f"{project['token_symbol']}: duplicate token_symbol"])
+            registry.remove(args.symbol)
+        registry.upsert(project)
+        print(f"✅ Updated ${project['token_symbol']}")
+    elif args.command == 'remove':
+        if registry.get(args.symbol) is None:
+            print(f"❌ Unknown symbol ${args.symbol}")
+            raise SystemExit(1)
+        registry.remove(args.symbol)
+        print(f"✅ Removed ${args.symbol}")
+    elif args.command == 'compact':
+        registry.compact()
+        print(f"✅ Compacted {len(registry)} projects into {PROJECTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
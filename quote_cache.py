@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+On-disk TTL cache for CoinMarketCap quotes
+Keyed per symbol so repeated runs only spend credits on stale quotes
+"""
+
+import json
+import math
+import os
+import time
+
+QUOTE_CACHE_FILE = 'quote_cache.json'
+QUOTE_CACHE_TTL = 300           # Seconds a cached quote stays fresh
+QUOTE_CACHE_MAX_ENTRIES = 10000  # Oldest entries are evicted past this size
+SYMBOLS_PER_CREDIT = 100        # CMC bills quotes/latest per 100 symbols
+
+
+class QuoteCache:
+    """Persistent per-symbol quote cache with TTL and size-bounded eviction"""
+
+    def __init__(self, path=QUOTE_CACHE_FILE, ttl=QUOTE_CACHE_TTL,
+                 max_entries=QUOTE_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """Read the cache file; a missing or corrupt file starts empty"""
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        """Evict down to max_entries (oldest first) and write atomically"""
+        if len(self.entries) > self.max_entries:
+            newest = sorted(self.entries.items(), key=lambda kv: kv[1]['fetched_at'], reverse=True)
+            self.entries = dict(newest[:self.max_entries])
+
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+    def split(self, symbols, now=None):
+        """Return ({symbol: cached_data} for fresh hits, [stale or missing symbols])"""
+        now = now if now is not None else time.time()
+        fresh, stale = {}, []
+        for symbol in dict.fromkeys(symbols):
+            entry = self.entries.get(symbol)
+            if entry and now - entry['fetched_at'] < self.ttl:
+                fresh[symbol] = entry['data']
+                self.hits += 1
+            else:
+                stale.append(symbol)
+                self.misses += 1
+        return fresh, stale
+
+    def update(self, data, now=None):
+        """Store freshly fetched {symbol: data} entries"""
+        now = now if now is not None else time.time()
+        for symbol, value in data.items():
+            self.entries[symbol] = {'fetched_at': now, 'data': value}
+
+    def credits_saved(self):
+        """Rough number of CMC credits the hits avoided"""
+        return math.ceil(self.hits / SYMBOLS_PER_CREDIT)
+
+    def summary(self):
+        return f"{self.hits} hits, {self.misses} misses (~{self.credits_saved()} credits saved)"
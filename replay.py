@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Deterministic replay of the stored snapshot history through the pipeline
+
+Each stored snapshot is turned back into the quotes response the live run
+saw and fed through the same processing (process_projects) and persistence
+(save_snapshot) as a fetch, with the clock pinned to the snapshot's own
+timestamp - so days since TGE, ROI and row timestamps come out exactly as
+they did live. Snapshots from before runs had one clock carry a
+datetime.now() per row; those rows are replayed at their own stored time.
+Replayed rows are compared field by field against the stored
+ones, and the dashboard is re-rendered from the replayed history as often as
+asked. Nothing live is touched: the replayed history, dashboard, detail
+pages and sparkline cache all go to --output-dir.
+
+Useful for checking that a change to processing, analytics or rendering
+doesn't alter past results, and as a load test with real price paths.
+
+Usage:
+    python3 replay.py                                # whole history, render once at the end
+    python3 replay.py --from 2025-06-01 --to 2025-07-01
+    python3 replay.py --render-every 288             # also render once per replayed day
+    python3 replay.py --source delta --output-dir replay
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from aggregation import load_categories
+from analytics import ANALYTICS_CACHE_FILE, compute_history_metrics
+from fetch_all_projects import process_projects, save_snapshot
+from generate_dashboard import PROJECTS_DIR, render_view
+from history_store import RESULT_FIELDS, HistoryStore, open_history_store
+from project_pages import render_project_pages
+from sparklines import SPARKLINE_CACHE_FILE, load_sparklines
+
+REPLAY_DIR = 'replay'
+REPLAY_HISTORY_DB = 'replay_history.db'
+QUOTE_FIELDS = ['market_cap', 'volume_24h', 'percent_change_24h', 'percent_change_7d', 'percent_change_30d']
+MISMATCH_EXAMPLES = 5       # Differing fields printed in the report
+
+
+def snapshot_inputs(snapshot):
+    """(projects, CMC-shaped quotes response) reproducing what the live run saw for `snapshot`
+
+    Projects that got no quote (metadata failed_symbols) are included without
+    one, so they drop out of the results the same way they did live.
+    """
+    projects = []
+    data = {}
+    for row in snapshot['projects']:
+        symbol = row['token_symbol']
+        projects.append({
+            'name': row['project_name'],
+            'twitter': row['twitter'],
+            'token_symbol': symbol,
+            'tge_date': row['tge_date'],
+            'tge_price': row['tge_price']
+        })
+        quote = {'price': row['current_price'], **{field: row[field] for field in QUOTE_FIELDS}}
+        data[symbol] = [{'quote': {'USD': quote}, 'source': row.get('quote_source') or 'cmc'}]
+    for symbol in snapshot['metadata'].get('failed_symbols') or []:
+        projects.append({'name': symbol, 'twitter': '', 'token_symbol': symbol})
+    return projects, {'data': data}
+
+
+def parse_time(timestamp):
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+
+def row_clocks(snapshot):
+    """{symbol: datetime} for rows stamped with their own time instead of the snapshot's
+    (legacy runs called datetime.now() per row); empty for current snapshots"""
+    timestamp = snapshot['metadata']['timestamp']
+    return {row['token_symbol']: parse_time(row['timestamp']) for row in snapshot['projects']
+            if row.get('timestamp') and row['timestamp'] != timestamp}
+
+
+def process_snapshot(projects, response, now, clocks=None):
+    """process_projects with the clock the live run used for each row"""
+    if not clocks:
+        return process_projects(projects, response, verbose=False, now=now)
+    groups = {}
+    for project in projects:
+        groups.setdefault(clocks.get(project['token_symbol'], now), []).append(project)
+    by_symbol = {}
+    for clock, group in groups.items():
+        for result in process_projects(group, response, verbose=False, now=clock):
+            by_symbol[result['token_symbol']] = result
+    return [by_symbol[p['token_symbol']] for p in projects if p['token_symbol'] in by_symbol]
+
+
+def diff_rows(stored, replayed):
+    """[(symbol, field, stored value, replayed value)] for every field that differs"""
+    replayed_by_symbol = {row['token_symbol']: row for row in replayed}
+    diffs = []
+    for row in stored:
+        symbol = row['token_symbol']
+        other = replayed_by_symbol.pop(symbol, None)
+        if other is None:
+            diffs.append((symbol, 'row', 'present', 'missing'))
+            continue
+        for field in RESULT_FIELDS:
+            # Rows stored before quote sources were recorded have none
+            if field == 'quote_source' and row.get(field) is None:
+                continue
+            if row.get(field) != other.get(field):
+                diffs.append((symbol, field, row.get(field), other.get(field)))
+    diffs.extend((symbol, 'row', 'missing', 'present') for symbol in replayed_by_symbol)
+    return diffs
+
+
+def render_snapshot(data, store, output_dir, categories):
+    """Render the dashboard and detail pages for `data` from the replayed history"""
+    metrics = compute_history_metrics(store, cache_path=os.path.join(output_dir, ANALYTICS_CACHE_FILE))
+    series = load_sparklines(store, path=os.path.join(output_dir, SPARKLINE_CACHE_FILE))
+    render_view(os.path.join(output_dir, 'dashboard.html'), None, data['projects'], metrics, series,
+                categories, data['metadata'])
+    render_project_pages(data['projects'], metrics, series, categories,
+                         output_dir=os.path.join(output_dir, PROJECTS_DIR))
+
+
+def replay(source, target, start=None, end=None, render_every=0, output_dir=REPLAY_DIR):
+    """Replay `source` snapshots (start <= timestamp <= end) into `target`
+
+    render_every: render after every N snapshots (0 = only after the last one).
+    Returns a stats dict (snapshots, rows, mismatches, examples, renders, stage seconds, total seconds).
+    """
+    categories = load_categories()
+    stats = {'snapshots': 0, 'rows': 0, 'mismatches': 0, 'examples': [], 'renders': 0,
+             'stages': {'read': 0.0, 'process': 0.0, 'persist': 0.0, 'verify': 0.0, 'render': 0.0}}
+    stages = stats['stages']
+    started = time.perf_counter()
+    last = None
+    pending = False
+
+    snapshots = source.iter_snapshots(start, end)
+    while True:
+        t0 = time.perf_counter()
+        snapshot = next(snapshots, None)
+        t1 = time.perf_counter()
+        stages['read'] += t1 - t0
+        if snapshot is None:
+            break
+
+        timestamp = snapshot['metadata']['timestamp']
+        now = parse_time(timestamp)
+        projects, response = snapshot_inputs(snapshot)
+        results = process_snapshot(projects, response, now, row_clocks(snapshot))
+        t2 = time.perf_counter()
+        stages['process'] += t2 - t1
+
+        quoted = {r['token_symbol'] for r in results}
+        failed_symbols = [p['token_symbol'] for p in projects if p['token_symbol'] not in quoted]
+        last = save_snapshot(results, target, snapshot_format=None, now=now, failed_symbols=failed_symbols)
+        t3 = time.perf_counter()
+        stages['persist'] += t3 - t2
+
+        diffs = diff_rows(snapshot['projects'], results)
+        stats['mismatches'] += len(diffs)
+        stats['examples'].extend((timestamp,) + d for d in diffs[:MISMATCH_EXAMPLES - len(stats['examples'])])
+        stages['verify'] += time.perf_counter() - t3
+
+        stats['snapshots'] += 1
+        stats['rows'] += len(results)
+        pending = True
+        if render_every and stats['snapshots'] % render_every == 0:
+            t4 = time.perf_counter()
+            render_snapshot(last, target, output_dir, categories)
+            stages['render'] += time.perf_counter() - t4
+            stats['renders'] += 1
+            pending = False
+
+    if last is not None and pending:
+        t4 = time.perf_counter()
+        render_snapshot(last, target, output_dir, categories)
+        stages['render'] += time.perf_counter() - t4
+        stats['renders'] += 1
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def print_report(stats):
+    snapshots = stats['snapshots']
+    seconds = stats['seconds'] or 1e-9
+    print(f"⏩ Replayed {snapshots} snapshots ({stats['rows']:,} rows) in {stats['seconds']:.2f}s: "
+          f"{snapshots / seconds:,.1f} snapshots/s, {stats['rows'] / seconds:,.0f} rows/s")
+    for stage, spent in stats['stages'].items():
+        count = stats['renders'] if stage == 'render' else snapshots
+        rate = f"{count / spent:,.1f}/s" if spent and count else '-'
+        print(f"   {stage:<8} {spent:8.3f}s  {rate}")
+    if stats['mismatches']:
+        print(f"❌ {stats['mismatches']} fields differ from the stored history, e.g.:")
+        for timestamp, symbol, field, stored, replayed in stats['examples']:
+            print(f"   {timestamp} ${symbol} {field}: stored {stored!r}, replayed {replayed!r}")
+    else:
+        print("✅ Replayed results are identical to the stored history")
+
+
+def run_replay(start=None, end=None, source=None, render_every=0, output_dir=REPLAY_DIR):
+    """Replay into a fresh history under `output_dir` and print the report; returns an exit code"""
+    os.makedirs(output_dir, exist_ok=True)
+    # Replays always start from an empty history, so repeated runs give identical output
+    target_path = os.path.join(output_dir, REPLAY_HISTORY_DB)
+    for path in (target_path, f"{target_path}-wal", f"{target_path}-shm",
+                 os.path.join(output_dir, SPARKLINE_CACHE_FILE), os.path.join(output_dir, ANALYTICS_CACHE_FILE)):
+        if os.path.exists(path):
+            os.remove(path)
+
+    source = open_history_store(source)
+    target = HistoryStore(target_path)
+    try:
+        stats = replay(source, target, start, end, render_every, output_dir)
+    finally:
+        source.close()
+        target.close()
+    if not stats['snapshots']:
+        print("❌ No stored snapshots in that range")
+        print("   Run: python3 kaito_tracker.py fetch")
+        return 1
+    print_report(stats)
+    print(f"📁 Replayed history and dashboard in {output_dir}/")
+    return 1 if stats['mismatches'] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay stored snapshot history through the pipeline')
+    parser.add_argument('--from', dest='start', help='First snapshot timestamp (ISO, e.g. 2025-06-01)')
+    parser.add_argument('--to', dest='end', help='Last snapshot timestamp (ISO)')
+    parser.add_argument('--source', choices=['sqlite', 'delta'], help='History backend (default: HISTORY_BACKEND)')
+    parser.add_argument('--render-every', type=int, default=0, metavar='N',
+                        help='Render the dashboard after every N snapshots (default: only after the last)')
+    parser.add_argument('--output-dir', default=REPLAY_DIR)
+    args = parser.parse_args()
+    raise SystemExit(run_replay(args.start, args.end, args.source, args.render_every, args.output_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Downsampled price series for dashboard sparklines and the ROI-since-TGE chart
+
+Each token's price history is reduced with Largest-Triangle-Three-Buckets
+(LTTB) to a fixed point budget, so the embedded SVG stays the same size no
+matter how long we've been polling. The reduced series are cached in
+sparkline_cache.json; each render only reads snapshots newer than the cache
+and re-downsamples once a series has grown to twice the budget.
+
+Usage:
+    python3 sparklines.py            # update the cache and print series sizes
+    python3 sparklines.py --rebuild  # recompute from the full history
+"""
+
+import argparse
+import json
+import math
+import os
+from datetime import datetime
+
+import numpy as np
+
+from history_store import open_history_store
+
+SPARKLINE_CACHE_FILE = 'sparkline_cache.json'
+SPARKLINE_POINTS = 60       # Points kept per token (the HTML size budget)
+
+SPARKLINE_WIDTH = 120
+SPARKLINE_HEIGHT = 32
+ROI_CHART_WIDTH = 1000
+ROI_CHART_HEIGHT = 280
+ROI_CHART_TOKENS = 8        # Best current ROI first
+ROI_CHART_GRID = [-90, -50, 0, 100, 400, 900, 4900, 9900]   # ROI % gridlines (log scale)
+CHART_COLORS = ['#3b82f6', '#06b6d4', '#10b981', '#f59e0b', '#ef4444', '#a855f7', '#ec4899', '#84cc16']
+MOON_COLOR = '#10b981'
+REKT_COLOR = '#ef4444'
+
+SPARKLINE_TEMPLATE = ('<svg class="sparkline" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+                      '<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{points}"/></svg>')
+
+ROI_CHART_TEMPLATE = """        <div class="table-container roi-chart">
+            <h3>ROI Since TGE</h3>
+            <svg width="100%" viewBox="0 0 {width} {height}">
+{grid}{lines}            </svg>
+            <div class="chart-legend">{legend}</div>
+        </div>
+"""
+
+
+# ========================================
+# DOWNSAMPLING
+# ========================================
+def lttb(points, threshold):
+    """Largest-Triangle-Three-Buckets: keep `threshold` of the (x, y) points, preserving the shape
+
+    The first and last points are always kept. The rest are split into
+    threshold - 2 buckets; from each bucket the point forming the largest
+    triangle with the previous pick and the next bucket's average is kept.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+    xy = np.asarray(points, dtype=np.float64)
+    x, y = xy[:, 0], xy[:, 1]
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1   # bucket i is edges[i]:edges[i + 1]
+
+    keep = [0]
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = int(lo + area.argmax())
+        keep.append(a)
+    keep.append(n - 1)
+    return [points[i] for i in keep]
+
+
+def to_epoch(timestamp):
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+
+
+class SparklineCache:
+    """Per-token downsampled [(epoch, price)] series, extended from the history store incrementally"""
+
+    def __init__(self, path=SPARKLINE_CACHE_FILE, points=SPARKLINE_POINTS):
+        self.path = path
+        self.points = points
+        self.reset()
+        self.load()
+
+    def reset(self, source=None):
+        self.source = source            # (store path, first snapshot timestamp)
+        self.last_timestamp = None
+        self.series = {}
+
+    def load(self):
+        """Read the cache file; a missing, corrupt or differently-sized cache starts empty"""
+        try:
+            with open(self.path, 'r') as f:
+                cached = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if cached.get('points') != self.points:
+            return
+        self.source = cached.get('source') and tuple(cached['source'])
+        self.last_timestamp = cached.get('last_timestamp')
+        self.series = {symbol: [tuple(p) for p in series] for symbol, series in cached['series'].items()}
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({
+                'points': self.points,
+                'source': self.source,
+                'last_timestamp': self.last_timestamp,
+                'series': self.series
+            }, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    def update(self, store):
+        """Fold in snapshots newer than the cache; returns the number of new snapshots
+
+        The cache is rebuilt from scratch when it was built from a different
+        store (path or first snapshot changed) or the store went backwards.
+        """
+        index = store.snapshot_index()
+        if not index:
+            self.reset()
+            return 0
+        source = (store.path, index[0][1])
+        if source != self.source or (self.last_timestamp and index[-1][1] < self.last_timestamp):
+            self.reset(source)
+
+        since = self.last_timestamp
+        new = {snapshot_id: to_epoch(t) for snapshot_id, t in index if since is None or t > since}
+        if not new:
+            return 0
+
+        appended = {}
+        for symbol, snapshot_id, price, _ in store.price_rows(since):
+            if price is not None and snapshot_id in new:
+                appended.setdefault(symbol, []).append((new[snapshot_id], float(price)))
+        for symbol, points in appended.items():
+            series = self.series.setdefault(symbol, [])
+            series.extend(sorted(points))
+            # Re-downsample only once the raw tail has doubled the series
+            if len(series) > 2 * self.points:
+                self.series[symbol] = lttb(series, self.points)
+        self.last_timestamp = index[-1][1]
+        return len(new)
+
+    def extend(self, timestamp, rows):
+        """Fold in a snapshot that isn't stored yet (rows with token_symbol/current_price)"""
+        epoch = to_epoch(timestamp)
+        for row in rows:
+            if row.get('current_price') is None:
+                continue
+            series = self.series.setdefault(row['token_symbol'], [])
+            series.append((epoch, float(row['current_price'])))
+            if len(series) > 2 * self.points:
+                self.series[row['token_symbol']] = lttb(series, self.points)
+        self.last_timestamp = timestamp
+
+    def get(self, symbol):
+        """Series for one token, at most `points` long"""
+        return lttb(self.series.get(symbol, []), self.points)
+
+
+def load_sparklines(store=None, path=SPARKLINE_CACHE_FILE, points=SPARKLINE_POINTS):
+    """{symbol: [(epoch, price)]} for every token, updating the on-disk cache first"""
+    own_store = store is None
+    store = store or open_history_store()
+    cache = SparklineCache(path, points)
+    if cache.update(store):
+        cache.save()
+    if own_store:
+        store.close()
+    return {symbol: cache.get(symbol) for symbol in cache.series}
+
+
+# ========================================
+# SVG RENDERING
+# ========================================
+def scale(points, width, height, y_range=None, x_range=None, pad=2):
+    """'x,y x,y ...' for an SVG polyline, fitted into width x height"""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    x_min, x_max = x_range or (min(xs), max(xs))
+    y_min, y_max = y_range or (min(ys), max(ys))
+    x_span = (x_max - x_min) or 1
+    y_span = (y_max - y_min) or 1
+    return ' '.join(
+        f"{pad + (x - x_min) / x_span * (width - 2 * pad):.1f},"
+        f"{height - pad - (y - y_min) / y_span * (height - 2 * pad):.1f}"
+        for x, y in zip(xs, ys)
+    )
+
+
+def render_sparkline(series, width=SPARKLINE_WIDTH, height=SPARKLINE_HEIGHT):
+    """Inline SVG price sparkline ('' with fewer than two points)"""
+    if not series or len(series) < 2:
+        return ''
+    color = MOON_COLOR if series[-1][1] >= series[0][1] else REKT_COLOR
+    return SPARKLINE_TEMPLATE.format(width=width, height=height, color=color,
+                                     points=scale(series, width, height))
+
+
+def roi_multiple(price, tge_price):
+    """log10(price / tge_price) - ROI on a log scale so 10x and -90% are equally far from 0"""
+    return math.log10(price / tge_price)
+
+
+def render_roi_chart(projects, series, tokens=ROI_CHART_TOKENS,
+                     width=ROI_CHART_WIDTH, height=ROI_CHART_HEIGHT):
+    """SVG chart of ROI since TGE over time for the best current performers ('' if no history)"""
+    charted = []
+    for p in sorted(projects, key=lambda p: p.get('all_time_roi') or -math.inf, reverse=True):
+        if not p.get('tge_price') or p.get('all_time_roi') is None:
+            continue
+        points = [(t, roi_multiple(price, p['tge_price']))
+                  for t, price in series.get(p['token_symbol']) or [] if price > 0]
+        if len(points) > 1:
+            charted.append((p['token_symbol'], points))
+        if len(charted) == tokens:
+            break
+    if not charted:
+        return ''
+
+    x_range = (min(s[0][0] for _, s in charted), max(s[-1][0] for _, s in charted))
+    y_values = [y for _, s in charted for _, y in s]
+    y_range = (min(min(y_values), 0), max(max(y_values), 0))
+    y_span = (y_range[1] - y_range[0]) or 1
+
+    grid = []
+    for roi in ROI_CHART_GRID:
+        y_value = math.log10(1 + roi / 100)
+        if not y_range[0] <= y_value <= y_range[1]:
+            continue
+        y = height - 2 - (y_value - y_range[0]) / y_span * (height - 4)
+        grid.append(f'                <line x1="0" x2="{width}" y1="{y:.1f}" y2="{y:.1f}" '
+                    f'stroke="rgba(148,163,184,0.2)"/>'
+                    f'<text x="4" y="{y - 3:.1f}" fill="#94a3b8" font-size="11">{roi:+d}%</text>\n')
+    lines = []
+    legend = []
+    for i, (symbol, points) in enumerate(charted):
+        color = CHART_COLORS[i % len(CHART_COLORS)]
+        lines.append(f'                <polyline fill="none" stroke="{color}" stroke-width="2" '
+                     f'points="{scale(points, width, height, y_range, x_range)}"/>\n')
+        legend.append(f'<span style="color:{color}">${symbol}</span>')
+    return ROI_CHART_TEMPLATE.format(width=width, height=height, grid=''.join(grid),
+                                     lines=''.join(lines), legend=' '.join(legend))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update the downsampled sparkline cache')
+    parser.add_argument('--rebuild', action='store_true', help='Discard the cache and recompute from full history')
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(SPARKLINE_CACHE_FILE):
+        os.remove(SPARKLINE_CACHE_FILE)
+    store = open_history_store()
+    cache = SparklineCache()
+    added = cache.update(store)
+    store.close()
+    cache.save()
+    sizes = [len(s) for s in cache.series.values()]
+    print(f"✅ Folded in {added} new snapshots; {len(sizes)} tokens, "
+          f"{max(sizes, default=0)} points max (budget {cache.points})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Persistent, expiring blocklist of ids/symbols CoinMarketCap rejects
+Keys isolated by batch bisection are skipped by later runs until they expire
+"""
+
+import json
+import os
+import time
+
+BLOCKLIST_FILE = 'symbol_blocklist.json'
+BLOCKLIST_TTL = 24 * 3600   # Seconds before a rejected key is tried again (tickers get relisted)
+
+
+class SymbolBlocklist:
+    """'symbol:XYZ' / 'id:123' keys with an expiry time, saved to BLOCKLIST_FILE"""
+
+    def __init__(self, path=BLOCKLIST_FILE, ttl=BLOCKLIST_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}      # key -> {'blocked_at', 'expires_at', 'reason'}
+        self.load()
+
+    def load(self):
+        """Read the blocklist file; a missing or corrupt file starts empty"""
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self, now=None):
+        """Drop expired entries and write atomically"""
+        now = now if now is not None else time.time()
+        self.entries = {k: v for k, v in self.entries.items() if v['expires_at'] > now}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def is_blocked(self, key, now=None):
+        now = now if now is not None else time.time()
+        entry = self.entries.get(key)
+        return entry is not None and entry['expires_at'] > now
+
+    def split(self, keys, now=None):
+        """Return ([allowed keys], [blocked keys]) preserving order"""
+        allowed, blocked = [], []
+        for key in keys:
+            (blocked if self.is_blocked(key, now) else allowed).append(key)
+        return allowed, blocked
+
+    def add(self, key, reason='', now=None):
+        now = now if now is not None else time.time()
+        self.entries[key] = {'blocked_at': now, 'expires_at': now + self.ttl, 'reason': reason}
@@ -0,0 +1,15 @@
+"""Shared test setup: the modules live at the repo root and read/write files in the working directory"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test inside an empty scratch directory"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from aggregation import UNCATEGORIZED, Rollup, StreamingAggregator
+
+
+def random_rows(n, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        value = None if rng.random() < 0.2 else rng.choice([rng.uniform(-50, 50), 10.0])     # repeats make ties
+        rows.append({'project_name': f'P{i}', 'token_symbol': f'S{i}', 'all_time_roi': value,
+                     'market_cap': rng.uniform(1, 1e9)})
+    return rows
+
+
+def test_rollup_matches_a_sorted_reference():
+    rows = random_rows(500)
+    aggregator = StreamingAggregator(k=7).consume(rows)
+
+    valued = [(row['all_time_roi'], seq, row['project_name']) for seq, row in enumerate(rows)
+              if row['all_time_roi'] is not None]
+    top = sorted(valued, key=lambda v: (-v[0], v[1]))[:7]
+    bottom = sorted(valued, key=lambda v: (v[0], v[1]))[:7]
+    assert aggregator.overall.top('all_time_roi') == [(value, label) for value, _, label in top]
+    assert aggregator.overall.bottom('all_time_roi') == [(value, label) for value, _, label in bottom]
+    assert aggregator.overall.mean('all_time_roi') == pytest.approx(sum(v for v, _, _ in valued) / len(valued))
+    assert aggregator.overall.total('market_cap') == pytest.approx(sum(row['market_cap'] for row in rows))
+    assert aggregator.overall.count == 500
+
+
+def test_ties_go_to_the_earlier_row():
+    rollup = Rollup(k=2)
+    for seq, label in enumerate(['first', 'second', 'third']):
+        rollup.add(seq, label, {'roi': 5.0})
+    assert rollup.top('roi') == [(5.0, 'first'), (5.0, 'second')]
+    assert rollup.bottom('roi') == [(5.0, 'first'), (5.0, 'second')]
+
+    # Out-of-order arrival with explicit positions ranks the same
+    aggregator = StreamingAggregator(k=2)
+    for seq in (2, 0, 1):
+        aggregator.add({'project_name': f'P{seq}', 'token_symbol': f'S{seq}', 'all_time_roi': 5.0}, seq=seq)
+    assert aggregator.overall.top('all_time_roi') == [(5.0, 'P0'), (5.0, 'P1')]
+
+
+def test_category_rollups_and_uncategorized_fallback():
+    rows = [{'project_name': 'A', 'token_symbol': 'A', 'all_time_roi': 10.0},
+            {'project_name': 'B', 'token_symbol': 'B', 'all_time_roi': 30.0},
+            {'project_name': 'C', 'token_symbol': 'C', 'all_time_roi': None},
+            {'project_name': 'D', 'token_symbol': 'D', 'all_time_roi': -5.0}]
+    aggregator = StreamingAggregator({'A': 'DeFi', 'B': 'DeFi', 'C': None}).consume(
+        rows, {'A': {'max_drawdown': -20.0}})
+
+    assert set(aggregator.by_category) == {'DeFi', UNCATEGORIZED}
+    defi = aggregator.by_category['DeFi']
+    assert defi.count == 2 and defi.mean('all_time_roi') == 20.0
+    assert defi.best('all_time_roi') == (30.0, 'B')
+    other = aggregator.by_category[UNCATEGORIZED]
+    assert other.count == 2 and other.mean('all_time_roi') == -5.0     # None is skipped, not counted
+    assert aggregator.overall.worst('max_drawdown') == (-20.0, 'A')
+    assert other.mean('max_drawdown') is None
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from alerts import AlertEngine, AlertRule
+
+START = datetime(2025, 3, 1, 12, 0)
+
+
+def snapshot(minutes, change):
+    timestamp = (START + timedelta(minutes=minutes)).isoformat()
+    return {'metadata': {'timestamp': timestamp},
+            'projects': [{'token_symbol': 'AAA', 'project_name': 'Alpha', 'percent_change_24h': change}]}
+
+
+def dump_rule():
+    return AlertRule('dump-24h', 'percent_change_24h', '<', -20, hysteresis=5, cooldown=3600)
+
+
+def fired(engine, minutes, change):
+    return [alert['value'] for alert in engine.evaluate(snapshot(minutes, change))]
+
+
+def test_hysteresis_and_cooldown(workdir):
+    engine = AlertEngine([dump_rule()], state_path='alert_state.json')
+    assert fired(engine, 0, -25) == [-25]
+    assert fired(engine, 10, -18) == []         # back above -20 but not past -15: still active
+    assert fired(engine, 20, -22) == []         # so dipping again is not a new alert
+    assert fired(engine, 30, -10) == []         # released
+    assert fired(engine, 40, -25) == []         # re-armed inside the cooldown: suppressed
+    assert engine.stats['suppressed'] == 1
+    engine.save()
+
+    engine = AlertEngine([dump_rule()], state_path='alert_state.json')
+    assert fired(engine, 40, -30) == []         # not newer than the last snapshot evaluated
+    assert fired(engine, 50, -22) == []         # still active after the restart
+    assert fired(engine, 60, -10) == []
+    assert fired(engine, 120, -25) == [-25]     # cooldown over
+
+
+def test_edited_rule_starts_fresh(workdir):
+    engine = AlertEngine([dump_rule()], state_path='alert_state.json')
+    assert fired(engine, 0, -25) == [-25]
+    engine.save()
+
+    stricter = AlertRule('dump-24h', 'percent_change_24h', '<', -24, hysteresis=5, cooldown=3600)
+    engine = AlertEngine([stricter], state_path='alert_state.json')
+    assert fired(engine, 10, -25) == [-25]
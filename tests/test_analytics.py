@@ -0,0 +1,98 @@
+import math
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import analytics
+from analytics import PendingSnapshotMetrics, compute_history_metrics, compute_metrics
+from history_store import HistoryStore
+
+PRICES = {
+    'UP': [1.0, 2.0, 4.0, 3.0, 5.0],
+    'GAP': [2.0, None, None, 1.0, 1.5],
+    'LATE': [None, None, 1.0, 0.5, 0.75],
+}
+
+
+def fill(store, prices=PRICES):
+    start = datetime(2025, 1, 1)
+    for k in range(len(next(iter(prices.values())))):
+        timestamp = (start + timedelta(days=k)).isoformat()
+        rows = [{'token_symbol': symbol, 'current_price': series[k], 'tge_price': 1.0, 'timestamp': timestamp}
+                for symbol, series in prices.items() if series[k] is not None]
+        store.append_snapshot({'metadata': {'timestamp': timestamp, 'total_projects': len(rows)},
+                               'projects': rows})
+
+
+def expected_volatility(series):
+    filled, last = [], None
+    for price in series:
+        last = price if price is not None else last
+        filled.append(last)
+    returns = [math.log(b / a) for a, b in zip(filled, filled[1:]) if a is not None]
+    mean = sum(returns) / len(returns)
+    std = math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+    return std * math.sqrt(365) * 100
+
+
+def test_streamed_metrics_match_a_direct_computation(workdir, monkeypatch):
+    store = HistoryStore('history.db')
+    fill(store)
+    monkeypatch.setattr(analytics, 'HISTORY_CHUNK_ROWS', 2)     # chunks cut through snapshots
+    metrics = compute_history_metrics(store, cache_path=None)
+
+    assert metrics['UP']['current_price'] == 5.0
+    assert metrics['UP']['roi_since_tge'] == pytest.approx(400.0)
+    assert metrics['UP']['max_drawdown'] == pytest.approx(-25.0)
+    assert metrics['GAP']['max_drawdown'] == pytest.approx(-50.0)
+    assert metrics['LATE']['max_drawdown'] == pytest.approx(-50.0)
+    for symbol, series in PRICES.items():
+        assert metrics[symbol]['volatility_7d'] == pytest.approx(expected_volatility(series))
+    assert metrics['UP']['roi_percentile'] == 100.0
+    store.close()
+
+
+def test_chunked_feed_matches_a_single_block():
+    rng = np.random.default_rng(7)
+    prices = rng.uniform(0.5, 2.0, size=(20, 300))
+    prices[rng.random(prices.shape) < 0.2] = np.nan
+    timestamps = np.arange(300) * 3600.0
+    tge = np.ones(20)
+    whole = compute_metrics(timestamps, prices, tge, chunk=300)
+    chunked = compute_metrics(timestamps, prices, tge, chunk=7)
+    for key in whole:
+        np.testing.assert_allclose(chunked[key], whole[key], rtol=1e-12, equal_nan=True)
+
+
+def test_metrics_are_cached_per_snapshot(workdir, monkeypatch):
+    store = HistoryStore('history.db')
+    fill(store)
+    first = compute_history_metrics(store)
+
+    analytics._cache.clear()        # a new process: served from the cache file
+    with monkeypatch.context() as patched:
+        patched.setattr(analytics, 'stream_history', lambda *args, **kwargs: pytest.fail('history reloaded'))
+        assert compute_history_metrics(store) == first
+
+    store.append_snapshot({'metadata': {'timestamp': '2025-01-06T00:00:00', 'total_projects': 1},
+                           'projects': [{'token_symbol': 'UP', 'current_price': 10.0, 'tge_price': 1.0,
+                                         'timestamp': '2025-01-06T00:00:00'}]})
+    assert compute_history_metrics(store)['UP']['current_price'] == 10.0
+    store.close()
+
+
+def test_pending_snapshot_matches_storing_it(workdir):
+    store = HistoryStore('history.db')
+    fill(store)
+    rows = [{'token_symbol': 'UP', 'current_price': 4.5, 'tge_price': 1.0},
+            {'token_symbol': 'NEW', 'current_price': 2.0, 'tge_price': 1.0}]
+    pending = PendingSnapshotMetrics(store, '2025-01-06T00:00:00').for_rows(rows)
+
+    store.append_snapshot({'metadata': {'timestamp': '2025-01-06T00:00:00', 'total_projects': 2},
+                           'projects': [dict(row, timestamp='2025-01-06T00:00:00') for row in rows]})
+    stored = compute_history_metrics(store, cache_path=None)
+    for symbol in ('UP', 'NEW'):
+        for key, value in pending[symbol].items():
+            assert value == pytest.approx(stored[symbol][key], nan_ok=True)
+    store.close()
@@ -0,0 +1,90 @@
+import pytest
+
+import cmc_client
+from cmc_client import CMCClient, CMCError, TokenBucket, parse_retry_after
+
+
+class Response:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body if body is not None else {}
+        self.headers = headers or {}
+        self.text = str(self.body)
+        self.content = self.text.encode()
+
+    def json(self):
+        if isinstance(self.body, str):
+            raise ValueError('Expecting value: line 1 column 1 (char 0)')
+        return self.body
+
+
+class Session:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def client_with(responses, monkeypatch, **kwargs):
+    sleeps = []
+    monkeypatch.setattr(cmc_client.time, 'sleep', sleeps.append)
+    client = CMCClient('key', requests_per_minute=0, **kwargs)
+    client.session = Session(responses)
+    return client, sleeps
+
+
+def test_rate_limited_request_is_retried_after_retry_after(monkeypatch):
+    client, sleeps = client_with([Response(429, headers={'Retry-After': '7'}), Response(503),
+                                  Response(200, {'data': {'ok': True}})], monkeypatch, backoff_base=1.0)
+
+    assert client.get('/v1/test') == {'data': {'ok': True}}
+    assert client.session.calls == 3
+    assert sleeps[0] == 7.0                         # never shorter than Retry-After
+    assert 0 <= sleeps[1] <= 2.0                    # full jitter up to base * 2**attempt
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    client, sleeps = client_with([Response(500)] * 3, monkeypatch, max_retries=2)
+    with pytest.raises(CMCError) as error:
+        client.get('/v1/test')
+    assert error.value.status == 500
+    assert client.session.calls == 3
+    assert len(sleeps) == 2                         # no sleep after the last attempt
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    body = {'status': {'error_message': 'Invalid value for "symbol": "X"'}}
+    client, sleeps = client_with([Response(400, body)], monkeypatch)
+    with pytest.raises(CMCError) as error:
+        client.get('/v1/test')
+    assert error.value.detail == 'Invalid value for "symbol": "X"'
+    assert sleeps == []
+
+
+def test_backoff_is_capped():
+    client = CMCClient('key', requests_per_minute=0, backoff_base=1.0, backoff_cap=4.0)
+    assert all(client._backoff(10) <= 4.0 for _ in range(50))
+    assert parse_retry_after('3') == 3.0 and parse_retry_after('soon') is None
+
+
+def test_429_pauses_the_rate_limiter(monkeypatch):
+    client, _ = client_with([Response(429, headers={'Retry-After': '5'})], monkeypatch, max_retries=0)
+    client.limiter = TokenBucket(60)                # one token per second
+    with pytest.raises(CMCError):
+        client.get('/v1/test')
+    assert client.limiter.tokens <= -5              # nothing goes out for the next 5 seconds
+
+
+def test_non_json_success_is_retried(monkeypatch):
+    client, sleeps = client_with([Response(200, '<html>maintenance</html>'), Response(200, ''),
+                                  Response(200, {'data': {}})], monkeypatch)
+    assert client.get('/v1/test') == {'data': {}}
+    assert len(sleeps) == 2
+
+    client, _ = client_with([Response(200, '')] * 2, monkeypatch, max_retries=1)
+    with pytest.raises(CMCError) as error:
+        client.get('/v1/test')
+    assert 'not JSON' in str(error.value)
@@ -0,0 +1,28 @@
+from cmc_id_map import IdMap, resolve_projects
+
+LISTINGS = [
+    {'id': 99, 'symbol': 'IN', 'name': 'Other IN', 'slug': 'other-in', 'rank': 5},
+    {'id': 1001, 'symbol': 'IN', 'name': 'INFINIT', 'slug': 'infinit', 'rank': 50},
+    {'id': 2000, 'symbol': 'BID', 'name': 'CreatorBid', 'slug': 'creatorbid', 'rank': 900},
+]
+
+
+def test_same_ticker_listings_need_an_exact_name_match():
+    id_map = IdMap(LISTINGS)
+    assert id_map.resolve({'token_symbol': 'IN', 'name': 'Infinit'}) == 1001
+    # Best-ranked is "Other IN", but rank is no evidence it is the tracked project
+    assert id_map.resolve({'token_symbol': 'IN', 'name': 'Infinit Labs'}) is None
+    assert id_map.resolve({'token_symbol': 'IN', 'name': 'Infinit Labs', 'cmc_id': 1001}) == 1001
+
+
+def test_single_listing_resolves_without_a_name_match():
+    assert IdMap(LISTINGS).resolve({'token_symbol': 'BID', 'name': 'Bid'}) == 2000
+
+
+def test_ambiguous_tickers_are_not_pinned_and_list_the_candidates(capsys):
+    projects = [{'token_symbol': 'IN', 'name': 'Infinit Labs'}, {'token_symbol': 'BID', 'name': 'Bid'}]
+    resolved = resolve_projects(projects, IdMap(LISTINGS))
+    assert resolved == [projects[1]]
+    assert 'cmc_id' not in projects[0]
+    out = capsys.readouterr().out
+    assert '99 (Other IN)' in out and '1001 (INFINIT)' in out
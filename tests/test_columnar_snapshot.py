@@ -0,0 +1,72 @@
+import json
+
+from columnar_snapshot import ColumnarSnapshot, write_snapshot
+from fetch_all_projects import write_latest_snapshot
+from generate_dashboard import load_latest_snapshot, render_row
+from history_store import RESULT_FIELDS
+
+SNAPSHOT = {
+    'metadata': {'timestamp': '2025-06-01T12:00:00', 'total_projects': 3, 'data_sources': ['CoinMarketCap'],
+                 'failed_symbols': ['GONE']},
+    'projects': [
+        {'project_name': 'Bid', 'twitter': '@bid', 'token_symbol': 'BID', 'tge_date': '2025-01-23',
+         'days_since_tge': 129, 'tge_price': 0.12, 'current_price': 0.0456, 'market_cap': 45_600_000.5,
+         'volume_24h': 1_234_567.0, 'percent_change_24h': -3.5, 'percent_change_7d': 12.25,
+         'percent_change_30d': -40.0, 'all_time_roi': -62.0, 'timestamp': '2025-06-01T12:00:00',
+         'quote_source': 'cmc'},
+        {'project_name': 'New listing', 'twitter': '', 'token_symbol': 'NEW', 'tge_date': None,
+         'days_since_tge': None, 'tge_price': None, 'current_price': 1e-7, 'market_cap': None,
+         'volume_24h': 0.0, 'percent_change_24h': None, 'percent_change_7d': None,
+         'percent_change_30d': None, 'all_time_roi': None, 'timestamp': '2025-06-01T11:59:58',
+         'quote_source': None},
+        {'project_name': 'Moon', 'twitter': '@moon', 'token_symbol': 'MOON', 'tge_date': '2024-01-01',
+         'days_since_tge': 517, 'tge_price': 0.001, 'current_price': 2.5, 'market_cap': 2.5e9,
+         'volume_24h': 9e7, 'percent_change_24h': 0.0, 'percent_change_7d': 1.0,
+         'percent_change_30d': 2.0, 'all_time_roi': 249900.0, 'timestamp': '2025-06-01T12:00:00',
+         'quote_source': 'coingecko'},
+    ]
+}
+
+
+def test_columnar_round_trip_matches_the_json_snapshot(workdir):
+    write_snapshot('latest.kcs', SNAPSHOT)
+    snapshot = ColumnarSnapshot('latest.kcs')
+    assert snapshot.to_dict() == SNAPSHOT
+    assert isinstance(snapshot.to_dict()['projects'][0]['days_since_tge'], int)
+    snapshot.close()
+
+
+def test_both_latest_snapshot_formats_load_and_render_identically(workdir):
+    write_latest_snapshot(SNAPSHOT, 'json')
+    from_json = load_latest_snapshot()
+    write_latest_snapshot(SNAPSHOT, 'columnar')
+    from_columnar = load_latest_snapshot()
+
+    assert isinstance(from_columnar, ColumnarSnapshot)
+    assert from_columnar['metadata'] == from_json['metadata']
+    assert [dict(row.items()) for row in from_columnar['projects']] == from_json['projects']
+    for row, expected in zip(from_columnar['projects'], from_json['projects']):
+        assert render_row(row) == render_row(expected)
+    from_columnar.close()
+
+
+def test_row_view_behaves_like_a_result_dict(workdir):
+    write_snapshot('latest.kcs', SNAPSHOT)
+    snapshot = ColumnarSnapshot('latest.kcs')
+    row = snapshot['projects'][1]
+    assert list(row.keys()) == RESULT_FIELDS and len(row) == len(RESULT_FIELDS)
+    assert 'market_cap' in row and 'nope' not in row
+    assert row.get('market_cap', 0) is None         # Present but empty, as in the JSON dict
+    assert row.get('nope', 'default') == 'default'
+    assert dict(row) == SNAPSHOT['projects'][1]
+    assert json.loads(json.dumps(dict(row))) == SNAPSHOT['projects'][1]
+    snapshot.close()
+
+
+def test_close_while_a_caller_holds_a_column(workdir):
+    write_snapshot('latest.kcs', SNAPSHOT)
+    snapshot = ColumnarSnapshot('latest.kcs')
+    prices = snapshot.column('current_price')
+    snapshot.close()
+    assert prices[2] == 2.5
+    del prices
@@ -0,0 +1,124 @@
+import gzip
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+import dashboard_server
+from dashboard_server import DashboardServer, etag_matches
+from fetch_all_projects import write_latest_snapshot
+
+
+def test_static_views_and_detail_pages_are_served_from_disk(workdir):
+    os.mkdir('projects')
+    for name in ('dashboard_eur.html', 'dashboard_page2.html', os.path.join('projects', 'aaa.html')):
+        with open(name, 'w') as f:
+            f.write(f'<p>{name}</p>')
+    server = DashboardServer(('127.0.0.1', 0))
+    try:
+        assert server.dashboard_view('dashboard_eur.html').content == b'<p>dashboard_eur.html</p>'
+        assert server.dashboard_view('dashboard_page2.html') is not None
+        assert server.detail_page('aaa.html') is not None
+        assert server.dashboard_view('dashboard_missing.html') is None
+        assert server.dashboard_view('dashboard_../secret.html') is None
+        assert server.dashboard_view('history.db') is None
+    finally:
+        server.server_close()
+
+
+def snapshot(timestamp, prices):
+    rows = [{'project_name': symbol.title(), 'twitter': f'@{symbol.lower()}', 'token_symbol': symbol,
+             'tge_date': '2025-01-01', 'days_since_tge': 59, 'tge_price': 1.0, 'current_price': price,
+             'market_cap': price * 1e6, 'volume_24h': 1e4, 'percent_change_24h': 1.0,
+             'percent_change_7d': 2.0, 'percent_change_30d': 3.0, 'all_time_roi': (price - 1) * 100,
+             'timestamp': timestamp}
+            for symbol, price in prices.items()]
+    return {'metadata': {'timestamp': timestamp, 'total_projects': len(rows), 'failed_symbols': []},
+            'projects': rows}
+
+
+@pytest.fixture
+def live_server(workdir):
+    server = DashboardServer(('127.0.0.1', 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get(server, path, headers=None):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    conn.request('GET', path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_etag_revalidation_and_gzip(live_server):
+    live_server.publish(snapshot('2025-03-01T12:00:00', {'AAA': 1.5}), metrics={}, series={})
+
+    response, body = get(live_server, '/')
+    assert response.status == 200 and b'AAA' in body
+    etag = response.getheader('ETag')
+    response, body = get(live_server, '/', {'If-None-Match': f'"other", {etag}'})
+    assert response.status == 304 and body == b''
+    response, _ = get(live_server, '/', {'If-None-Match': etag[:-2] + '"'})     # a prefix is not a match
+    assert response.status == 200
+
+    response, body = get(live_server, '/data.json', {'Accept-Encoding': 'gzip, deflate'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert response.getheader('ETag').endswith('-gz"')
+    assert json.loads(gzip.decompress(body))['rows'][0][2] == 'AAA'
+
+
+def test_etag_matches_whole_tags_only():
+    assert etag_matches('"abc", W/"def"', '"def"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"abcdef"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_renders_once_per_snapshot(workdir, monkeypatch):
+    renders = []
+
+    class Counted(dashboard_server.RenderedDashboard):
+        def __init__(self, *args, **kwargs):
+            renders.append(1)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(dashboard_server, 'RenderedDashboard', Counted)
+    server = DashboardServer(('127.0.0.1', 0))
+    try:
+        write_latest_snapshot(snapshot('2025-03-01T12:00:00', {'AAA': 1.5}), 'json')
+        server.refresh()
+        server.refresh()
+        os.utime('tracker_results_latest.json', ns=(1, 1))      # touched, same snapshot
+        server.refresh()
+        assert len(renders) == 1
+
+        write_latest_snapshot(snapshot('2025-03-01T13:00:00', {'AAA': 1.6}), 'json')
+        os.utime('tracker_results_latest.json', ns=(2, 2))
+        server.refresh()
+        assert len(renders) == 2
+    finally:
+        server.server_close()
+
+
+def test_events_carry_only_changed_rows(workdir):
+    server = DashboardServer(('127.0.0.1', 0))
+    try:
+        server.publish(snapshot('2025-03-01T12:00:00', {'AAA': 1.5, 'BBB': 2.5}), metrics={}, series={})
+        subscriber = server.subscribe()
+        server.publish(snapshot('2025-03-01T13:00:00', {'AAA': 1.5, 'BBB': 3.0}), metrics={}, series={})
+
+        event, data = subscriber.get_nowait().decode().split('\n')[:2]
+        assert event == 'event: rows'
+        assert set(json.loads(data[len('data: '):])['rows']) == {'BBB'}
+
+        server.publish(snapshot('2025-03-01T14:00:00', {'AAA': 1.5}), metrics={}, series={})
+        assert subscriber.get_nowait().startswith(b'event: reload')     # a row went away
+    finally:
+        server.server_close()
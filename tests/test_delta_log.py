@@ -0,0 +1,85 @@
+import json
+import os
+
+from delta_log import DeltaLog
+
+
+def snapshot(timestamp, prices):
+    return {
+        'metadata': {'timestamp': timestamp, 'total_projects': len(prices), 'data_sources': []},
+        'projects': [{'token_symbol': symbol, 'current_price': price, 'timestamp': timestamp}
+                     for symbol, price in prices.items()]
+    }
+
+
+def test_reader_never_truncates_a_record_being_appended(workdir):
+    writer = DeltaLog(keyframe_interval=4)
+    writer.append_snapshot(snapshot('2025-01-01T00:00:00', {'BID': 1.0}))
+    # Another writer's record is on disk but its index line isn't written yet
+    with open(writer.path, 'ab') as f:
+        f.write(b'{"t":"2025-01-01T00:05:00","set":{}}\n')
+    size = os.path.getsize(writer.path)
+
+    reader = DeltaLog()
+    assert os.path.getsize(writer.path) == size
+    assert reader.latest_snapshot()['projects'][0]['current_price'] == 1.0
+    reader.close()
+    writer.close()
+
+
+def test_writer_repairs_a_torn_tail_under_its_lock(workdir):
+    log = DeltaLog(keyframe_interval=4)
+    log.append_snapshot(snapshot('2025-01-01T00:00:00', {'BID': 1.0}))
+    log.close()
+    with open('tracker_history.dlog', 'ab') as f:
+        f.write(b'{"t":"torn')
+    with open('tracker_history.dlog.idx', 'ab') as f:
+        f.write(b'2025-01-01T00:05')
+
+    log = DeltaLog(keyframe_interval=4)
+    assert log.snapshot_timestamps() == ['2025-01-01T00:00:00']
+    log.append_snapshot(snapshot('2025-01-01T00:10:00', {'BID': 2.0}))
+    log.close()
+
+    log = DeltaLog()
+    assert log.snapshot_timestamps() == ['2025-01-01T00:00:00', '2025-01-01T00:10:00']
+    assert [s['projects'][0]['current_price'] for s in log.iter_snapshots()] == [1.0, 2.0]
+    log.close()
+
+
+def test_writers_pick_up_each_others_appends(workdir):
+    a, b = DeltaLog(keyframe_interval=3), DeltaLog(keyframe_interval=3)
+    for minute in range(6):
+        writer = a if minute % 2 == 0 else b
+        writer.append_snapshot(snapshot(f'2025-01-01T00:{minute:02d}:00', {'BID': float(minute), 'IN': 1.0}))
+    a.close()
+    b.close()
+
+    log = DeltaLog()
+    assert [s['projects'][0]['current_price'] for s in log.iter_snapshots()] == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    log.close()
+
+
+def test_unchanged_snapshot_writes_an_empty_delta(workdir):
+    log = DeltaLog(keyframe_interval=10)
+    log.append_snapshot(snapshot('2025-01-01T00:00:00', {'A': 1.0, 'B': 2.0}))
+    log.append_snapshot(snapshot('2025-01-01T00:05:00', {'A': 1.0, 'B': 2.0}))
+    moved = snapshot('2025-01-01T00:10:00', {'A': 1.5, 'B': 2.0})
+    moved['projects'][1]['timestamp'] = '2025-01-01T00:09:59'     # a row stamped on its own
+    log.append_snapshot(moved)
+    log.append_snapshot(snapshot('2025-01-01T00:15:00', {'A': 1.5, 'B': 2.0}))
+    log.close()
+
+    with open('tracker_history.dlog') as f:
+        records = [json.loads(line) for line in f]
+    assert 'set' not in records[1]
+    assert records[2]['set'] == {'A': {'6': 1.5}, 'B': {'13': '2025-01-01T00:09:59'}}
+    assert records[3]['set'] == {'B': {'13': '@'}}
+
+    log = DeltaLog()
+    for stored in log.iter_snapshots():
+        timestamp = stored['metadata']['timestamp']
+        expected = '2025-01-01T00:09:59' if timestamp == '2025-01-01T00:10:00' else timestamp
+        assert [row['timestamp'] for row in stored['projects']] == [timestamp, expected]
+    assert log.snapshot_at('2025-01-01T00:07:00')['projects'][0]['timestamp'] == '2025-01-01T00:05:00'
+    log.close()
@@ -0,0 +1,112 @@
+import threading
+import time
+
+from cmc_client import CMCError
+from fetch_all_projects import CMC_BATCH_SIZE, fetch_quote_batch, get_current_prices_cmc
+
+
+class StubClient:
+    """quotes/latest stand-in: 400 naming the invalid keys, or a fixed error for every request"""
+
+    def __init__(self, invalid=(), error=None):
+        self.invalid = set(invalid)
+        self.error = error
+        self.requests = []
+
+    def get(self, path, params=None):
+        keys = params['symbol'].split(',')
+        self.requests.append(keys)
+        if self.error:
+            raise self.error
+        bad = [k for k in keys if k in self.invalid]
+        if bad:
+            detail = f'Invalid value for "symbol": "{",".join(bad)}"'
+            raise CMCError(f"HTTP 400 from {path}: {detail}", status=400, detail=detail)
+        return {'data': {k: [{'symbol': k}] for k in keys}}
+
+
+def test_named_invalid_keys_are_rejected_and_the_rest_fetched():
+    client = StubClient(invalid={'BAD1', 'BAD2'})
+    keys = [f"K{i}" for i in range(8)] + ['BAD1', 'BAD2']
+    rejected = []
+    payload = fetch_quote_batch(keys, client, 'symbol', rejected)
+    assert sorted(rejected) == ['BAD1', 'BAD2']
+    assert sorted(payload['data']) == sorted(keys[:8])
+    assert len(client.requests) == 2
+
+
+def test_400_that_does_not_name_keys_rejects_nothing():
+    error = CMCError('HTTP 400', status=400, detail='Invalid value for "convert": "XYZ"')
+    client = StubClient(error=error)
+    rejected = []
+    assert fetch_quote_batch([f"K{i}" for i in range(16)], client, 'symbol', rejected) is None
+    assert rejected == []
+    assert len(client.requests) == 1
+
+
+def test_bisection_stops_when_both_halves_fail_the_same_way():
+    # Names a key that isn't in the batch as sent, so it can't be dropped directly
+    error = CMCError('HTTP 400', status=400, detail='Invalid value for "symbol": "???"')
+    client = StubClient(error=error)
+    rejected = []
+    assert fetch_quote_batch([f"K{i}" for i in range(16)], client, 'symbol', rejected) is None
+    assert rejected == []
+    assert len(client.requests) == 3        # the batch and its two halves, no deeper
+
+
+class CulpritClient(StubClient):
+    """Fails any batch holding `culprit` with a 400 that names the key in another form"""
+
+    def __init__(self, culprit, named):
+        super().__init__()
+        self.culprit = culprit
+        self.named = named
+
+    def get(self, path, params=None):
+        keys = params['symbol'].split(',')
+        self.requests.append(keys)
+        if self.culprit in keys:
+            detail = f'Invalid value for "symbol": "{self.named}"'
+            raise CMCError(f"HTTP 400 from {path}: {detail}", status=400, detail=detail)
+        return {'data': {k: [{'symbol': k}] for k in keys}}
+
+
+def test_single_key_is_only_rejected_when_the_error_names_it():
+    client = CulpritClient('K3', named='K-THREE')
+    keys = [f"K{i}" for i in range(8)]
+    rejected = []
+    payload = fetch_quote_batch(keys, client, 'symbol', rejected)
+    assert rejected == []                   # the error never named K3
+    assert sorted(payload['data']) == sorted(k for k in keys if k != 'K3')
+    assert ['K3'] in client.requests
+
+
+class SlowClient:
+    """Echoes every requested key after a short delay, tracking how many requests overlap"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+        self.batches = []
+
+    def get(self, path, params=None):
+        keys = params['symbol'].split(',')
+        with self.lock:
+            self.batches.append(keys)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return {'data': {k: [{'symbol': k}] for k in keys}}
+
+
+def test_large_requests_are_chunked_fetched_concurrently_and_merged():
+    keys = [f"K{i}" for i in range(CMC_BATCH_SIZE * 3 + 7)] + ['K0']      # a duplicate too
+    client = SlowClient()
+    response = get_current_prices_cmc(keys, client=client, max_in_flight=3)
+
+    assert sorted(len(batch) for batch in client.batches) == [7, CMC_BATCH_SIZE, CMC_BATCH_SIZE, CMC_BATCH_SIZE]
+    assert [k for batch in sorted(client.batches, key=lambda b: int(b[0][1:])) for k in batch] == keys[:-1]
+    assert 1 < client.peak <= 3
+    assert sorted(response['data']) == sorted(set(keys))
@@ -0,0 +1,47 @@
+from fx_rates import FXTable, convert_projects, load_fx_table
+
+
+class StubClient:
+    """price-conversion stand-in: 0.9 EUR per USD today, 0.8 on any historical day"""
+
+    def __init__(self, fail_history=False):
+        self.fail_history = fail_history
+        self.calls = []
+
+    def get(self, path, params=None):
+        self.calls.append(params)
+        if 'time' in params and self.fail_history:
+            raise RuntimeError('historical data not available on this plan')
+        rate = 0.8 if 'time' in params else 0.9
+        return {'data': {'quote': {'EUR': {'price': rate}}}}
+
+
+def row(price, tge_price=1.0, tge_date='2025-01-01'):
+    return {'token_symbol': 'AAA', 'current_price': price, 'tge_price': tge_price, 'tge_date': tge_date,
+            'percent_change_24h': None, 'percent_change_7d': None, 'percent_change_30d': None}
+
+
+def test_missing_current_price_converts_to_none():
+    table = FXTable({'EUR': 0.9}, {'2025-01-01': {'EUR': 0.8}})
+    converted = convert_projects([row(None)], 'EUR', table)
+    assert converted[0]['current_price'] is None
+    assert converted[0]['all_time_roi'] is None
+
+
+def test_fetch_records_the_tge_date_rate_once(workdir):
+    client = StubClient()
+    table = load_fx_table(client, ['USD', 'EUR'], tge_dates={'2025-01-01', None})
+    assert table.rate_on('EUR', '2025-01-01') == 0.8
+    assert [c.get('time') for c in client.calls] == [None, '2025-01-01T00:00:00Z']
+
+    converted = convert_projects([row(2.0)], 'EUR', table)
+    assert converted[0]['all_time_roi'] == (2.0 * 0.9 / 0.8 - 1) * 100
+
+    load_fx_table(client, ['USD', 'EUR'], tge_dates={'2025-01-01'})
+    assert len(client.calls) == 2               # fresh table, day already recorded
+
+
+def test_unavailable_historical_rates_leave_roi_empty(workdir):
+    table = load_fx_table(StubClient(fail_history=True), ['USD', 'EUR'], tge_dates={'2025-01-01'})
+    assert table.rate('EUR') == 0.9
+    assert convert_projects([row(2.0)], 'EUR', table)[0]['all_time_roi'] is None
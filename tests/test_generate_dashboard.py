@@ -0,0 +1,56 @@
+import io
+import re
+
+from generate_dashboard import generate_dashboard, render_rows, write_page
+
+
+def snapshot(n):
+    timestamp = '2025-03-01T12:00:00'
+    rows = [{'project_name': f'Project {i}', 'twitter': f'@p{i}', 'token_symbol': f'T{i}',
+             'tge_date': '2025-01-01', 'days_since_tge': 59, 'tge_price': 1.0, 'current_price': 1.0 + i,
+             'market_cap': 1e6 * (i + 1), 'volume_24h': 1e4, 'percent_change_24h': float(i),
+             'percent_change_7d': 2.0, 'percent_change_30d': 3.0, 'all_time_roi': 100.0 * i,
+             'timestamp': timestamp}
+            for i in range(n)]
+    return {'metadata': {'timestamp': timestamp, 'total_projects': n, 'failed_symbols': []}, 'projects': rows}
+
+
+def render(workdir, page_size, output='dashboard.html'):
+    generate_dashboard(output=output, page_size=page_size, data=snapshot(5), metrics={}, series={},
+                       detail_pages=False, currencies=['USD'])
+
+
+def rows_of(html):
+    return re.findall(r'<tr id="row-.*?</tr>', html, re.S)
+
+
+def test_page_size_writes_linked_pages(workdir):
+    render(workdir, page_size=2)
+    assert sorted(p.name for p in workdir.glob('dashboard*.html')) == [
+        'dashboard.html', 'dashboard_page2.html', 'dashboard_page3.html']
+
+    pages = [(workdir / name).read_text() for name in ('dashboard.html', 'dashboard_page2.html',
+                                                       'dashboard_page3.html')]
+    assert [len(rows_of(page)) for page in pages] == [2, 2, 1]
+    assert 'rel="prev"' not in pages[0] and '<a href="dashboard_page2.html" rel="next">' in pages[0]
+    assert '<a href="dashboard.html" rel="prev">' in pages[1]
+    assert '<a href="dashboard_page3.html" rel="next">' in pages[1]
+    assert '<a href="dashboard_page2.html" rel="prev">' in pages[2] and 'rel="next"' not in pages[2]
+    assert '<span class="current">3</span>' in pages[2]
+
+
+def test_paged_and_streamed_output_match_the_single_page(workdir):
+    render(workdir, page_size=None, output='single.html')
+    single = (workdir / 'single.html').read_text()
+    assert not list(workdir.glob('single_page*.html'))
+
+    render(workdir, page_size=2, output='paged.html')
+    paged = [(workdir / name).read_text() for name in ('paged.html', 'paged_page2.html', 'paged_page3.html')]
+    assert [row for page in paged for row in rows_of(page)] == rows_of(single)
+
+    projects = snapshot(5)['projects']
+    chunked, whole = io.StringIO(), io.StringIO()
+    write_page(chunked, '<head>', render_rows(projects), '<tail>', rows_per_write=2)
+    write_page(whole, '<head>', render_rows(projects), '<tail>', rows_per_write=1000)
+    assert chunked.getvalue() == whole.getvalue()
+    assert rows_of(whole.getvalue()) == rows_of(single)
@@ -0,0 +1,73 @@
+import json
+import sqlite3
+
+from history_store import HistoryStore
+
+
+def snapshot(timestamp, prices):
+    return {'metadata': {'timestamp': timestamp, 'total_projects': len(prices), 'data_sources': ['CMC']},
+            'projects': [{'token_symbol': symbol, 'current_price': price, 'timestamp': timestamp}
+                         for symbol, price in prices.items()]}
+
+
+def test_query_range_bounds_are_inclusive(workdir):
+    store = HistoryStore('history.db')
+    for day in range(1, 5):
+        store.append_snapshot(snapshot(f'2025-01-0{day}T00:00:00', {'AAA': float(day), 'BBB': 0.0}))
+
+    def prices(**bounds):
+        return [row['current_price'] for row in store.query_range('AAA', **bounds)]
+
+    assert prices() == [1.0, 2.0, 3.0, 4.0]
+    assert prices(start='2025-01-02T00:00:00', end='2025-01-03T00:00:00') == [2.0, 3.0]
+    assert prices(start='2025-01-03T00:00:01') == [4.0]
+    assert prices(end='2025-01-01T00:00:00') == [1.0]
+    assert store.query_range('CCC') == []
+    store.close()
+
+
+def test_import_is_idempotent_and_skips_corrupt_files(workdir, capsys):
+    for day in (1, 2):
+        (workdir / f'tracker_results_0{day}.json').write_text(
+            json.dumps(snapshot(f'2025-01-0{day}T00:00:00', {'AAA': float(day)})))
+    (workdir / 'tracker_results_03.json').write_text('{"metadata": ')
+    paths = [str(p) for p in workdir.glob('tracker_results_*.json')]
+
+    store = HistoryStore('history.db')
+    assert store.import_json_snapshots(paths) == 2
+    assert 'Skipping' in capsys.readouterr().out
+    assert store.import_json_snapshots(paths) == 0
+    assert store.snapshot_timestamps() == ['2025-01-01T00:00:00', '2025-01-02T00:00:00']
+    assert len(store.query_range('AAA')) == 2
+    store.close()
+
+
+def test_old_database_gains_the_new_columns(workdir):
+    conn = sqlite3.connect('history.db')
+    conn.executescript("""
+        CREATE TABLE snapshots (id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL UNIQUE,
+                                total_projects INTEGER NOT NULL, data_sources TEXT);
+        CREATE TABLE quotes (snapshot_id INTEGER NOT NULL, project_name TEXT, twitter TEXT,
+                             token_symbol TEXT NOT NULL, tge_date TEXT, days_since_tge INTEGER,
+                             tge_price REAL, current_price REAL, market_cap REAL, volume_24h REAL,
+                             percent_change_24h REAL, percent_change_7d REAL, percent_change_30d REAL,
+                             all_time_roi REAL, timestamp TEXT NOT NULL);
+        INSERT INTO snapshots VALUES (1, '2025-01-01T00:00:00', 1, '[]');
+        INSERT INTO quotes (snapshot_id, token_symbol, current_price, timestamp)
+            VALUES (1, 'AAA', 1.0, '2025-01-01T00:00:00');
+    """)
+    conn.close()
+
+    store = HistoryStore('history.db')
+    old = store.latest_snapshot()
+    assert old['metadata']['failed_symbols'] == []
+    assert old['projects'][0]['quote_source'] is None
+
+    data = snapshot('2025-01-02T00:00:00', {'AAA': 2.0})
+    data['metadata']['failed_symbols'] = ['BBB']
+    data['projects'][0]['quote_source'] = 'cmc'
+    store.append_snapshot(data)
+    latest = store.latest_snapshot()
+    assert latest['metadata']['failed_symbols'] == ['BBB']
+    assert latest['projects'][0]['quote_source'] == 'cmc'
+    store.close()
@@ -0,0 +1,52 @@
+import json
+import os
+
+from instrumentation import Instrumentation
+
+
+def test_prometheus_exposition():
+    metrics = Instrumentation()
+    metrics.observe('stage', 0.5, stage='fetch')
+    metrics.observe('stage', 1.5, stage='fetch')
+    metrics.observe('stage', 0.25, stage='compute')
+    metrics.inc('cmc_responses', endpoint='/v1/q', status=429)
+    metrics.inc('cmc_responses', 2, status='Timeout', endpoint='/v1/q')
+    metrics.inc('cmc_responses', endpoint='/v1/q', status=200)
+    metrics.set('last_run_success', 1)
+    metrics.set('note', 1, text='say "hi"\\n')
+
+    assert metrics.to_prometheus('fetch').splitlines() == [
+        '# TYPE kaito_tracker_stage_seconds summary',
+        'kaito_tracker_stage_seconds_count{job="fetch",stage="compute"} 1',
+        'kaito_tracker_stage_seconds_sum{job="fetch",stage="compute"} 0.250000',
+        'kaito_tracker_stage_seconds_count{job="fetch",stage="fetch"} 2',
+        'kaito_tracker_stage_seconds_sum{job="fetch",stage="fetch"} 2.000000',
+        '# TYPE kaito_tracker_stage_seconds_max gauge',
+        'kaito_tracker_stage_seconds_max{job="fetch",stage="compute"} 0.250000',
+        'kaito_tracker_stage_seconds_max{job="fetch",stage="fetch"} 1.500000',
+        '# TYPE kaito_tracker_cmc_responses_total counter',
+        'kaito_tracker_cmc_responses_total{job="fetch",endpoint="/v1/q",status="200"} 1',
+        'kaito_tracker_cmc_responses_total{job="fetch",endpoint="/v1/q",status="429"} 1',
+        'kaito_tracker_cmc_responses_total{job="fetch",endpoint="/v1/q",status="Timeout"} 2',
+        '# TYPE kaito_tracker_last_run_success gauge',
+        'kaito_tracker_last_run_success{job="fetch"} 1',
+        '# TYPE kaito_tracker_note gauge',
+        'kaito_tracker_note{job="fetch",text="say \\"hi\\"\\\\n"} 1',
+    ]
+
+
+def test_export_writes_both_files_atomically(workdir):
+    metrics = Instrumentation()
+    metrics.inc('runs')
+    path = metrics.export('fetch', directory='metrics')
+
+    assert path == os.path.join('metrics', 'fetch.prom')
+    assert sorted(os.listdir('metrics')) == ['fetch.json', 'fetch.prom']     # no .tmp left behind
+    assert 'kaito_tracker_runs_total{job="fetch"} 1' in open(path).read()
+    exported = json.load(open(os.path.join('metrics', 'fetch.json')))
+    assert exported['job'] == 'fetch'
+    assert exported['counters']['runs'] == [{'labels': {}, 'value': 1}]
+
+    metrics.inc('runs')
+    metrics.export('fetch', directory='metrics')
+    assert 'kaito_tracker_runs_total{job="fetch"} 2' in open(path).read()
@@ -0,0 +1,104 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+import pipeline
+from history_store import open_history_store
+from pipeline import StagedPipeline
+
+PROJECTS = [
+    {'name': 'Alpha', 'twitter': '@alpha', 'token_symbol': 'AAA', 'tge_date': '2025-01-01', 'tge_price': 1.0},
+    {'name': 'Beta', 'twitter': '@beta', 'token_symbol': 'BBB', 'tge_date': '2025-01-02', 'tge_price': 2.0},
+]
+
+
+def quote_batches(keys, cache=None, by='symbol', blocklist=None):
+    yield {'data': {
+        key: [{'quote': {'USD': {'price': 1.5, 'market_cap': 1e6, 'volume_24h': 1e4, 'percent_change_24h': 1.0,
+                                 'percent_change_7d': 2.0, 'percent_change_30d': 3.0}}}]
+        for key in keys
+    }}
+
+
+def staged_run(monkeypatch):
+    monkeypatch.setattr(pipeline, 'iter_quote_batches', quote_batches)
+    run = StagedPipeline(PROJECTS, 'dashboard.html', run_time=datetime(2025, 3, 1, 12, 0), detail_pages=False)
+    stages = run.run()
+    assert not any(stage.error for stage in stages)
+    return run
+
+
+def stored_snapshot():
+    store = open_history_store()
+    snapshot = store.latest_snapshot()
+    store.close()
+    return snapshot
+
+
+def test_failed_render_commits_nothing(workdir, monkeypatch):
+    run = staged_run(monkeypatch)
+
+    def broken_page(*args, **kwargs):
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(pipeline, 'write_page', broken_page)
+    with pytest.raises(RuntimeError):
+        try:
+            run.write_dashboard()
+            run.commit()
+        finally:
+            run.close()
+
+    assert stored_snapshot() is None
+    assert not (workdir / 'dashboard.html').exists()
+    assert not (workdir / 'dashboard.html.tmp').exists()
+
+
+def test_snapshot_is_committed_after_the_page(workdir, monkeypatch):
+    run = staged_run(monkeypatch)
+    assert stored_snapshot() is None                # still staged while the page renders
+    run.write_dashboard()
+    run.commit()
+    run.close()
+
+    snapshot = stored_snapshot()
+    assert [row['token_symbol'] for row in snapshot['projects']] == ['AAA', 'BBB']
+    assert (workdir / 'dashboard.html').exists()
+
+
+def test_slow_render_throttles_fetch_at_the_queue_bound(workdir, monkeypatch):
+    projects = [dict(PROJECTS[0], token_symbol=f'T{i}', name=f'Token {i}') for i in range(20)]
+    fetched, rendered = [], []
+    release = threading.Event()
+
+    def one_batch_per_key(keys, cache=None, by='symbol', blocklist=None):
+        for key in keys:
+            fetched.append(time.perf_counter())
+            yield from quote_batches([key])
+
+    original_render = StagedPipeline.render
+
+    def slow_render(self, item):
+        release.wait(5)
+        rendered.append(time.perf_counter())
+        original_render(self, item)
+
+    monkeypatch.setattr(pipeline, 'iter_quote_batches', one_batch_per_key)
+    monkeypatch.setattr(StagedPipeline, 'render', slow_render)
+    run = StagedPipeline(projects, 'dashboard.html', run_time=datetime(2025, 3, 1, 12, 0),
+                         queue_size=1, detail_pages=False)
+    runner = threading.Thread(target=run.run)
+    runner.start()
+    time.sleep(0.3)
+    # One batch in each of the three queues, one held by each stage, one waiting to be put
+    assert len(fetched) <= 3 * 1 + 3 + 1
+    release.set()
+    runner.join(5)
+
+    assert len(fetched) == len(rendered) == 20
+    assert rendered[0] < fetched[-1]                # rendering started before fetching finished
+    assert run.stages[0].blocked > 0.2              # the fetcher waited on the full queue
+    assert len(run.snapshot['projects']) == 20
+    run.close()
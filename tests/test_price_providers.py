@@ -0,0 +1,95 @@
+import threading
+import time
+
+from price_providers import CMCProvider, HedgedQuotes, ProviderStats, StagedCache, StubProvider
+from quote_cache import QuoteCache
+
+PROJECTS = [{'token_symbol': 'AAA'}, {'token_symbol': 'BBB'}]
+
+
+def quote(price, market_cap=1000.0):
+    return {'price': price, 'market_cap': market_cap, 'volume_24h': 10.0,
+            'percent_change_24h': 1.0, 'percent_change_7d': 2.0, 'percent_change_30d': 3.0}
+
+
+def test_fast_backup_wins_and_slow_loser_is_not_a_success():
+    slow = StubProvider('slow', {'AAA': quote(1.0), 'BBB': quote(2.0)}, latency=0.5)
+    fast = StubProvider('fast', {'AAA': quote(1.5), 'BBB': quote(2.5)})
+    stats = ProviderStats(path=None)
+    hedged = HedgedQuotes([slow, fast], hedge_after=0.05, stats=stats)
+
+    merged, provenance = hedged.fetch(PROJECTS)
+
+    assert merged['AAA']['price'] == 1.5
+    assert provenance['BBB']['price'] == 'fast'
+    assert stats.stats['fast']['calls'] == 1
+    assert stats.stats['slow']['calls'] == 0       # abandoned, not counted as an answer
+    assert stats.stats['slow']['failure_rate'] == 0.0
+
+
+def test_abandoned_provider_keeps_its_failure_rate():
+    stats = ProviderStats(path=None)
+    stats.record('slow', 0.1, False)
+    stats.record_abandoned('slow', 0.4)
+    assert stats.stats['slow']['failure_rate'] == 1.0
+    assert stats.stats['slow']['calls'] == 1
+    assert stats.stats['slow']['latency'] > 0.1
+
+
+def test_quote_without_price_is_filled_from_backup_or_dropped():
+    primary = StubProvider('primary', {'AAA': quote(None), 'BBB': quote(None)})
+    backup = StubProvider('backup', {'AAA': quote(3.0, market_cap=None)})
+    hedged = HedgedQuotes([primary, backup], hedge_after=0.5, stats=ProviderStats(path=None))
+
+    merged, provenance = hedged.fetch(PROJECTS)
+    assert merged['AAA']['price'] == 3.0
+    assert provenance['AAA']['price'] == 'backup'
+    assert 'BBB' not in merged                      # nobody priced it
+
+    response = hedged.fetch_response(PROJECTS)
+    assert set(response['data']) == {'AAA'}
+
+
+def test_failed_provider_is_recorded_as_failure():
+    broken = StubProvider('broken', {}, error=RuntimeError('down'))
+    good = StubProvider('good', {'AAA': quote(1.0), 'BBB': quote(2.0)})
+    stats = ProviderStats(path=None)
+    merged, _ = HedgedQuotes([broken, good], hedge_after=1.0, stats=stats).fetch(PROJECTS)
+    assert set(merged) == {'AAA', 'BBB'}
+    assert stats.stats['broken']['failure_rate'] == 1.0
+
+
+def test_abandoned_fetch_does_not_write_the_quote_cache(workdir):
+    cache = QuoteCache(path=str(workdir / 'cache.json'))
+    staged = StagedCache(cache)
+    staged.update({'symbol:AAA': {'price': 1.0}})
+    abandoned = threading.Event()
+    abandoned.set()
+    assert not staged.commit(abandoned)
+    assert cache.entries == {}
+    assert not (workdir / 'cache.json').exists()
+
+    staged.commit(threading.Event())
+    assert 'symbol:AAA' in QuoteCache(path=str(workdir / 'cache.json')).entries
+
+
+def test_cmc_loser_discards_its_cache_writes(workdir, monkeypatch):
+    import fetch_all_projects
+
+    def slow_quotes(projects, client=None, cache=None, blocklist=None):
+        time.sleep(0.3)
+        cache.update({'symbol:AAA': {'price': 9.0}})
+        cache.save()
+        return {'data': {'AAA': [{'quote': {'USD': quote(9.0)}}]}}
+
+    monkeypatch.setattr(fetch_all_projects, 'fetch_quotes_for_projects', slow_quotes)
+    cache = QuoteCache(path=str(workdir / 'cache.json'))
+    cmc = CMCProvider(cache=cache)
+    fast = StubProvider('fast', {'AAA': quote(1.0)})
+    hedged = HedgedQuotes([cmc, fast], hedge_after=0.05, stats=ProviderStats(path=None))
+
+    merged, _ = hedged.fetch(PROJECTS[:1])
+    time.sleep(0.5)                                 # let the loser finish
+
+    assert merged['AAA']['price'] == 1.0
+    assert cache.entries == {}
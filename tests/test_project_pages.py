@@ -0,0 +1,32 @@
+from project_pages import MANIFEST_FILE, render_project_pages
+
+
+def row(symbol, price, timestamp='2025-03-01T12:00:00'):
+    return {'project_name': symbol.title(), 'twitter': f'@{symbol.lower()}', 'token_symbol': symbol,
+            'tge_date': '2025-01-01', 'days_since_tge': 59, 'tge_price': 1.0, 'current_price': price,
+            'market_cap': price * 1e6, 'volume_24h': 1e4, 'percent_change_24h': 1.0,
+            'percent_change_7d': 2.0, 'percent_change_30d': 3.0, 'all_time_roi': (price - 1) * 100,
+            'timestamp': timestamp}
+
+
+def test_only_changed_pages_are_rendered(workdir):
+    out = str(workdir / 'projects')
+    series = {'AAA': [(0.0, 1.0), (60.0, 1.5)], 'BBB': [(0.0, 2.0), (60.0, 2.5)]}
+    assert render_project_pages([row('AAA', 1.5), row('BBB', 2.5)], series=series, output_dir=out) == (2, 0, 0)
+    assert (workdir / 'projects' / MANIFEST_FILE).exists()
+
+    # A later poll at the same prices (and its timestamp) changes nothing on the page
+    series['AAA'].append((120.0, 1.5))
+    later = [row('AAA', 1.5, '2025-03-01T13:00:00'), row('BBB', 2.5, '2025-03-01T13:00:00')]
+    assert render_project_pages(later, series=series, output_dir=out) == (0, 2, 0)
+
+    series['BBB'].append((120.0, 3.0))
+    assert render_project_pages([row('AAA', 1.5), row('BBB', 3.0)], series=series, output_dir=out) == (1, 1, 0)
+
+    (workdir / 'projects' / 'AAA.html').unlink()        # a missing page is re-rendered
+    assert render_project_pages([row('AAA', 1.5)], series=series, output_dir=out) == (1, 0, 1)
+    assert not (workdir / 'projects' / 'BBB.html').exists()
+
+    (workdir / 'projects' / 'GONE.html').write_text('<p>untracked</p>')    # not in any manifest
+    assert render_project_pages([row('AAA', 1.5)], series=series, output_dir=out, force=True) == (1, 0, 1)
+    assert sorted(p.name for p in (workdir / 'projects').iterdir()) == ['AAA.html', MANIFEST_FILE]
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from project_registry import ProjectRegistry, RegistryError, validate_project
+
+ALPHA = {'name': 'Alpha', 'twitter': '@alpha', 'token_symbol': 'AAA'}
+
+
+def test_add_rejects_a_duplicate_symbol(workdir):
+    (workdir / 'projects_database.json').write_text(json.dumps([ALPHA]))
+    registry = ProjectRegistry()
+
+    with pytest.raises(RegistryError):
+        registry.add(dict(ALPHA, name='Impostor'))
+    assert registry.get('AAA')['name'] == 'Alpha'
+    assert ProjectRegistry().get('AAA')['name'] == 'Alpha'     # nothing journaled
+
+    registry.add(dict(ALPHA, token_symbol='BBB'))
+    registry.upsert(dict(ALPHA, name='Renamed'))
+    assert [p['name'] for p in ProjectRegistry().projects] == ['Renamed', 'Alpha']
+
+
+def write_database(workdir, projects):
+    (workdir / 'projects_database.json').write_text(json.dumps(projects))
+
+
+def test_validation_reports_every_problem(workdir):
+    write_database(workdir, [
+        ALPHA,
+        {'name': 'B', 'twitter': '@b', 'token_symbol': 'BBB', 'tge_date': '2025-13-01', 'tge_price': -1},
+        {'name': 'C', 'token_symbol': 'CCC', 'cmc_id': '12'},
+        dict(ALPHA, name='Again'),
+    ])
+    with pytest.raises(RegistryError) as error:
+        ProjectRegistry()
+    assert error.value.problems == [
+        "BBB: tge_date should be YYYY-MM-DD, got '2025-13-01'",
+        "BBB: tge_price should be positive, got -1",
+        "CCC: missing twitter",
+        "CCC: cmc_id should be int, got '12'",
+        "AAA: duplicate token_symbol",
+    ]
+    assert validate_project(dict(ALPHA, token_symbol=' ')) == [" : empty token_symbol"]
+    assert validate_project(dict(ALPHA, tge_price=True)) == ["AAA: tge_price should be int/float, got True"]
+    assert validate_project('AAA') == ["not an object: 'AAA'"]
+
+
+def test_indexes_follow_adds_and_removes(workdir):
+    write_database(workdir, [dict(ALPHA, category='AI', tge_date='2025-02-01'),
+                             {'name': 'Beta', 'twitter': '@b', 'token_symbol': 'BBB', 'tge_date': '2025-01-01'}])
+    registry = ProjectRegistry()
+    assert registry.categories() == ['AI', 'Uncategorized']
+    assert [p['token_symbol'] for p in registry.tge_between('2025-01-01', '2025-01-31')] == ['BBB']
+
+    registry.add({'name': 'Gamma', 'twitter': '@g', 'token_symbol': 'GGG', 'category': 'AI',
+                  'tge_date': '2025-01-15'})
+    registry.remove('AAA')
+    assert [p['token_symbol'] for p in registry.in_category('AI')] == ['GGG']
+    assert [p['token_symbol'] for p in registry.tge_between(start='2025-01-10')] == ['GGG']
+    assert [p['token_symbol'] for p in registry.tge_between()] == ['BBB', 'GGG']
+
+
+def test_journal_replay_rebuilds_the_same_state(workdir):
+    write_database(workdir, [ALPHA])
+    registry = ProjectRegistry()
+    registry.add(dict(ALPHA, token_symbol='BBB', name='Beta'))
+    registry.upsert(dict(ALPHA, tge_price=0.5))
+    registry.remove('BBB')
+    registry.mark_current('render')
+
+    replayed = ProjectRegistry()
+    assert replayed.projects == registry.projects
+    assert replayed.content_hash == registry.content_hash
+    assert replayed.is_current('render') and not replayed.is_current('render', extra='eur')
+
+    with open('projects_journal.jsonl', 'a') as f:       # crashed half-way through an append
+        f.write('{"op":"upsert","project":{"name":"Ha')
+    crashed = ProjectRegistry()
+    assert crashed.content_hash == registry.content_hash
+    crashed.add(dict(ALPHA, token_symbol='CCC', name='Gamma'))
+    assert [p['token_symbol'] for p in ProjectRegistry().projects] == ['AAA', 'CCC']
+    assert not ProjectRegistry().is_current('render')
+
+    crashed.compact()
+    assert not (workdir / 'projects_journal.jsonl').exists()
+    assert [p['token_symbol'] for p in ProjectRegistry().projects] == ['AAA', 'CCC']
@@ -0,0 +1,66 @@
+import time
+
+from fetch_all_projects import get_current_prices_cmc
+from quote_cache import QuoteCache
+
+
+class CountingClient:
+    """quotes/latest stand-in that records every requested key"""
+
+    def __init__(self):
+        self.requested = []
+
+    def get(self, path, params=None):
+        by = 'id' if 'id' in params else 'symbol'
+        keys = params[by].split(',')
+        self.requested += keys
+        return {'data': {k: {'by': by, 'key': k} for k in keys}}
+
+
+def test_fresh_entries_are_served_and_expired_ones_requested(workdir):
+    cache = QuoteCache(path='cache.json', ttl=60)
+    cache.update({'symbol:AAA': 1, 'symbol:BBB': 2}, now=1000)
+    fresh, stale = cache.split(['symbol:AAA', 'symbol:BBB', 'symbol:CCC'], now=1059)
+    assert fresh == {'symbol:AAA': 1, 'symbol:BBB': 2} and stale == ['symbol:CCC']
+    assert cache.split(['symbol:AAA'], now=1060) == ({}, ['symbol:AAA'])
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_only_stale_keys_are_fetched_and_ids_are_separate_from_symbols(workdir):
+    cache = QuoteCache(path='cache.json', ttl=300)
+    client = CountingClient()
+    get_current_prices_cmc(['1', '2'], client=client, cache=cache, by='id')
+    response = get_current_prices_cmc(['1', 'BTC'], client=client, cache=cache, by='symbol')
+
+    assert client.requested == ['1', '2', '1', 'BTC']   # symbol "1" is not the cached id 1
+    assert response['data']['1']['by'] == 'symbol'
+    assert set(cache.entries) == {'id:1', 'id:2', 'symbol:1', 'symbol:BTC'}
+
+    again = get_current_prices_cmc(['1', '2'], client=client, cache=cache, by='id')
+    assert len(client.requested) == 4 and again['data']['2'] == {'by': 'id', 'key': '2'}
+
+    for entry in cache.entries.values():
+        entry['fetched_at'] = time.time() - 301
+    get_current_prices_cmc(['2'], client=client, cache=cache, by='id')
+    assert client.requested[-1] == '2'
+
+
+def test_cache_survives_a_reload_and_evicts_oldest(workdir):
+    cache = QuoteCache(path='cache.json', max_entries=2)
+    cache.update({'symbol:OLD': 0}, now=1)
+    cache.update({'symbol:MID': 1}, now=2)
+    cache.update({'symbol:NEW': 2}, now=3)
+    cache.save()
+
+    reloaded = QuoteCache(path='cache.json', ttl=10)
+    assert set(reloaded.entries) == {'symbol:MID', 'symbol:NEW'}
+    assert reloaded.split(['symbol:NEW'], now=5)[0] == {'symbol:NEW': 2}
+
+    (workdir / 'cache.json').write_text('{corrupt')
+    assert QuoteCache(path='cache.json').entries == {}
+
+
+def test_credits_saved_rounds_up_per_hundred_hits(workdir):
+    cache = QuoteCache(path='cache.json')
+    cache.hits = 101
+    assert cache.credits_saved() == 2
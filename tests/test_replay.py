@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from fetch_all_projects import process_projects, snapshot_data
+from history_store import HistoryStore
+from replay import diff_rows, replay
+
+PROJECTS = [
+    {'name': 'Alpha', 'twitter': '@alpha', 'token_symbol': 'AAA', 'tge_date': '2025-01-01', 'tge_price': 1.0},
+    {'name': 'Beta', 'twitter': '@beta', 'token_symbol': 'BBB', 'tge_date': '2025-01-02', 'tge_price': 2.0},
+]
+
+
+def response(prices):
+    return {'data': {
+        symbol: [{'quote': {'USD': {'price': price, 'market_cap': price * 1e6, 'volume_24h': 1e4,
+                                    'percent_change_24h': 1.0, 'percent_change_7d': 2.0,
+                                    'percent_change_30d': 3.0}}}]
+        for symbol, price in prices.items()
+    }}
+
+
+def legacy_snapshot(started, prices):
+    """Like the old fetch: every row stamped with its own datetime.now(), the snapshot a bit later"""
+    rows = []
+    for offset, project in enumerate(PROJECTS):
+        rows += process_projects([project], response(prices), verbose=False,
+                                 now=started + timedelta(seconds=30 * offset))
+    return snapshot_data(rows, now=started + timedelta(minutes=1))
+
+
+def stored_history(store):
+    # Rows straddle midnight, so a single replay clock would shift days_since_tge too
+    store.append_snapshot(legacy_snapshot(datetime(2025, 3, 1, 23, 59, 45), {'AAA': 1.5, 'BBB': 2.5}))
+    now = datetime(2025, 3, 2, 12, 0)
+    store.append_snapshot(snapshot_data(
+        process_projects(PROJECTS, response({'AAA': 1.6, 'BBB': 2.4}), verbose=False, now=now), now=now))
+
+
+def test_replay_reproduces_legacy_and_current_snapshots(workdir):
+    source = HistoryStore('history.db')
+    stored_history(source)
+    legacy = next(source.iter_snapshots())
+    assert {row['timestamp'][:10] for row in legacy['projects']} == {'2025-03-01', '2025-03-02'}
+
+    target = HistoryStore('replayed.db')
+    stats = replay(source, target, output_dir=str(workdir))
+    assert stats['snapshots'] == 2
+    assert stats['mismatches'] == 0, stats['examples']
+
+    replayed = list(target.iter_snapshots())
+    assert [r['timestamp'] for r in replayed[0]['projects']] == [r['timestamp'] for r in legacy['projects']]
+    source.close()
+    target.close()
+
+
+def test_diff_rows_reports_changed_fields():
+    stored = [{'token_symbol': 'AAA', 'current_price': 1.0}]
+    assert diff_rows(stored, [{'token_symbol': 'AAA', 'current_price': 2.0}]) == [('AAA', 'current_price', 1.0, 2.0)]
+    assert diff_rows(stored, []) == [('AAA', 'row', 'present', 'missing')]
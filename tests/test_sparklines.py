@@ -0,0 +1,12 @@
+from sparklines import render_roi_chart
+
+
+def test_roi_chart_skips_series_without_two_positive_prices():
+    projects = [{'token_symbol': 'ZERO', 'tge_price': 1.0, 'all_time_roi': 50.0},
+                {'token_symbol': 'UP', 'tge_price': 1.0, 'all_time_roi': 10.0}]
+    series = {'ZERO': [(0.0, 0.0), (60.0, 1.5)], 'UP': [(0.0, 1.0), (60.0, 1.1)]}
+
+    chart = render_roi_chart(projects, series)
+    assert 'UP' in chart and 'ZERO' not in chart
+
+    assert render_roi_chart(projects[:1], series) == ''
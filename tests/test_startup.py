@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET = 0.1        # Seconds `kaito_tracker.py --help` may add over a bare interpreter
+RUNS = 5
+
+
+def best_seconds(cmd):
+    """Fastest of RUNS wall times (the least noisy estimate on a busy machine)"""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=REPO_DIR, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_cli_import_pulls_in_no_heavy_modules():
+    out = subprocess.run(
+        [sys.executable, '-c', "import sys, kaito_tracker; "
+                               "print(','.join(m for m in ('numpy', 'requests', 'config') if m in sys.modules))"],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert out == ''
+
+
+def test_cli_help_starts_within_budget():
+    bare = best_seconds([sys.executable, '-c', 'pass'])
+    cli = best_seconds([sys.executable, os.path.join(REPO_DIR, 'kaito_tracker.py'), '--help'])
+    assert cli - bare < STARTUP_BUDGET, f"--help took {cli * 1000:.0f} ms vs {bare * 1000:.0f} ms bare"
@@ -0,0 +1,40 @@
+import os
+
+from tge_backfill import OHLCVIndex, csv_batches
+
+
+def write(path, text, mtime=None):
+    with open(path, 'w') as f:
+        f.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def test_missing_open_column_reads_as_none_not_another_column(workdir):
+    write('dump.csv', 'symbol,date,close,volume\nBID,2025-01-23,0.5,123456\n')
+    assert list(csv_batches('dump.csv')) == [[('BID', '2025-01-23', None, '0.5')]]
+
+    index = OHLCVIndex()
+    index.ingest(['dump.csv'])
+    assert index.lookup('BID', '2025-01-23') == (0.5, 'close', 'dump.csv')
+
+
+def test_reingesting_a_corrected_dump_replaces_its_values(workdir):
+    write('dump.csv', 'symbol,date,open,close\nBID,2025-01-23,9.9,1.0\n', mtime=1_700_000_000)
+    index = OHLCVIndex()
+    index.ingest(['dump.csv'])
+    assert index.lookup('BID', '2025-01-23')[0] == 9.9
+
+    write('dump.csv', 'symbol,date,open,close\nBID,2025-01-23,0.99,1.0\n', mtime=1_700_000_100)
+    ingested, _, skipped = index.ingest(['dump.csv'])
+    assert (ingested, skipped) == (1, 0)
+    assert index.lookup('BID', '2025-01-23') == (0.99, 'open', 'dump.csv')
+
+
+def test_earliest_open_wins_across_files(workdir):
+    write('late.csv', 'symbol,timestamp,open\nBID,2025-01-23T12:00:00Z,2.0\n')
+    write('early.csv', 'symbol,timestamp,open\nBID,2025-01-23T01:00:00Z,1.0\n')
+    index = OHLCVIndex()
+    index.ingest(['late.csv', 'early.csv'])
+    assert index.lookup('BID', '2025-01-23') == (1.0, 'open', 'early.csv')
+    assert index.stats()['days'] == 1
@@ -0,0 +1,54 @@
+import watch
+from instrumentation import instrumentation
+from symbol_blocklist import SymbolBlocklist
+from watch import CreditBudget, WatchScheduler, credits_for, quote_key
+
+
+def projects(ids, symbols):
+    return ([{'token_symbol': f"I{i}", 'cmc_id': 1000 + i} for i in range(ids)] +
+            [{'token_symbol': f"S{i}"} for i in range(symbols)])
+
+
+def test_ids_and_tickers_are_billed_as_separate_batches():
+    assert credits_for(projects(0, 100)) == 1
+    assert credits_for(projects(50, 50)) == 2       # one id batch plus one symbol batch
+    assert credits_for(projects(150, 1)) == 3
+    assert credits_for([]) == 0
+
+
+def test_blocklisted_keys_are_not_billed(workdir):
+    blocklist = SymbolBlocklist()
+    blocklist.add('symbol:S0')
+    assert credits_for(projects(1, 1), blocklist=blocklist) == 1
+
+
+def test_plan_packs_each_key_type_within_the_credits():
+    tracked = projects(3, 3)
+    scheduler = WatchScheduler([p['token_symbol'] for p in tracked], batch_size=2,
+                               key_types={p['token_symbol']: quote_key(p)[0] for p in tracked})
+    scheduler.credits_per_batch = 1
+    planned = scheduler.plan(now=1.0, credits=3)
+    assert credits_for([p for p in tracked if p['token_symbol'] in planned], batch_size=2) <= 3
+    assert planned == ['I0', 'I1', 'I2', 'S0', 'S1']
+
+    everything = scheduler.plan(now=1.0, credits=10)
+    assert sorted(everything) == sorted(p['token_symbol'] for p in tracked)
+    assert credits_for(tracked, batch_size=2) == 4
+
+
+def test_cycle_charges_the_credits_cmc_reports(workdir, monkeypatch):
+    tracked = projects(0, 2)
+
+    def bisected_fetch(due_projects, blocklist=None):
+        for _ in range(3):                          # the rejected batch, then each half
+            instrumentation.inc('cmc_credits_used', 1)
+        return {}
+
+    monkeypatch.setattr(watch, 'fx_credits', lambda **kwargs: 0)
+    monkeypatch.setattr(watch, 'fetch_quotes_for_projects', bisected_fetch)
+    scheduler = WatchScheduler([p['token_symbol'] for p in tracked])
+    budget = CreditBudget(monthly_credits=10000, burst=100)
+    assert credits_for(tracked) == 1
+
+    assert not watch.run_cycle(tracked, {}, scheduler, budget, store=None, now=1.0e9)
+    assert budget.used == 3
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+TGE price backfill from local OHLCV dumps (CSV, CSV.gz or Parquet)
+
+Dumps are streamed in batches - CSV row by row, Parquet one record batch at
+a time from a memory-mapped file - and folded into an index of daily
+open/close prices per (symbol, date, file) in ohlcv_index.db. Every
+ingested file is recorded with its size and mtime, so re-runs only scan
+files that are new or changed, and a changed file replaces its own rows. Projects with a tge_date but no tge_price then get the open of
+their TGE day (the close if a dump has no open), with the source recorded
+in tge_price_source. Edits go through the project journal like any other.
+
+Dumps need a symbol column (symbol/ticker/token_symbol/asset), a time
+column (date/timestamp/time/open_time/datetime - ISO dates or epoch s/ms,
+read as UTC) and open and/or close. Intraday rows are rolled up per day.
+Reading Parquet needs pyarrow (pip install pyarrow).
+
+Usage:
+    python3 tge_backfill.py                    # ingest new files in ohlcv_dumps/, then fill
+    python3 tge_backfill.py ingest dumps/ extra.parquet
+    python3 tge_backfill.py fill [--dry-run]
+    python3 tge_backfill.py lookup BID 2025-01-23
+"""
+
+import argparse
+import csv
+import gzip
+import os
+import sqlite3
+from datetime import datetime, timezone
+from operator import itemgetter
+
+from project_registry import ProjectRegistry, RegistryError
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+OHLCV_INDEX_DB = 'ohlcv_index.db'
+BATCH_ROWS = 50000          # Rows read and rolled up per batch before they're written
+
+# ========================================
+# OPTIONAL SETTINGS - Load from config file
+# ========================================
+try:
+    from config import OHLCV_DUMP_DIR
+except ImportError:
+    OHLCV_DUMP_DIR = 'ohlcv_dumps'      # Where `tge_backfill.py` looks for dumps by default
+
+# Accepted column names (case-insensitive), first match wins
+SYMBOL_COLUMNS = ['symbol', 'ticker', 'token_symbol', 'asset']
+TIME_COLUMNS = ['date', 'timestamp', 'time', 'open_time', 'datetime']
+DUMP_EXTENSIONS = ('.csv', '.csv.gz', '.parquet')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ohlcv_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_prices (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    file TEXT NOT NULL,
+    open REAL,
+    open_ts REAL,
+    close REAL,
+    close_ts REAL,
+    PRIMARY KEY (symbol, date, file)
+) WITHOUT ROWID;
+"""
+
+# Within one file, the earliest open and latest close of the day win across batches.
+# Rows are kept per file, so re-ingesting a changed file replaces exactly its own rows.
+UPSERT = """
+INSERT INTO daily_prices (symbol, date, file, open, open_ts, close, close_ts)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (symbol, date, file) DO UPDATE SET
+    open = CASE WHEN open_ts IS NULL OR excluded.open_ts < open_ts THEN excluded.open ELSE open END,
+    open_ts = CASE WHEN open_ts IS NULL OR excluded.open_ts < open_ts THEN excluded.open_ts ELSE open_ts END,
+    close = CASE WHEN close_ts IS NULL OR excluded.close_ts >= close_ts THEN excluded.close ELSE close END,
+    close_ts = CASE WHEN close_ts IS NULL OR excluded.close_ts >= close_ts THEN excluded.close_ts ELSE close_ts END
+"""
+
+
+# ========================================
+# READING DUMPS
+# ========================================
+def parse_time(value):
+    """(epoch seconds, 'YYYY-MM-DD' UTC) for an ISO string, epoch s/ms number or datetime; None if unreadable"""
+    if isinstance(value, datetime):
+        moment = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    else:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            try:
+                moment = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+            except ValueError:
+                return None
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+        else:
+            moment = datetime.fromtimestamp(number / 1000 if number > 1e11 else number, timezone.utc)
+    return moment.timestamp(), moment.strftime('%Y-%m-%d')
+
+
+def parse_price(value):
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if price > 0 else None
+
+
+def find_columns(names):
+    """{'symbol', 'time', 'open', 'close'} -> column name in the dump (open/close may be None)"""
+    lookup = {name.strip().lower(): name for name in names}
+    columns = {
+        'symbol': next((lookup[c] for c in SYMBOL_COLUMNS if c in lookup), None),
+        'time': next((lookup[c] for c in TIME_COLUMNS if c in lookup), None),
+        'open': lookup.get('open'),
+        'close': lookup.get('close')
+    }
+    if not columns['symbol'] or not columns['time'] or not (columns['open'] or columns['close']):
+        raise ValueError(f"needs a symbol, a time and an open or close column (has: {', '.join(names)})")
+    return columns
+
+
+def csv_batches(path, batch_rows=BATCH_ROWS):
+    """Yield lists of (symbol, time, open, close) raw values, streaming the CSV"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = find_columns(header)
+        positions = [header.index(columns[key]) if columns[key] else None
+                     for key in ('symbol', 'time', 'open', 'close')]
+        width = max(i for i in positions if i is not None) + 1
+        pick = itemgetter(*positions)
+        if None in positions:
+            # Only one of open/close can be missing; it reads as None, never as another column
+            missing = positions.index(None)
+            get = itemgetter(*(i for i in positions if i is not None))
+
+            def pick(row):
+                values = get(row)
+                return values[:missing] + (None,) + values[missing:]
+        batch = []
+        for row in reader:
+            if len(row) < width:
+                continue
+            batch.append(pick(row))
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def parquet_batches(path, batch_rows=BATCH_ROWS):
+    """Yield lists of (symbol, time, open, close) raw values, one record batch at a time"""
+    if pq is None:
+        raise RuntimeError("reading Parquet needs pyarrow (pip install pyarrow)")
+    parquet = pq.ParquetFile(path, memory_map=True)
+    columns = find_columns(parquet.schema_arrow.names)
+    wanted = [columns[key] for key in ('symbol', 'time', 'open', 'close') if columns[key]]
+    for record_batch in parquet.iter_batches(batch_size=batch_rows, columns=wanted):
+        data = record_batch.to_pydict()
+        n = record_batch.num_rows
+        values = [data[columns[key]] if columns[key] else [None] * n for key in ('symbol', 'time', 'open', 'close')]
+        yield list(zip(*values))
+
+
+def read_batches(path, batch_rows=BATCH_ROWS):
+    if path.endswith('.parquet'):
+        return parquet_batches(path, batch_rows)
+    return csv_batches(path, batch_rows)
+
+
+def daily_rollup(batch, source):
+    """Upsert parameters for one batch: earliest open and latest close per (symbol, day)
+
+    Rows come back sorted by (symbol, day), the index's key order, which keeps
+    the upsert writes local instead of scattered across the whole table.
+    """
+    days = {}
+    times = {}      # Dumps repeat the same date/timestamp for every symbol
+    for symbol, time_value, open_value, close_value in batch:
+        if not symbol:
+            continue
+        parsed = times.get(time_value, False)
+        if parsed is False:
+            parsed = times[time_value] = parse_time(time_value)
+        if parsed is None:
+            continue
+        ts, day = parsed
+        key = (str(symbol).strip().upper(), day)
+        open_price, close_price = parse_price(open_value), parse_price(close_value)
+        entry = days.get(key)
+        if entry is None:
+            entry = days[key] = [None, None, None, None]
+        if open_price is not None and (entry[1] is None or ts < entry[1]):
+            entry[0], entry[1] = open_price, ts
+        if close_price is not None and (entry[3] is None or ts >= entry[3]):
+            entry[2], entry[3] = close_price, ts
+    return [
+        (symbol, day, source, open_price, open_ts, close_price, close_ts)
+        for (symbol, day), (open_price, open_ts, close_price, close_ts) in sorted(days.items())
+    ]
+
+
+def find_dumps(paths):
+    """Dump files under the given files/directories, sorted"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found += [os.path.join(root, name) for name in files if name.lower().endswith(DUMP_EXTENSIONS)]
+        elif os.path.exists(path):
+            found.append(path)
+    return sorted(found)
+
+
+# ========================================
+# INDEX
+# ========================================
+class OHLCVIndex:
+    """Daily open/close prices keyed by (symbol, date), plus the files they came from"""
+
+    def __init__(self, path=OHLCV_INDEX_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(daily_prices)')]
+        if columns and 'file' not in columns:
+            # Index from before rows were kept per file: it is only a cache, so rebuild it
+            self.conn.executescript('DROP TABLE daily_prices; DROP TABLE ohlcv_files;')
+        self.conn.executescript(SCHEMA)
+
+    def is_ingested(self, path, st):
+        row = self.conn.execute('SELECT size, mtime_ns FROM ohlcv_files WHERE path = ?', (path,)).fetchone()
+        return row is not None and tuple(row) == (st.st_size, st.st_mtime_ns)
+
+    def ingest_file(self, path, batch_rows=BATCH_ROWS):
+        """Stream one dump into the index (one transaction); returns the number of rows read"""
+        st = os.stat(path)
+        rows = 0
+        with self.conn:
+            # A changed file replaces what it contributed before, corrections included
+            self.conn.execute('DELETE FROM daily_prices WHERE file = ?', (path,))
+            for batch in read_batches(path, batch_rows):
+                rows += len(batch)
+                self.conn.executemany(UPSERT, daily_rollup(batch, path))
+            self.conn.execute(
+                'INSERT OR REPLACE INTO ohlcv_files (path, size, mtime_ns, rows, ingested_at) VALUES (?, ?, ?, ?, ?)',
+                (path, st.st_size, st.st_mtime_ns, rows, datetime.now().isoformat())
+            )
+        return rows
+
+    def ingest(self, paths, batch_rows=BATCH_ROWS):
+        """Ingest dumps under `paths` that are new or changed; returns (files ingested, rows, files skipped)"""
+        ingested = rows = skipped = 0
+        for path in find_dumps(paths):
+            if self.is_ingested(path, os.stat(path)):
+                skipped += 1
+                continue
+            try:
+                count = self.ingest_file(path, batch_rows)
+            except (OSError, ValueError, RuntimeError, csv.Error) as e:
+                print(f"⚠️  Skipped {path}: {e}")
+                continue
+            print(f"   📥 {path}: {count:,} rows")
+            ingested += 1
+            rows += count
+        return ingested, rows, skipped
+
+    def lookup(self, symbol, date):
+        """(price, 'open'|'close', source file) for a symbol's day, preferring the open; None if unknown
+
+        The earliest open (or else the latest close) of the day wins, whichever file it came from.
+        """
+        key = (symbol.upper(), date)
+        row = self.conn.execute(
+            'SELECT open, file FROM daily_prices WHERE symbol = ? AND date = ? AND open IS NOT NULL '
+            'ORDER BY open_ts, file LIMIT 1', key
+        ).fetchone()
+        if row is not None:
+            return row[0], 'open', row[1]
+        row = self.conn.execute(
+            'SELECT close, file FROM daily_prices WHERE symbol = ? AND date = ? AND close IS NOT NULL '
+            'ORDER BY close_ts DESC, file LIMIT 1', key
+        ).fetchone()
+        if row is not None:
+            return row[0], 'close', row[1]
+        return None
+
+    def stats(self):
+        files, rows = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM ohlcv_files').fetchone()
+        days, symbols = self.conn.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT symbol) FROM (SELECT DISTINCT symbol, date FROM daily_prices)'
+        ).fetchone()
+        return {'files': files, 'rows': rows, 'days': days, 'symbols': symbols}
+
+    def close(self):
+        self.conn.close()
+
+
+# ========================================
+# BACKFILL
+# ========================================
+def backfill_tge_prices(registry, index, dry_run=False):
+    """Fill tge_price for projects with a tge_date but no price; returns (filled, not found)
+
+    filled is [(project, price, provenance)]; not found is [project]. Prices
+    already set (by hand or an earlier backfill) are never overwritten.
+    """
+    filled, not_found = [], []
+    for project in registry.projects:
+        if project.get('tge_price') or not project.get('tge_date'):
+            continue
+        hit = index.lookup(project['token_symbol'], project['tge_date'])
+        if hit is None:
+            not_found.append(project)
+            continue
+        price, field, source = hit
+        provenance = f"ohlcv {field} {project['tge_date']} ({os.path.basename(source)})"
+        filled.append((project, price, provenance))
+        if not dry_run:
+            registry.upsert({**project, 'tge_price': price, 'tge_price_source': provenance})
+    return filled, not_found
+
+
+def fill(index, dry_run=False):
+    """Fill missing TGE prices from `index` and print what changed; returns an exit code"""
+    try:
+        registry = ProjectRegistry()
+    except RegistryError as e:
+        print(f"❌ {len(e.problems)} validation problems in the registry")
+        return 1
+    filled, not_found = backfill_tge_prices(registry, index, dry_run)
+    verb = 'Would fill' if dry_run else 'Filled'
+    print(f"💵 {verb} {len(filled)} TGE prices")
+    for project, price, provenance in filled:
+        print(f"   ${project['token_symbol']:<10} {price:.6g}  <- {provenance}")
+    if not_found:
+        print(f"⚠️  No dump covers the TGE day of {len(not_found)} projects: "
+              f"{', '.join('$' + p['token_symbol'] for p in not_found)}")
+    return 0
+
+
+def run_backfill(paths=None, dry_run=False, index_path=OHLCV_INDEX_DB):
+    """Ingest new dumps, then fill missing TGE prices; returns an exit code"""
+    paths = paths or [OHLCV_DUMP_DIR]
+    index = OHLCVIndex(index_path)
+    try:
+        ingested, rows, skipped = index.ingest(paths)
+        print(f"✅ Ingested {ingested} new dump files ({rows:,} rows), {skipped} already indexed")
+        return fill(index, dry_run)
+    finally:
+        index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill missing TGE prices from local OHLCV dumps')
+    sub = parser.add_subparsers(dest='command')
+    ingest_cmd = sub.add_parser('ingest', help='Index new or changed dump files')
+    ingest_cmd.add_argument('paths', nargs='*', help=f'Dump files or directories (default: {OHLCV_DUMP_DIR}/)')
+    fill_cmd = sub.add_parser('fill', help='Fill missing TGE prices from the index')
+    fill_cmd.add_argument('--dry-run', action='store_true', help="Show what would be filled, don't edit")
+    lookup_cmd = sub.add_parser('lookup', help='Daily price for one symbol')
+    lookup_cmd.add_argument('symbol')
+    lookup_cmd.add_argument('date', help='YYYY-MM-DD')
+    args = parser.parse_args()
+
+    if args.command is None:
+        raise SystemExit(run_backfill())
+
+    index = OHLCVIndex()
+    try:
+        if args.command == 'ingest':
+            ingested, rows, skipped = index.ingest(args.paths or [OHLCV_DUMP_DIR])
+            print(f"✅ Ingested {ingested} new dump files ({rows:,} rows), {skipped} already indexed")
+        elif args.command == 'fill':
+            raise SystemExit(fill(index, args.dry_run))
+        elif args.command == 'lookup':
+            hit = index.lookup(args.symbol, args.date)
+            if hit is None:
+                print(f"❌ No price for ${args.symbol.upper()} on {args.date}")
+                raise SystemExit(1)
+            print(f"💵 ${args.symbol.upper()} {args.date}: {hit[0]:.8g} ({hit[1]}, {hit[2]})")
+        stats = index.stats()
+        print(f"🗂️  Index: {stats['days']:,} symbol-days for {stats['symbols']:,} symbols "
+              f"from {stats['files']} files ({stats['rows']:,} rows)")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
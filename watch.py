@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Resident watch mode - keeps the tracker fresh without cron
+Volatile tokens (by |24h change|) refresh more often than quiet ones, due
+symbols are packed into shared batched requests, and every request is
+planned against the monthly CMC credit budget. Quotes are requested by CMC
+id where resolved and by ticker otherwise (separate batches, as in
+fetch_all_projects); id-map and FX refreshes are charged to the budget too.
+Requests are charged what CMC reports spending (status.credit_count), so
+the retries of a rejected batch count; the estimate only plans ahead.
+
+Usage:
+    python3 watch.py [--monthly-credits 10000] [--min-interval 300] [--max-interval 21600]
+"""
+
+import argparse
+import calendar
+import json
+import math
+import time
+from datetime import datetime
+
+from alerts import check_alerts
+from cmc_id_map import ID_MAP_FILE, ID_MAP_PAGE_SIZE, IdMap, id_map_is_fresh
+from fetch_all_projects import (
+    CMC_BATCH_SIZE, fetch_quotes_for_projects, get_cmc_client, load_tracked_projects,
+    process_projects, save_snapshot
+)
+from fx_rates import DASHBOARD_CURRENCIES, FX_TGE_DATES_PER_RUN, FXTable, load_fx_table
+from generate_dashboard import generate_dashboard
+from history_store import open_history_store
+from instrumentation import instrumentation
+from quote_cache import SYMBOLS_PER_CREDIT
+from symbol_blocklist import SymbolBlocklist
+
+# ========================================
+# WATCH SETTINGS
+# ========================================
+MONTHLY_CREDITS = 10000     # CMC Basic plan
+MIN_INTERVAL = 300          # Fastest refresh for the most volatile tokens (seconds)
+MAX_INTERVAL = 6 * 3600     # Slowest refresh for flat tokens (seconds)
+VOLATILITY_PIVOT = 5.0      # |24h change| in % that halves the refresh interval
+BURST_CREDITS = 20          # Credits that may be spent ahead of the even monthly pace
+WATCH_STATE_FILE = 'watch_state.json'
+
+QUOTE_FIELDS = ('current_price', 'market_cap', 'volume_24h',
+                'percent_change_24h', 'percent_change_7d', 'percent_change_30d')
+
+
+def refresh_interval(change_24h, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+    """Seconds until a token's next refresh - shrinks as |24h change| grows"""
+    if change_24h is None:
+        return max_interval
+    interval = max_interval / (1 + abs(change_24h) / VOLATILITY_PIVOT)
+    return max(min_interval, min(max_interval, interval))
+
+
+def quote_key(project):
+    """(by, key) the fetcher requests a project's quote with - its CMC id, else its ticker"""
+    if project.get('cmc_id'):
+        return 'id', str(project['cmc_id'])
+    return 'symbol', project['token_symbol']
+
+
+def month_bounds(now):
+    """(start, length) of the calendar month containing `now`, in epoch seconds"""
+    dt = datetime.fromtimestamp(now)
+    start = datetime(dt.year, dt.month, 1).timestamp()
+    days = calendar.monthrange(dt.year, dt.month)[1]
+    return start, days * 86400
+
+
+class CreditBudget:
+    """Paces credit spend evenly over the month; usage survives restarts"""
+
+    def __init__(self, monthly_credits=MONTHLY_CREDITS, path=WATCH_STATE_FILE, burst=BURST_CREDITS):
+        self.monthly_credits = monthly_credits
+        self.path = path
+        self.burst = burst
+        self.month = None
+        self.used = 0
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+            self.month, self.used = state['month'], state['credits_used']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+    def _roll(self, now):
+        month = datetime.fromtimestamp(now).strftime('%Y-%m')
+        if month != self.month:
+            self.month, self.used = month, 0
+
+    def available(self, now):
+        """Credits that can be spent right now without outrunning the monthly pace"""
+        self._roll(now)
+        start, length = month_bounds(now)
+        allowance = self.monthly_credits * (now - start) / length + self.burst
+        return max(0, min(self.monthly_credits - self.used, math.floor(allowance - self.used)))
+
+    def seconds_per_credit(self, now):
+        _, length = month_bounds(now)
+        return length / self.monthly_credits
+
+    def spend(self, credits, now):
+        self._roll(now)
+        self.used += credits
+        with open(self.path, 'w') as f:
+            json.dump({'month': self.month, 'credits_used': self.used}, f)
+
+
+class WatchScheduler:
+    """Tracks when each symbol is next due and packs due symbols into batches
+
+    `key_types` maps a symbol to 'id' or 'symbol' (default) - the two kinds
+    are requested in separate batches, so they are packed separately.
+    """
+
+    def __init__(self, symbols, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 batch_size=CMC_BATCH_SIZE, key_types=None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self.credits_per_batch = math.ceil(batch_size / SYMBOLS_PER_CREDIT)
+        self.next_due = {symbol: 0.0 for symbol in symbols}
+        self.key_types = key_types or {}
+
+    def record(self, symbol, change_24h, fetched_at):
+        self.next_due[symbol] = fetched_at + refresh_interval(change_24h, self.min_interval, self.max_interval)
+
+    def plan(self, now, credits):
+        """Symbols to fetch now, most overdue first, within `credits`
+
+        Partly filled batches are topped up with the symbols due soonest,
+        since they ride along in the same request for free.
+        """
+        by_due = sorted(self.next_due, key=self.next_due.get)
+        groups = {}
+        for symbol in by_due:
+            groups.setdefault(self.key_types.get(symbol, 'symbol'), []).append(symbol)
+
+        planned = []
+        # The group holding the most overdue symbol gets the credits first
+        for group in sorted(groups.values(), key=lambda g: self.next_due[g[0]]):
+            due = sum(1 for s in group if self.next_due[s] <= now)
+            if not due:
+                continue
+            batches = min(credits // self.credits_per_batch, math.ceil(due / self.batch_size))
+            credits -= batches * self.credits_per_batch
+            planned.extend(group[:batches * self.batch_size])
+        return planned
+
+    def next_wakeup(self):
+        return min(self.next_due.values()) if self.next_due else time.time() + self.max_interval
+
+
+def batch_credits(count, batch_size=CMC_BATCH_SIZE):
+    """CMC credits charged for `count` keys of one kind, fetched in batches"""
+    full, rest = divmod(count, batch_size)
+    return full * math.ceil(batch_size / SYMBOLS_PER_CREDIT) + math.ceil(rest / SYMBOLS_PER_CREDIT)
+
+
+def credits_for(projects, batch_size=CMC_BATCH_SIZE, blocklist=None, now=None):
+    """CMC credits charged for fetching `projects` the way fetch_quotes_for_projects does:
+    ids and tickers in separate batches, blocklisted keys skipped"""
+    keys = {}
+    for project in projects:
+        by, key = quote_key(project)
+        if blocklist is None or not blocklist.is_blocked(f"{by}:{key}", now):
+            keys.setdefault(by, set()).add(key)
+    return sum(batch_credits(len(group), batch_size) for group in keys.values())
+
+
+def fx_credits(currencies=DASHBOARD_CURRENCIES, now=None, tge_dates=()):
+    """Credits the FX table update would cost now (0 if not needed): a refresh
+    when stale plus the missing TGE-date rates, each one price-conversion call
+    at one credit per convert target"""
+    if currencies == ['USD']:
+        return 0
+    table = FXTable.load()
+    calls = int(table.is_stale(currencies, now=now))
+    calls += min(len(table.missing_days(tge_dates, currencies)), FX_TGE_DATES_PER_RUN)
+    return calls * max(1, len([c for c in currencies if c != 'USD']))
+
+
+def id_map_credits():
+    """Credits the id-map download just made cost: one per page, the last one short"""
+    return len(IdMap.load(ID_MAP_FILE).entries) // ID_MAP_PAGE_SIZE + 1
+
+
+def charged(fetch, estimate):
+    """Run `fetch`; returns (its result, the credits CMC reported for it - `estimate` if it reported none)"""
+    before = instrumentation.total('cmc_credits_used')
+    result = fetch()
+    return result, instrumentation.total('cmc_credits_used') - before or estimate
+
+
+def run_cycle(projects, latest, scheduler, budget, store, now=None, blocklist=None):
+    """Fetch whatever is due; returns True if a new snapshot was written"""
+    now = now if now is not None else time.time()
+    tge_dates = {p.get('tge_date') for p in projects}
+    fx_cost = fx_credits(now=now, tge_dates=tge_dates)
+    symbols = scheduler.plan(now, max(0, budget.available(now) - fx_cost))
+    if not symbols:
+        return False
+
+    wanted = set(symbols)
+    due_projects = [p for p in projects if p['token_symbol'] in wanted]
+    cmc_data, credits = charged(lambda: fetch_quotes_for_projects(due_projects, blocklist=blocklist),
+                                credits_for(due_projects, scheduler.batch_size, blocklist, now))
+    budget.spend(credits, now)
+    if not cmc_data:
+        for symbol in symbols:
+            scheduler.next_due[symbol] = now + scheduler.min_interval
+        return False
+
+    with instrumentation.timer('stage', stage='process'):
+        results = process_projects(due_projects, cmc_data, verbose=False, now=datetime.fromtimestamp(now))
+
+    changed = False
+    for r in results:
+        symbol = r['token_symbol']
+        previous = latest.get(symbol)
+        if previous is None or any(previous[f] != r[f] for f in QUOTE_FIELDS):
+            changed = True
+        latest[symbol] = r
+        scheduler.record(symbol, r['percent_change_24h'], now)
+
+    for symbol in wanted - {r['token_symbol'] for r in results}:
+        scheduler.record(symbol, None, now)  # Not on CMC - check back rarely
+
+    print(f"🔄 {datetime.fromtimestamp(now):%H:%M:%S} refreshed {len(results)}/{len(symbols)} symbols "
+          f"({budget.used}/{budget.monthly_credits} credits this month)")
+
+    if changed:
+        if fx_cost:
+            # Non-USD dashboards convert with it
+            _, fx_spent = charged(lambda: load_fx_table(get_cmc_client(), tge_dates=tge_dates), fx_cost)
+            budget.spend(fx_spent, now)
+        ordered = [latest[p['token_symbol']] for p in projects if p['token_symbol'] in latest]
+        with instrumentation.timer('stage', stage='persist'):
+            snapshot = save_snapshot(ordered, store, now=datetime.fromtimestamp(now))
+        check_alerts(snapshot)
+        generate_dashboard(data=snapshot)
+
+    instrumentation.inc('watch_cycles', changed=changed)
+    instrumentation.set('monthly_credits_used', budget.used)
+    instrumentation.export('watch')
+    return changed
+
+
+def watch(monthly_credits=MONTHLY_CREDITS, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+    """Run forever, refreshing symbols as they come due"""
+    budget = CreditBudget(monthly_credits)
+    map_was_fresh = id_map_is_fresh()
+    projects = load_tracked_projects()
+    if projects is None:
+        return
+    if not map_was_fresh and id_map_is_fresh():
+        budget.spend(id_map_credits(), time.time())
+
+    store = open_history_store()
+    blocklist = SymbolBlocklist()
+    scheduler = WatchScheduler([p['token_symbol'] for p in projects], min_interval, max_interval,
+                               key_types={p['token_symbol']: quote_key(p)[0] for p in projects})
+
+    # Resume from the last snapshot so a restart doesn't refetch everything
+    latest = {}
+    snapshot = store.latest_snapshot()
+    if snapshot:
+        fetched_at = datetime.fromisoformat(snapshot['metadata']['timestamp']).timestamp()
+        for r in snapshot['projects']:
+            if r['token_symbol'] in scheduler.next_due:
+                latest[r['token_symbol']] = r
+                scheduler.record(r['token_symbol'], r['percent_change_24h'], fetched_at)
+
+    print(f"👀 Watching {len(projects)} projects "
+          f"(refresh every {min_interval}s-{max_interval}s, {monthly_credits} credits/month)")
+
+    try:
+        while True:
+            now = time.time()
+            run_cycle(projects, latest, scheduler, budget, store, now, blocklist)
+            wake = scheduler.next_wakeup()
+            if budget.available(time.time()) < scheduler.credits_per_batch:
+                wake = max(wake, now + budget.seconds_per_credit(now))
+            time.sleep(max(1.0, wake - time.time()))
+    except KeyboardInterrupt:
+        print("\n👋 Watch stopped")
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kaito tracker watch mode')
+    parser.add_argument('--monthly-credits', type=int, default=MONTHLY_CREDITS)
+    parser.add_argument('--min-interval', type=float, default=MIN_INTERVAL)
+    parser.add_argument('--max-interval', type=float, default=MAX_INTERVAL)
+    args = parser.parse_args()
+    watch(args.monthly_credits, args.min_interval, args.max_interval)
+
+
+if __name__ == "__main__":
+    main()